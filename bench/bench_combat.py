@@ -0,0 +1,59 @@
+# bench/bench_combat.py
+"""
+Benchmark: auto-combat rounds.
+
+Starts N simultaneous fights, each a player against a pack of K kobolds in
+its own room, with monster HP raised so nobody dies mid-run. Then times
+COMBAT.tick(), which runs one batched round for every fight.
+
+Usage:
+    python -m bench.bench_combat [fights ...]      (default: 10 100 500)
+"""
+
+import sys
+import time
+
+from game import spawn
+from game.combat import COMBAT, Fight
+
+
+PACK = 5
+ROUNDS = 20
+
+
+def start_fights(count):
+    for i in range(count):
+        room = f"bench_arena_{i}"
+        pack = [spawn.create_instance("kobold_bx", room) for _ in range(PACK)]
+        for inst in pack:
+            inst["hp"] = 10 ** 9
+        player = {"name": f"p{i}", "location": room, "hp": 10 ** 9, "max_hp": 10 ** 9,
+                  "ac": 7, "str_mod": 1}
+        game_state = {"current_room": room, "notify": lambda lines: None}
+        fight = Fight(player, game_state, {}, room)
+        fight.auto = True
+        fight.engage(pack, pack[0])
+        COMBAT.start(fight)
+
+
+def main(counts):
+    print(f"{'fights':>8} {'combatants':>11} {'tick ms':>9} {'us/fight':>9} {'us/combatant':>13}")
+    for count in counts:
+        spawn.clear_instances()
+        COMBAT.auto.clear()
+        start_fights(count)
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            COMBAT.tick()
+        elapsed = (time.perf_counter() - start) / ROUNDS
+
+        combatants = count * (PACK + 1)
+        print(
+            f"{count:>8} {combatants:>11} {elapsed * 1000:>9.2f}"
+            f" {elapsed / count * 1e6:>9.1f} {elapsed / combatants * 1e6:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10, 100, 500])
@@ -0,0 +1,90 @@
+# bench/bench_dispatch.py
+"""
+Microbenchmark: command dispatch latency per verb.
+
+Compares the old if-chain (reproduced below as an ordered list of the verb
+tests handle_command used to walk) against the registry lookup in
+game/commands.py, then times a full round trip per verb: handle_command plus
+format_result, i.e. what a front-end pays to get printable lines.
+
+Usage:
+    python -m bench.bench_dispatch [iterations]
+"""
+
+import sys
+import timeit
+
+from config import DIRECTION_ALIASES
+from game import commands
+from game.parser import handle_command
+from ui.message_log import MessageLog
+from ui.output import format_result
+from world.overworld import load_overworld
+
+
+# The branch tests of the pre-registry handle_command, in their original order.
+LEGACY_CHAIN = [
+    lambda t: t[0] in ("examine", "x"),
+    lambda t: t[0] == "talk" and len(t) > 2 and t[1] == "to",
+    lambda t: t[0] == "go",
+    lambda t: t[0] in DIRECTION_ALIASES,
+    lambda t: t[0] in ("look", "l"),
+    lambda t: t[0] in ("inventory", "i"),
+    lambda t: t[0] in ("take", "get"),
+    lambda t: t[0] == "use",
+    lambda t: t[0] == "about",
+    lambda t: t[0] == "dir",
+    lambda t: t[0] == "title",
+    lambda t: t[0] == "drop" and len(t) > 1,
+    lambda t: t[0] in ("character", "c"),
+    lambda t: t[0] == "help",
+    lambda t: t[0].lower() == "debug",
+    lambda t: t[0] == "clear",
+    lambda t: t[0] == "cls",
+    lambda t: t[0] == "motd",
+    lambda t: t[0] in ("quit", "exit"),
+]
+
+VERBS = [
+    "examine pedestal", "look", "inventory", "take glowing_orb", "about",
+    "character", "help", "motd", "debug", "quit", "frobnicate",
+]
+
+
+def legacy_lookup(tokens):
+    for i, test in enumerate(LEGACY_CHAIN):
+        if test(tokens):
+            return i
+    return None
+
+
+def registry_lookup(tokens):
+    return commands.get_command(tokens[0])
+
+
+def main(iterations=200_000):
+    rooms = load_overworld()
+    player = {"inventory": [], "location": "chapel_0_0_0", "debug_mode": False}
+
+    print(f"{'command':<20}{'if-chain ns':>14}{'registry ns':>14}{'round trip us':>20}")
+    for verb in VERBS:
+        tokens = verb.split()
+        legacy = timeit.timeit(lambda: legacy_lookup(tokens), number=iterations)
+        registry = timeit.timeit(lambda: registry_lookup(tokens), number=iterations)
+
+        state = {"current_room": "chapel_0_0_0"}
+        log = MessageLog()
+        full = timeit.timeit(
+            lambda: format_result(handle_command(verb, state, player, rooms, {}, "", log, {})),
+            number=iterations // 20,
+        )
+        print(
+            f"{verb.split()[0]:<20}"
+            f"{legacy / iterations * 1e9:>14.1f}"
+            f"{registry / iterations * 1e9:>14.1f}"
+            f"{full / (iterations // 20) * 1e6:>20.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
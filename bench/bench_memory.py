@@ -0,0 +1,114 @@
+# bench/bench_memory.py
+"""
+Memory benchmark: bytes per room and per monster instance.
+
+Builds N grid rooms and N monster instances twice, once as the old plain
+dicts and once as the slotted classes in game/entities.py, and reports the
+traced allocation per entity. Room ids and strings are created up front and
+shared by both variants, so only the container overhead is compared.
+
+Usage:
+    python -m bench.bench_memory [N ...]      (default: 10000 100000 1000000)
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from game.entities import Room, MonsterInstance
+from game.monsters import MONSTER_DEFS
+
+
+DESCRIPTIONS = ["Jagged cliffs loom overhead.", "Loose stones crunch underfoot."]
+
+
+def make_ids(n):
+    side = int(n ** 0.5) + 1
+    return [f"bench_{i % side}_{i // side}" for i in range(n)]
+
+
+def room_dicts(ids):
+    n = len(ids)
+    return {
+        room_id: {
+            "name": room_id,
+            "description": DESCRIPTIONS[i & 1],
+            "look_description": DESCRIPTIONS[i & 1],
+            "terrain": "cliff",
+            "visited": False,
+            "items": [],
+            "exits": {"north": ids[(i + 1) % n], "south": ids[i - 1]},
+        }
+        for i, room_id in enumerate(ids)
+    }
+
+
+def room_objects(ids):
+    n = len(ids)
+    rooms = {}
+    for i, room_id in enumerate(ids):
+        rooms[room_id] = Room(
+            name=room_id,
+            description=DESCRIPTIONS[i & 1],
+            look_description=DESCRIPTIONS[i & 1],
+            terrain="cliff",
+            visited=False,
+            items=[],
+            exits={"north": ids[(i + 1) % n], "south": ids[i - 1]},
+        )
+    return rooms
+
+
+def instance_dicts(ids):
+    template = MONSTER_DEFS["kobold_bx"]
+    now = time.time()
+    return [
+        {
+            "id": room_id, "template": "kobold_bx", "name": template["name"],
+            "hp": 4, "max_hp": 4, "ac": 7, "stats": template["base_stats"],
+            "room": room_id, "hostile": True, "created_at": now,
+            "description": template["description"], "xp": 25, "loot": template["loot"],
+        }
+        for room_id in ids
+    ]
+
+
+def instance_objects(ids):
+    template = MONSTER_DEFS["kobold_bx"]
+    now = time.time()
+    return [
+        MonsterInstance(
+            id=room_id, template="kobold_bx", name=template["name"],
+            hp=4, max_hp=4, ac=7, room=room_id, hostile=True, created_at=now,
+        )
+        for room_id in ids
+    ]
+
+
+def measure(build, ids):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = build(ids)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del result
+    return used / len(ids)
+
+
+def main(sizes):
+    print(f"{'entities':>10} {'room dict':>11} {'Room':>8} {'inst dict':>11} {'MonsterInstance':>16}   (bytes each)")
+    for n in sizes:
+        ids = make_ids(n)
+        print(
+            f"{n:>10,} "
+            f"{measure(room_dicts, ids):>11.0f} "
+            f"{measure(room_objects, ids):>8.0f} "
+            f"{measure(instance_dicts, ids):>11.0f} "
+            f"{measure(instance_objects, ids):>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
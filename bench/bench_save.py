@@ -0,0 +1,78 @@
+# bench/bench_save.py
+"""
+Benchmark: foreground latency per player save.
+
+Times how long the caller is blocked per save for:
+- legacy:  json.dump(indent=2) straight onto save/player.json (the old save)
+- store:   SaveStore.save_player, a synchronous SQLite transaction
+- writer:  SaveWriter.save_player, serialize + hand off to the background thread
+
+A bigger "visited" set stands in for a long-played character. Everything is
+written under a temporary directory.
+
+Usage:
+    python -m bench.bench_save [saves] [visited rooms]    (default: 500 5000)
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from game.save import SaveStore, SaveWriter
+
+
+def make_player(visited):
+    return {
+        "name": "Bench", "background": "Scribe", "hp": 10, "max_hp": 10, "xp": 0,
+        "inventory": ["glowing_orb", "chapel_key"], "location": "chapel_0_0_0",
+        "visited": [f"bench_{i % 100}_{i // 100}" for i in range(visited)],
+    }
+
+
+def legacy_save(path, player):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(player, f, indent=2)
+
+
+def timed(save, player, saves):
+    samples = []
+    for i in range(saves):
+        player["xp"] = i
+        start = time.perf_counter()
+        save(player)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main(saves, visited):
+    player = make_player(visited)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SaveStore(os.path.join(tmp, "bench.db"))
+        writer = SaveWriter(store)
+        legacy_path = os.path.join(tmp, "player.json")
+
+        results = {
+            "legacy": timed(lambda p: legacy_save(legacy_path, p), player, saves),
+            "store":  timed(store.save_player, player, saves),
+            "writer": timed(writer.save_player, player, saves),
+        }
+        start = time.perf_counter()
+        writer.flush()
+        drain = (time.perf_counter() - start) * 1000
+
+        print(f"{saves} saves, {visited} visited rooms (foreground ms per save)")
+        for name, (mean, p99) in results.items():
+            print(f"  {name:<7} mean {mean:7.3f}   p99 {p99:7.3f}")
+        print(f"  writer: {writer.batches} batches, {writer.coalesced} saves coalesced, "
+              f"{drain:.1f} ms to drain after the last save")
+        assert store.load_player("Bench")["xp"] == saves - 1
+        store.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [500, 5000][len(args):]))
@@ -0,0 +1,69 @@
+# bench/bench_save_format.py
+"""
+Benchmark: binary player saves (game/save_format.py) vs JSON.
+
+For players with N visited rooms, reports the encoded size and the
+encode/decode time of:
+- json indent=2   (the old save_player)
+- json compact
+- binary          (encode_player, zlib on)
+- binary raw      (encode_player, compress=False)
+
+Every variant round-trips and is checked against the original.
+
+Usage:
+    python -m bench.bench_save_format [visited ...]   (default: 1000 5000 20000)
+"""
+
+import copy
+import json
+import sys
+import time
+
+from game.player import player as player_template
+from game.save_format import encode_player, decode_player
+
+
+REPEAT = 20
+
+
+def make_player(visited):
+    player = copy.deepcopy(player_template)
+    player["inventory"] = ["glowing_orb", "chapel_key", "torch", "torch"]
+    player["visited"] = {f"fellmore_cliffs_{i % 150}_{i // 150}" for i in range(visited)}
+    return player
+
+
+def json_encode(indent):
+    def encode(player):
+        data = dict(player, visited=list(player["visited"]))
+        return json.dumps(data, indent=indent).encode("utf-8")
+    return encode
+
+
+def timed(fn, arg):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = fn(arg)
+    return result, (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main(sizes):
+    variants = {
+        "json indent=2": (json_encode(2), decode_player),
+        "json compact":  (json_encode(None), decode_player),
+        "binary":        (encode_player, decode_player),
+        "binary raw":    (lambda p: encode_player(p, compress=False), decode_player),
+    }
+    print(f"{'visited':>8} {'format':<14} {'bytes':>9} {'encode ms':>10} {'decode ms':>10}")
+    for visited in sizes:
+        player = make_player(visited)
+        for name, (encode, decode) in variants.items():
+            blob, enc_ms = timed(encode, player)
+            back, dec_ms = timed(decode, blob)
+            assert back == player, name
+            print(f"{visited:>8} {name:<14} {len(blob):>9,} {enc_ms:>10.3f} {dec_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000])
@@ -0,0 +1,84 @@
+# bench/bench_spatial.py
+"""
+Benchmark: spatial room queries.
+
+Builds a square region of plain rooms with random terrain, then times radius,
+bounding-box and nearest-terrain queries through world/spatial_index.py
+against a scan of every room. Results are checked against the scan.
+
+Usage:
+    python -m bench.bench_spatial [side ...]      (default: 100 300 600)
+"""
+
+import random
+import sys
+import time
+
+from world.spatial_index import SpatialIndex
+
+
+TERRAIN = ["grass"] * 50 + ["forest"] * 10 + ["shrine"]
+QUERIES = 200
+
+
+def make_rooms(side, rng):
+    return {f"bench_{x}_{y}": {"terrain": rng.choice(TERRAIN)} for x in range(side) for y in range(side)}
+
+
+def scan_radius(rooms, center, radius):
+    cx, cy = center
+    out = []
+    for room_id in rooms:
+        _, x, y = room_id.rsplit("_", 2)
+        if (int(x) - cx) ** 2 + (int(y) - cy) ** 2 <= radius * radius:
+            out.append(room_id)
+    return out
+
+
+def scan_nearest(rooms, center, terrain):
+    cx, cy = center
+    best = None
+    for room_id, room in rooms.items():
+        if room["terrain"] != terrain:
+            continue
+        _, x, y = room_id.rsplit("_", 2)
+        d = (int(x) - cx) ** 2 + (int(y) - cy) ** 2
+        if best is None or (d, room_id) < best:
+            best = (d, room_id)
+    return best[1] if best else None
+
+
+def timed(fn, calls):
+    start = time.perf_counter()
+    results = [fn(*args) for args in calls]
+    return (time.perf_counter() - start) / len(calls) * 1000, results
+
+
+def main(sides):
+    print(f"{'rooms':>10} {'build s':>8} {'radius ms':>10} {'scan ms':>8} {'nearest ms':>11} {'scan ms':>8}")
+    for side in sides:
+        rng = random.Random(side)
+        rooms = make_rooms(side, rng)
+
+        start = time.perf_counter()
+        index = SpatialIndex()
+        index.add_rooms(rooms)
+        build = time.perf_counter() - start
+
+        centers = [(rng.randrange(side), rng.randrange(side)) for _ in range(QUERIES)]
+        scan_calls = centers[:10]
+
+        radius_ms, got = timed(lambda c: index.within_radius("bench", c, 5), [(c,) for c in centers])
+        radius_scan_ms, want = timed(lambda c: scan_radius(rooms, c, 5), [(c,) for c in scan_calls])
+        assert all(set(g) == set(w) for g, w in zip(got, want))
+
+        nearest_ms, got = timed(lambda c: index.nearest("bench", c, terrain="shrine"), [(c,) for c in centers])
+        nearest_scan_ms, want = timed(lambda c: scan_nearest(rooms, c, "shrine"), [(c,) for c in scan_calls])
+        assert got[:len(want)] == want
+
+        print(f"{len(rooms):>10,} {build:>8.2f} {radius_ms:>10.3f} {radius_scan_ms:>8.1f} "
+              f"{nearest_ms:>11.3f} {nearest_scan_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 300, 600])
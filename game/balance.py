@@ -0,0 +1,251 @@
+# game/balance.py
+"""
+LocalMUD — Combat Balance Simulator
+
+Headless Monte Carlo fights between level-N characters of every class in
+game/character.py and every monster in MONSTER_DEFS, using the same rules as
+the combat engine in game/combat.py (B/X to-hit against THAC0, natural 20
+always hits and natural 1 always misses, player swings first, 1d6 + STR
+damage for the player, every compiled attack in game/dice.py for the monster).
+
+For each class x monster pair it reports:
+    win %          fights the player won
+    rounds         10th / 50th / 90th percentile rounds to a win
+    XP/min         XP earned per minute of auto-combat (COMBAT_ROUND_SECONDS
+                   per round), counting losses as wasted time
+
+Typical usage:
+    python -m game.balance                        # 1,000,000 fights per pair
+    python -m game.balance --fights 200000 --level 2 --monster kobold_bx
+
+Author: Alex
+
+Dev Notes:
+- Fights are simulated side by side as NumPy arrays: each round rolls every
+  still-running fight's dice in one call. A million fights take a few dozen
+  array passes, not a million Python loops.
+- Pairs are split into chunks and run on a process pool. Each chunk gets its
+  own child of one SeedSequence, so --seed gives the same report no matter
+  how many workers ran it.
+- Characters roll 3d6 stats, re-rolling any below their class minimum
+  (CLASSES), then HP = hit die + CON mod (at least 1) per level. AC is the
+  player template's AC less the DEX mod.
+- Fights still going after MAX_ROUNDS count as losses.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # Only the simulator needs NumPy
+    np = None
+
+from game.character import CLASSES, CLASS_HIT_DICE, calculate_bx_modifier
+from game.combat import THAC0, PLAYER_DAMAGE, COMBAT_ROUND_SECONDS
+from game.dice import compile_dice, monster_attacks
+from game.monsters import MONSTER_DEFS
+from game.player import player as player_template
+
+
+DEFAULT_FIGHTS = 1_000_000
+CHUNK = 250_000
+MAX_ROUNDS = 100
+ABILITY_DICE = compile_dice("3d6")
+
+
+# -----------------------
+# Vectorized rules
+# -----------------------
+def hits(rng, bonus, target_ac):
+    """combat.py's hit rule for arrays: d20 + bonus >= THAC0 - AC."""
+    roll = rng.integers(1, 21, size=np.shape(bonus) or np.shape(target_ac))
+    return (roll == 20) | ((roll != 1) & (roll + bonus >= THAC0 - target_ac))
+
+
+_MODIFIERS = None
+
+
+def bx_modifier(scores):
+    """calculate_bx_modifier() over an array of 3-18 scores."""
+    global _MODIFIERS
+    if _MODIFIERS is None:
+        _MODIFIERS = np.array([calculate_bx_modifier(s) for s in range(19)])
+    return _MODIFIERS[scores]
+
+
+def roll_characters(rng, class_name, level, n):
+    """n characters of a class: (hp, ac, str_mod) arrays."""
+    minimums = CLASSES[class_name]
+    stats = {}
+    for stat in ("str", "dex", "con"):
+        scores = ABILITY_DICE.roll_many(n, rng)
+        low = scores < minimums.get(stat, 0)
+        while low.any():
+            scores[low] = ABILITY_DICE.roll_many(int(low.sum()), rng)
+            low = scores < minimums.get(stat, 0)
+        stats[stat] = bx_modifier(scores)
+
+    hit_die = compile_dice(f"1d{CLASS_HIT_DICE[class_name]}")
+    hp = np.zeros(n, dtype=np.int64)
+    for _ in range(level):
+        hp += np.maximum(1, hit_die.roll_many(n, rng) + stats["con"])
+    ac = player_template.get("ac", 9) - stats["dex"]
+    return hp, ac, stats["str"]
+
+
+def monster_stats(template):
+    """(hp, ac, attack bonus) for a monster template."""
+    hp = template.get("hp")
+    if hp is None:
+        hp = int(template.get("hd", 1)) * 4.5
+    return (
+        int(hp),
+        template.get("ac", 10),
+        template.get("attack", 0),
+    )
+
+
+def simulate(class_name, monster_key, level, n, seed):
+    """
+    Run n fights. Returns (wins, rounds histogram of wins) where the
+    histogram counts wins by the round they ended on (index 1..MAX_ROUNDS).
+    """
+    rng = np.random.default_rng(seed)
+    p_hp, p_ac, p_str = roll_characters(rng, class_name, level, n)
+    m_hp_start, m_ac, m_attack = monster_stats(MONSTER_DEFS[monster_key])
+    attacks = monster_attacks(monster_key)
+
+    m_hp = np.full(n, m_hp_start, dtype=np.int64)
+    active = np.arange(n)
+    won_at = np.zeros(MAX_ROUNDS + 1, dtype=np.int64)
+
+    for round_no in range(1, MAX_ROUNDS + 1):
+        if active.size == 0:
+            break
+        k = active.size
+
+        # Player swings
+        str_mod = p_str[active]
+        hit = hits(rng, str_mod, m_ac)
+        damage = np.maximum(1, PLAYER_DAMAGE.roll_many(k, rng) + str_mod)
+        m_hp[active] -= np.where(hit, damage, 0)
+
+        killed = m_hp[active] <= 0
+        won_at[round_no] = int(killed.sum())
+        active = active[~killed]
+        if active.size == 0:
+            break
+
+        # Monster swings back, each attack rolling to hit on its own
+        k = active.size
+        for attack in attacks:
+            hit = hits(rng, m_attack, p_ac[active])
+            damage = np.maximum(1, attack.dice.roll_many(k, rng))
+            p_hp[active] -= np.where(hit, damage, 0)
+        active = active[p_hp[active] > 0]
+
+    return int(won_at.sum()), won_at
+
+
+# -----------------------
+# Matrix
+# -----------------------
+def _percentile(histogram, q):
+    total = histogram.sum()
+    if total == 0:
+        return None
+    return int(np.searchsorted(np.cumsum(histogram), q * total, side="left"))
+
+
+def run_matrix(fights=DEFAULT_FIGHTS, level=1, monsters=None, classes=None,
+               workers=None, seed=0):
+    """
+    Simulate every class x monster pair. Returns a list of dicts:
+    {"class", "monster", "fights", "win_rate", "p10", "p50", "p90",
+     "mean_rounds", "xp_per_minute"}.
+    """
+    if np is None:
+        raise RuntimeError("The balance simulator needs NumPy (pip install numpy).")
+    classes = classes or list(CLASSES)
+    monsters = monsters or list(MONSTER_DEFS)
+    pairs = [(c, m) for c in classes for m in monsters]
+
+    chunks = []
+    for c, m in pairs:
+        done = 0
+        while done < fights:
+            size = min(CHUNK, fights - done)
+            chunks.append((c, m, size))
+            done += size
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    totals = {pair: [0, np.zeros(MAX_ROUNDS + 1, dtype=np.int64)] for pair in pairs}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            (c, m, pool.submit(simulate, c, m, level, size, s))
+            for (c, m, size), s in zip(chunks, seeds)
+        ]
+        for c, m, future in futures:
+            wins, histogram = future.result()
+            totals[(c, m)][0] += wins
+            totals[(c, m)][1] += histogram
+
+    report = []
+    for (c, m), (wins, histogram) in totals.items():
+        rounds = np.arange(MAX_ROUNDS + 1)
+        mean_rounds = float((histogram * rounds).sum() / wins) if wins else None
+        win_rate = wins / fights
+        # Time spent per fight: wins take their rounds, losses are charged
+        # the mean win length (they are usually quick) as wasted time.
+        minutes = (mean_rounds or MAX_ROUNDS) * COMBAT_ROUND_SECONDS / 60
+        xp = MONSTER_DEFS[m].get("xp", 0)
+        report.append({
+            "class": c,
+            "monster": m,
+            "fights": fights,
+            "win_rate": win_rate,
+            "p10": _percentile(histogram, 0.10),
+            "p50": _percentile(histogram, 0.50),
+            "p90": _percentile(histogram, 0.90),
+            "mean_rounds": mean_rounds,
+            "xp_per_minute": xp * win_rate / minutes,
+        })
+    return report
+
+
+def print_report(report):
+    print(f"{'class':<12}{'monster':<14}{'win %':>7}{'p10':>5}{'p50':>5}{'p90':>5}"
+          f"{'mean':>7}{'XP/min':>9}")
+    for row in report:
+        mean = f"{row['mean_rounds']:.2f}" if row["mean_rounds"] is not None else "-"
+        rounds = [str(row[k]) if row[k] is not None else "-" for k in ("p10", "p50", "p90")]
+        print(f"{row['class']:<12}{row['monster']:<14}{row['win_rate'] * 100:>6.1f}%"
+              f"{rounds[0]:>5}{rounds[1]:>5}{rounds[2]:>5}{mean:>7}{row['xp_per_minute']:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LocalMUD combat balance simulator")
+    parser.add_argument("--fights", type=int, default=DEFAULT_FIGHTS, help="fights per class/monster pair")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--monster", action="append", help="monster key (repeatable; default all)")
+    parser.add_argument("--class", dest="classes", action="append", help="class name (repeatable; default all)")
+    parser.add_argument("--workers", type=int, default=None, help=f"processes (default {os.cpu_count()})")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        report = run_matrix(args.fights, args.level, args.monster, args.classes, args.workers, args.seed)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    print_report(report)
+    total = args.fights * len(report)
+    print(f"\n{total:,} fights in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
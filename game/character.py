@@ -85,6 +85,17 @@ CLASSES = {
     "Halfling": {"dex": 9, "con": 9}
 }
 
+# B/X hit die per class (sides of the die rolled for HP each level)
+CLASS_HIT_DICE = {
+    "Fighter": 8,
+    "Thief": 4,
+    "Cleric": 6,
+    "Magic-User": 4,
+    "Dwarf": 8,
+    "Elf": 6,
+    "Halfling": 6
+}
+
 BACKGROUND_OPTIONS = [
     "Wandering Spoon Monk",
     "Orb Scholar",
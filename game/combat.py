@@ -1,6 +1,7 @@
 # game/combat.py
 """
-Lightweight combat helpers for parser-integrated combat.
+Lightweight combat helpers for parser-integrated combat, plus the combat
+engine behind ATTACK, FLEE and AUTO (bottom of this file).
 
 Assumptions about inputs (keep these in sync with your parser / monster manager):
 - player is a dict with at least:
@@ -17,11 +18,36 @@ Assumptions about inputs (keep these in sync with your parser / monster manager)
     - "loot": list of item ids (optional)
 
 The module exposes small, well-documented functions the parser can call.
+
+Combat engine:
+- ATTACK [target] engages every hostile monster in the room (the pack) and
+  fights one round: the player swings at the target, then the whole pack
+  swings back in a single pass.
+- Fight state is per session: a Fight in game_state["combat"]. Nothing about
+  a fight lives on the player or the monsters, so any number of players can
+  fight at once, even the same pack.
+- AUTO ON keeps fighting every COMBAT_ROUND_SECONDS on the world scheduler;
+  COMBAT.tick() runs every auto fight in one pass. Output of those rounds goes
+  to game_state["notify"] (the message log's extend, or a session's send);
+  if the player dies, game_state["on_death"] runs after that output.
+- A round costs O(combatants): hits and damage are tallied per monster name
+  as plain ints and turned into a handful of lines at the end, so a pack of
+  ten kobolds gives "10 Kobolds attack: 4 hit for 13 damage.", not ten lines.
+- Hit rolls are B/X style: d20 + bonus against 19 - AC (descending AC).
+  Each of a monster's attacks (game/dice.py compiles its "attacks" or
+  "damage" strings) rolls to hit on its own.
 """
 
-from typing import Dict, List, Iterable, Optional, Tuple
+from typing import Dict, List, Optional
 import random
 
+from game import spawn
+from game.commands import command, dispatch
+from game.dice import compile_dice, monster_attacks
+from game.monsters import MONSTER_DEFS
+from game.result import CommandResult, TAG_MONSTER, TAG_DAMAGE
+from game.world_journal import WORLD_JOURNAL
+
 # -----------------------
 # Low-level utilities
 # -----------------------
@@ -130,36 +156,301 @@ def award_xp_and_loot(player: Dict, monster: Dict, room: Dict, *, add_item_fn=No
 # -----------------------
 # Helpers
 # -----------------------
-def find_target_by_name_or_index(name: str, monsters_in_room: Iterable[Dict]) -> Optional[Dict]:
+def find_target_by_name_or_index(name: str, monsters_in_room) -> Optional[Dict]:
     """
     Resolve a target by name or by name with index suffix ("kobold 2" or "kobold#2").
-    - name: raw user input (already lowercased)
-    - monsters_in_room: iterable of monster instances (must contain "name" and "instance_id")
+    A prefix of the name or of one of its words ("kob") also matches.
+    - name: raw user input
+    - monsters_in_room: the room's spawn.RoomRoster (O(1) lookup), or any
+      iterable of monster instances in display order
     Returns the matched monster instance or None.
     """
-    name = name.strip()
-    # handle "name#n" or "name n" suffix
-    parts = name.replace("#", " ").rsplit(" ", 1)
-    target_name = parts[0]
-    idx = None
-    if len(parts) == 2 and parts[1].isdigit():
-        idx = int(parts[1])
-
-    # build list of matches in display order
-    matches = [m for m in monsters_in_room if m.get("name", "").lower() == target_name.lower()]
-
-    if not matches:
-        # try substring match (first match)
+    if not isinstance(monsters_in_room, spawn.RoomRoster):
+        roster = spawn.RoomRoster()
         for m in monsters_in_room:
-            if target_name.lower() in m.get("name", "").lower():
-                return m
-        return None
-
-    if idx is None:
-        return matches[0]
-    if idx <= 0 or idx > len(matches):
-        return None
-    return matches[idx - 1]
+            roster.add(m)
+        monsters_in_room = roster
+    return monsters_in_room.find(name)
 
 def is_dead(entity: Dict) -> bool:
     return int(entity.get("hp", 0)) <= 0
+
+
+# -----------------------
+# Combat engine
+# -----------------------
+COMBAT_ROUND_SECONDS = 2
+THAC0 = 19                  # B/X to-hit baseline for level 1-3 fighters and 1 HD monsters
+PLAYER_DAMAGE = compile_dice("1d6")    # unarmed/default weapon
+FLEE_TARGET = 3             # flee succeeds on d6 + dex_mod >= FLEE_TARGET
+
+_roll = random.randint
+
+
+def _hits(bonus: int, target_ac: int) -> bool:
+    roll = _roll(1, 20)
+    return roll == 20 or (roll != 1 and roll + bonus >= THAC0 - target_ac)
+
+
+class Fight:
+    """One session's fight: who is fighting, where, and against which pack."""
+
+    __slots__ = ("player", "game_state", "rooms", "room", "targets", "auto", "rounds")
+
+    def __init__(self, player, game_state, rooms, room):
+        self.player     = player
+        self.game_state = game_state
+        self.rooms      = rooms
+        self.room       = room
+        self.targets    = []        # engaged instance ids, current target first
+        self.auto       = False
+        self.rounds     = 0
+
+    def living(self):
+        """Engaged monsters still alive and still in the fight's room."""
+        instances = spawn.INSTANCES
+        alive = []
+        for instance_id in self.targets:
+            inst = instances.get(instance_id)
+            if inst is not None and inst["room"] == self.room and inst["hp"] > 0:
+                alive.append(inst)
+        if len(alive) != len(self.targets):
+            self.targets = [inst["id"] for inst in alive]
+        return alive
+
+    def engage(self, instances, target=None):
+        """Add monsters to the fight; put target (if any) first."""
+        known = set(self.targets)
+        self.targets.extend(inst["id"] for inst in instances if inst["id"] not in known)
+        if target is not None:
+            self.targets.remove(target["id"])
+            self.targets.insert(0, target["id"])
+
+    def notify(self, lines):
+        notify = self.game_state.get("notify")
+        if notify is not None:
+            notify(lines)
+
+
+class CombatManager:
+    """Runs every auto-combat fight once per combat round."""
+
+    def __init__(self):
+        self.auto = set()       # Fights fighting on their own
+
+    def start(self, fight):
+        fight.game_state["combat"] = fight
+        if fight.auto:
+            self.auto.add(fight)
+
+    def end(self, fight):
+        self.auto.discard(fight)
+        if fight.game_state.get("combat") is fight:
+            del fight.game_state["combat"]
+
+    def set_auto(self, fight, on):
+        fight.auto = on
+        if on:
+            self.auto.add(fight)
+        else:
+            self.auto.discard(fight)
+
+    def tick(self):
+        """One round for every auto fight. Returns how many rounds ran."""
+        ran = 0
+        for fight in list(self.auto):
+            if fight.player.get("location") != fight.room:
+                self.end(fight)         # walked away
+                continue
+            result = resolve_pack_round(fight)
+            if result.lines:
+                fight.notify(result.lines + [""])
+            on_death = fight.game_state.get("on_death")
+            if fight.game_state.get("game_over") and on_death is not None:
+                on_death()
+            ran += 1
+        return ran
+
+    def __len__(self):
+        return len(self.auto)
+
+
+# Runtime registry: auto-combat fights across every session
+COMBAT = CombatManager()
+
+
+def schedule_combat(scheduler, manager=COMBAT, seconds=COMBAT_ROUND_SECONDS):
+    """Run auto-combat rounds every `seconds` on the world scheduler."""
+    ticks = max(1, int(seconds / scheduler.tick_seconds))
+    return scheduler.schedule(ticks, manager.tick, every=ticks)
+
+
+def _kill(fight, inst, result):
+    """Remove a slain monster and pay out its XP and loot."""
+    name = inst["name"]
+    spawn.remove_instance(inst["id"])
+    room = fight.rooms.get(fight.room)
+    lines = award_xp_and_loot(fight.player, inst, room if room is not None else {})
+    if inst.get("loot") and room is not None:
+        WORLD_JOURNAL.mark_room(fight.room)
+    result.say(f"You have slain the {name}!", (TAG_MONSTER, name))
+    for line in lines:
+        result.say(line)
+    result.event("killed", monster=inst["id"], name=name, room=fight.room)
+
+
+def resolve_pack_round(fight, player_swings=True):
+    """
+    One round: the player swings at the current target, then every living
+    engaged monster swings back in one pass. Returns a CommandResult.
+    """
+    player = fight.player
+    result = CommandResult()
+    pack = fight.living()
+    fight.rounds += 1
+
+    # Player's swing
+    if player_swings and pack:
+        target = pack[0]
+        name = target["name"]
+        if _hits(player.get("str_mod", 0), target.get("ac", 10)):
+            damage = max(1, PLAYER_DAMAGE() + player.get("str_mod", 0))
+            target["hp"] -= damage
+            WORLD_JOURNAL.mark_instance(target["id"])
+            result.say(f"You hit the {name} for {damage} damage.",
+                       (TAG_MONSTER, name), (TAG_DAMAGE, str(damage)))
+            if target["hp"] <= 0:
+                _kill(fight, target, result)
+                pack = pack[1:]
+        else:
+            result.say(f"You miss the {name}.", (TAG_MONSTER, name))
+
+    # The pack's swings, tallied per monster name: [attackers, hits, damage]
+    player_ac = player.get("ac", 10)
+    tally = {}
+    for inst in pack:
+        template = MONSTER_DEFS.get(inst["template"], {})
+        bonus = template.get("attack", 0)
+        counts = tally.get(inst["name"])
+        if counts is None:
+            counts = tally[inst["name"]] = [0, 0, 0]
+        counts[0] += 1
+        for attack in monster_attacks(inst["template"]):
+            if _hits(bonus, player_ac):
+                counts[1] += 1
+                counts[2] += max(1, attack.dice())
+
+    taken = 0
+    for name, (attackers, hits, damage) in tally.items():
+        taken += damage
+        if attackers == 1:
+            if hits:
+                result.say(f"The {name} hits you for {damage} damage.",
+                           (TAG_MONSTER, name), (TAG_DAMAGE, str(damage)))
+            else:
+                result.say(f"The {name} misses you.", (TAG_MONSTER, name))
+        else:
+            result.say(f"{attackers} {name}s attack: {hits} hit for {damage} damage.",
+                       (TAG_MONSTER, f"{name}s"), (TAG_DAMAGE, str(damage)))
+
+    if taken:
+        player["hp"] = player.get("hp", 0) - taken
+        result.event("damaged", amount=taken, hp=player["hp"])
+
+    if player.get("hp", 0) <= 0:
+        player["hp"] = 0
+        result.say("You have been slain.")
+        result.event("died", room=fight.room)
+        fight.game_state["game_over"] = True
+        COMBAT.end(fight)
+    elif not pack:
+        result.say("The fight is over.")
+        COMBAT.end(fight)
+    else:
+        result.say(f"HP: {player['hp']}/{player.get('max_hp', player['hp'])}")
+    return result
+
+
+def _current_fight(ctx):
+    fight = ctx["game_state"].get("combat")
+    if fight is not None and fight.room != ctx["room_id"]:
+        COMBAT.end(fight)
+        fight = None
+    return fight
+
+
+@command("attack", "kill", "k", help=[
+    "ATTACK [monster] — Fight a monster here. Every hostile monster in the room joins in.",
+    "Name a target (\"attack kobold 2\") or leave it out to keep hitting the current one.",
+    "K and KILL are shortcuts. See also FLEE and AUTO."
+])
+def cmd_attack(ctx, tokens):
+    player = ctx["player"]
+    if player.get("hp", 0) <= 0:
+        return "You are in no state to fight."
+
+    roster = spawn.room_roster(ctx["room_id"])
+    here = [inst for inst in roster if inst["hp"] > 0]
+    if not here:
+        return "There is nothing here to fight."
+
+    fight = _current_fight(ctx)
+    target = None
+    if len(tokens) > 1:
+        wanted = " ".join(tokens[1:])
+        target = find_target_by_name_or_index(wanted, roster)
+        if target is None or target["hp"] <= 0:
+            return f"You don't see '{wanted}' here."
+    elif fight is None:
+        target = next((inst for inst in here if inst.get("hostile", True)), here[0])
+
+    if fight is None:
+        fight = Fight(player, ctx["game_state"], ctx["rooms"], ctx["room_id"])
+        fight.auto = ctx["game_state"].get("auto_combat", False)
+        COMBAT.start(fight)
+    pack = [inst for inst in here if inst.get("hostile", True) or inst is target]
+    fight.engage(pack, target)
+    return resolve_pack_round(fight)
+
+
+@command("flee", help=[
+    "FLEE — Try to escape the fight through a random exit.",
+    "If you fail, every monster gets a free swing."
+])
+def cmd_flee(ctx, tokens):
+    fight = _current_fight(ctx)
+    if fight is None:
+        return "You aren't fighting anything."
+
+    exits = list(ctx["room"].get("exits", {}))
+    if exits and _roll(1, 6) + ctx["player"].get("dex_mod", 0) >= FLEE_TARGET:
+        direction = random.choice(exits)
+        COMBAT.end(fight)
+        result = CommandResult(["You break away from the fight!"])
+        moved = dispatch(ctx, ["go", direction])
+        if moved is not None:
+            result.extend(moved)
+        return result.event("fled", room=ctx["room_id"])
+
+    result = CommandResult(["You fail to get away!"])
+    return result.extend(resolve_pack_round(fight, player_swings=False))
+
+
+@command("auto", help=[
+    "AUTO [ON|OFF] — Keep fighting on your own every few seconds.",
+    "With no argument, shows whether auto-combat is on."
+])
+def cmd_auto(ctx, tokens):
+    game_state = ctx["game_state"]
+    if len(tokens) < 2:
+        state = "ON" if game_state.get("auto_combat") else "OFF"
+        return f"Auto-combat is {state}."
+    if tokens[1] not in ("on", "off"):
+        return "Usage: AUTO ON or AUTO OFF."
+
+    on = tokens[1] == "on"
+    game_state["auto_combat"] = on
+    fight = _current_fight(ctx)
+    if fight is not None:
+        COMBAT.set_auto(fight, on)
+    return f"Auto-combat {'ON' if on else 'OFF'}."
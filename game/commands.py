@@ -0,0 +1,98 @@
+# commands.py
+"""
+LocalMUD — Command Registry
+
+Maps verbs and their aliases to handler callables. Subsystems register their
+commands with the @command decorator; the parser looks the first token up in
+a single dict instead of walking a chain of if-statements.
+
+Typical usage:
+- Decorate a handler in any game module:
+
+      @command("look", "l", help=["LOOK — Show this room's description."])
+      def cmd_look(ctx, tokens):
+          ...
+
+- parser.handle_command builds the context dict and calls dispatch().
+
+Handlers receive:
+- ctx    : dict with game_state, player, rooms, items, motd, message_log,
+           npcs and the current room
+- tokens : the lowercased, whitespace-split command
+
+and return a CommandResult (game/result.py). A plain string or list of
+strings is accepted too and wrapped; None means "unknown command".
+
+Author: Alex
+
+Dev Notes:
+- COMMANDS is generated from the registry, so HELP never goes stale.
+- Hidden commands (easter eggs, dev tools) are dispatched but not listed.
+"""
+
+from game.result import CommandResult
+
+
+# verb/alias -> CommandSpec
+REGISTRY = {}
+
+# Display names shown by HELP, in registration order
+COMMANDS = []
+
+
+class CommandSpec:
+    """One registered command: its handler, names and help text."""
+
+    __slots__ = ("name", "aliases", "handler", "help", "hidden")
+
+    def __init__(self, name, aliases, handler, help=None, hidden=False):
+        self.name    = name
+        self.aliases = aliases
+        self.handler = handler
+        self.help    = help or []
+        self.hidden  = hidden
+
+
+def command(verb, *aliases, name=None, help=None, hidden=False):
+    """
+    Register the decorated function as the handler for `verb` and `aliases`.
+    `name` overrides the display name in HELP (e.g. "talk to" for "talk").
+    """
+    def decorator(func):
+        spec = CommandSpec(name or verb, (verb,) + aliases, func, help, hidden)
+        for word in spec.aliases:
+            if word in REGISTRY:
+                raise ValueError(f"Command '{word}' is already registered.")
+            REGISTRY[word] = spec
+        if not hidden:
+            COMMANDS.append(spec.name)
+        return func
+    return decorator
+
+
+def get_command(word):
+    """Return the CommandSpec registered for `word`, or None."""
+    return REGISTRY.get(word)
+
+
+def get_help(word):
+    """Return the detailed help lines for `word`, or None if there are none."""
+    spec = REGISTRY.get(word)
+    if spec is None or not spec.help:
+        return None
+    return list(spec.help)
+
+
+def dispatch(ctx, tokens):
+    """
+    Look up tokens[0] and run its handler.
+    Returns the handler's result as a CommandResult, or None when the verb is
+    unknown (or the handler returned None: "not mine, fall through").
+    """
+    spec = REGISTRY.get(tokens[0])
+    if spec is None:
+        return None
+    result = spec.handler(ctx, tokens)
+    if result is None:
+        return None
+    return CommandResult.of(result)
@@ -0,0 +1,282 @@
+# game/dice.py
+"""
+LocalMUD — Dice
+
+Parses dice notation once and keeps the compiled result, so a round of
+combat rolls dice without re-reading strings.
+
+Notation:
+    "1d6"          one six-sided die
+    "2d4+1"        two d4 plus one ("-1" works too)
+    "d8"           same as "1d8"
+    "4d6kh3"       roll four d6, keep the highest three ("k3" works too)
+    "3"            a flat 3
+    "spear 1d6"    a labelled attack (the label is for display)
+    "1d3/1d3/1d6"  several attacks, B/X stat block style
+
+Typical usage:
+    dice = compile_dice("2d4+1")
+    dice()                       -> one roll, e.g. 6
+    dice.roll_many(100_000)      -> NumPy array of 100,000 rolls
+    dice.distribution()          -> {total: probability}
+
+    for label, dice in monster_attacks("kobold_bx"):
+        ...
+
+Author: Alex
+
+Dev Notes:
+- compile_dice() and compile_attacks() are cached, so every "1d6" in the
+  game is one Dice object.
+- Monster templates are compiled when this module loads (compile_monsters()),
+  so a bad damage string is logged at startup, not mid-fight. A template
+  that still fails to parse fights with 1d4, as combat always did.
+- roll_many() draws a whole batch in one NumPy call: plain dice sample
+  their exact distribution table, keep-highest dice sort a (n, count)
+  array. Without NumPy it falls back to a list of single rolls.
+"""
+
+import logging
+import math
+import random
+import re
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations_with_replacement
+
+try:
+    import numpy as np
+except ImportError:  # roll_many() falls back to a list
+    np = None
+
+from game.monsters import MONSTER_DEFS
+
+
+DEFAULT_DAMAGE = "1d4"
+TABLE_LIMIT = 200_000       # distribution tables bigger than this are not built
+
+_TERM = re.compile(
+    r"^(?:(?P<count>\d*)d(?P<sides>\d+)(?:kh?(?P<keep>\d+))?)?"
+    r"(?P<bonus>[+-]?\d+)?$"
+)
+
+Attack = namedtuple("Attack", "label dice")
+
+
+class Dice:
+    """A compiled NdM(khK)+B expression."""
+
+    __slots__ = ("count", "sides", "keep", "bonus", "expr", "_table", "_rolls")
+
+    def __init__(self, count=1, sides=4, bonus=0, keep=None, expr=None):
+        if sides < 1 and count:
+            raise ValueError(f"Dice need at least one side: {expr!r}")
+        if keep is not None and keep < 1:
+            raise ValueError(f"Keep at least one die: {expr!r}")
+        self.count = count
+        self.sides = sides
+        self.keep  = keep if keep is not None and keep < count else None
+        self.bonus = bonus
+        self.expr  = expr or self._format()
+        self._table = None
+        self._rolls = self._compile()
+
+    def _format(self):
+        text = f"{self.count}d{self.sides}" if self.count else ""
+        if self.keep is not None:
+            text += f"kh{self.keep}"
+        if self.bonus or not text:
+            text += f"{self.bonus:+d}" if text else str(self.bonus)
+        return text
+
+    def _compile(self):
+        """The cheapest roller for this shape of expression."""
+        count, sides, bonus, keep = self.count, self.sides, self.bonus, self.keep
+        if count == 0:
+            return lambda rng: bonus
+        if count == 1:
+            return lambda rng: rng.randint(1, sides) + bonus
+        if keep is None:
+            return lambda rng: sum(rng.randint(1, sides) for _ in range(count)) + bonus
+        return lambda rng: sum(sorted(rng.randint(1, sides) for _ in range(count))[-keep:]) + bonus
+
+    def __call__(self, rng=random):
+        """One roll. rng is anything with randint (the random module by default)."""
+        return self._rolls(rng)
+
+    roll = __call__
+
+    @property
+    def minimum(self):
+        return (self.keep or self.count) + self.bonus
+
+    @property
+    def maximum(self):
+        return (self.keep or self.count) * self.sides + self.bonus
+
+    @property
+    def mean(self):
+        if self.keep is None:
+            return self.count * (self.sides + 1) / 2 + self.bonus
+        return sum(total * p for total, p in self.distribution().items())
+
+    def distribution(self):
+        """Exact {total: probability}. Raises ValueError if too large to enumerate."""
+        values, probs = self._distribution_arrays()
+        return dict(zip(values, probs))
+
+    def _distribution_arrays(self):
+        if self.count == 0:
+            return [self.bonus], [1.0]
+
+        if self.keep is None:
+            if (self.count * self.sides) ** 2 > 50 * TABLE_LIMIT:
+                raise ValueError(f"Too many outcomes to tabulate {self.expr!r}")
+            # Convolve one die at a time: ways[t] = ways to roll total t
+            ways = {0: 1}
+            for _ in range(self.count):
+                step = {}
+                for total, n in ways.items():
+                    for face in range(1, self.sides + 1):
+                        step[total + face] = step.get(total + face, 0) + n
+                ways = step
+        else:
+            if math.comb(self.sides + self.count - 1, self.count) > TABLE_LIMIT:
+                raise ValueError(f"Too many outcomes to tabulate {self.expr!r}")
+            ways = {}
+            for faces in combinations_with_replacement(range(1, self.sides + 1), self.count):
+                # Orderings of this multiset of faces
+                n = math.factorial(self.count)
+                for face in set(faces):
+                    n //= math.factorial(faces.count(face))
+                total = sum(faces[-self.keep:])
+                ways[total] = ways.get(total, 0) + n
+
+        outcomes = self.sides ** self.count
+        values = sorted(ways)
+        return [v + self.bonus for v in values], [ways[v] / outcomes for v in values]
+
+    def table(self):
+        """(values, cumulative probabilities) as NumPy arrays, or None."""
+        if self._table is None:
+            try:
+                values, probs = self._distribution_arrays()
+            except ValueError:
+                self._table = False
+            else:
+                self._table = (np.array(values), np.cumsum(probs))
+        return self._table or None
+
+    def roll_many(self, n, rng=None):
+        """
+        n rolls in one call, as an int array (a list without NumPy). rng is a
+        numpy.random.Generator; a fresh one is used if omitted.
+        """
+        if np is None:
+            rng = rng or random
+            return [self._rolls(rng) for _ in range(n)]
+
+        rng = rng if rng is not None else np.random.default_rng()
+        if self.count == 0:
+            return np.full(n, self.bonus)
+        if self.count == 1:
+            return rng.integers(1, self.sides + 1, size=n) + self.bonus
+
+        table = self.table()
+        if table is not None:
+            values, cumulative = table
+            picks = np.searchsorted(cumulative, rng.random(n), side="right")
+            return values[np.minimum(picks, len(values) - 1)]
+
+        rolls = rng.integers(1, self.sides + 1, size=(n, self.count))
+        if self.keep is not None:
+            rolls.sort(axis=1)
+            rolls = rolls[:, -self.keep:]
+        return rolls.sum(axis=1) + self.bonus
+
+    def __repr__(self):
+        return f"Dice({self.expr!r})"
+
+
+# -----------------------
+# Parsing
+# -----------------------
+@lru_cache(maxsize=None)
+def compile_dice(expr):
+    """ "2d4+1" -> Dice. Raises ValueError on anything else."""
+    text = str(expr).lower().replace(" ", "")
+    match = _TERM.match(text)
+    if not text or match is None:
+        raise ValueError(f"Not a dice expression: {expr!r}")
+
+    bonus = int(match["bonus"] or 0)
+    if match["sides"] is None:
+        return Dice(count=0, sides=0, bonus=bonus, expr=text)
+    keep = int(match["keep"]) if match["keep"] else None
+    return Dice(int(match["count"] or 1), int(match["sides"]), bonus, keep, expr=text)
+
+
+@lru_cache(maxsize=None)
+def _compile_attack_string(text):
+    attacks = []
+    for part in text.split("/"):
+        # Leading words are the label: "bite 1d6 + 1" -> ("bite", 1d6+1)
+        words = part.split()
+        for i in range(len(words)):
+            try:
+                dice = compile_dice("".join(words[i:]))
+            except ValueError:
+                continue
+            attacks.append(Attack(" ".join(words[:i]) or None, dice))
+            break
+        else:
+            raise ValueError(f"No dice in attack {part.strip()!r}")
+    return tuple(attacks)
+
+
+def compile_attacks(spec):
+    """
+    Attack strings -> tuple of Attack(label, dice). spec is one string
+    ("spear 1d6", "1d3/1d3/1d6") or a list of them (a template's "attacks").
+    """
+    if isinstance(spec, str):
+        return _compile_attack_string(spec)
+    attacks = ()
+    for text in spec:
+        attacks += _compile_attack_string(text)
+    return attacks
+
+
+# -----------------------
+# Monster templates
+# -----------------------
+def _template_attacks(key, template):
+    for spec in (template.get("attacks"), template.get("damage")):
+        if not spec:
+            continue
+        try:
+            return compile_attacks(spec)
+        except ValueError as e:
+            logging.error(f"[ERROR] Monster '{key}' has bad damage dice: {e}")
+    return compile_attacks(DEFAULT_DAMAGE)
+
+
+def compile_monsters(defs=MONSTER_DEFS):
+    """Compile every template's attacks into MONSTER_ATTACKS."""
+    for key, template in defs.items():
+        MONSTER_ATTACKS[key] = _template_attacks(key, template)
+    return MONSTER_ATTACKS
+
+
+def monster_attacks(template_key):
+    """A template's compiled attacks (compiling late additions on first use)."""
+    attacks = MONSTER_ATTACKS.get(template_key)
+    if attacks is None:
+        attacks = MONSTER_ATTACKS[template_key] = _template_attacks(
+            template_key, MONSTER_DEFS.get(template_key, {}))
+    return attacks
+
+
+# Runtime registry: template key -> tuple of Attack
+MONSTER_ATTACKS = {}
+compile_monsters()
@@ -0,0 +1,226 @@
+# entities.py
+"""
+LocalMUD — Compact World Entities
+
+Slotted classes for the objects the world has the most of: rooms, their exits,
+and monster instances. A plain dict per room (plus a dict per exits table)
+carries a hash table per object; these classes store the common keys in fixed
+slots and only fall back to a small dict for rare keys.
+
+Every class is a MutableMapping, so existing code keeps working unchanged:
+
+    room["name"], room.get("items", []), room.setdefault("flags", {}),
+    "exits" in room, for d in room["exits"]: ...
+
+Typical usage:
+- load_overworld() converts built regions with compact_rooms()
+- spawn.create_instance() returns MonsterInstance objects
+
+Author: Alex
+
+Dev Notes:
+- Each key lives in a slot named "_<key>", so a room's "items" key can't
+  shadow Mapping.items().
+- A key is "missing" when its slot is unset, matching dict semantics for
+  room.get(...) and "key" in room.
+- Exits iterate in compass order (north, south, east, west, up, down), then
+  any unusual directions in insertion order.
+- MonsterInstance reads template-constant fields (stats, description, xp,
+  loot) from MONSTER_DEFS instead of holding a copy per monster.
+"""
+
+from collections.abc import MutableMapping
+
+from game.monsters import MONSTER_DEFS
+
+
+_MISSING = object()
+
+
+class SlotMapping(MutableMapping):
+    """Base class: fixed keys in __slots__, anything else in _extra."""
+
+    __slots__ = ("_extra",)
+    FIELDS = ()
+    _slot_of = {}       # key -> slot attribute name
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._slot_of = {key: "_" + key for key in cls.FIELDS}
+
+    def __init__(self, data=None, **kwargs):
+        self._extra = None
+        if data:
+            for key, value in data.items():
+                self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        return data if isinstance(data, cls) else cls(data)
+
+    def to_dict(self):
+        """Return a plain (deep for nested entities) dict copy."""
+        return {k: (v.to_dict() if isinstance(v, SlotMapping) else v) for k, v in self.items()}
+
+    def __getitem__(self, key):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            value = getattr(self, slot, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            return getattr(self, slot, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            return hasattr(self, slot)
+        return self._extra is not None and key in self._extra
+
+    def __setitem__(self, key, value):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key, slot in self._slot_of.items():
+            if hasattr(self, slot):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        count = sum(1 for slot in self._slot_of.values() if hasattr(self, slot))
+        return count + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def __getstate__(self):
+        return {k: getattr(self, k) for k in self._all_slots() if hasattr(self, k)}
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def _all_slots(cls):
+        slots = []
+        for klass in cls.__mro__:
+            slots.extend(getattr(klass, "__slots__", ()))
+        return slots
+
+
+class Exits(SlotMapping):
+    """direction -> target room id."""
+
+    FIELDS = ("north", "south", "east", "west", "up", "down")
+    __slots__ = tuple("_" + key for key in FIELDS)
+
+
+class Room(SlotMapping):
+    """One room. Nested "exits" are always stored as an Exits object."""
+
+    FIELDS = (
+        "name", "description", "look_description", "terrain", "visited",
+        "items", "exits", "examine_targets", "triggers", "spawns", "flags",
+    )
+    __slots__ = tuple("_" + key for key in FIELDS)
+
+    def __setitem__(self, key, value):
+        if key == "exits" and not isinstance(value, Exits):
+            value = Exits(value)
+        SlotMapping.__setitem__(self, key, value)
+
+    def setdefault(self, key, default=None):
+        # Return what was stored: setdefault("exits", {}) must hand back the
+        # Exits object, not the caller's dict that __setitem__ converted.
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+
+class MonsterInstance(SlotMapping):
+    """A live monster. Template-constant fields come from MONSTER_DEFS."""
+
+    FIELDS = (
+        "id", "template", "name", "hp", "max_hp", "ac", "room",
+        "hostile", "created_at",
+    )
+    __slots__ = tuple("_" + key for key in FIELDS)
+
+    # Read through to the template unless overridden on the instance
+    TEMPLATE_FIELDS = {
+        "stats":       ("base_stats", {}),
+        "description": ("description", ""),
+        "xp":          ("xp", 0),
+        "loot":        ("loot", []),
+    }
+
+    def _template_value(self, key):
+        source, fallback = self.TEMPLATE_FIELDS[key]
+        template = MONSTER_DEFS.get(SlotMapping.get(self, "template"), {})
+        return template.get(source, fallback)
+
+    def __getitem__(self, key):
+        try:
+            return SlotMapping.__getitem__(self, key)
+        except KeyError:
+            if key in self.TEMPLATE_FIELDS:
+                return self._template_value(key)
+            raise
+
+    def get(self, key, default=None):
+        value = SlotMapping.get(self, key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if key in self.TEMPLATE_FIELDS:
+            return self._template_value(key)
+        return default
+
+    def __contains__(self, key):
+        return key in self.TEMPLATE_FIELDS or SlotMapping.__contains__(self, key)
+
+    def __iter__(self):
+        yield from SlotMapping.__iter__(self)
+        for key in self.TEMPLATE_FIELDS:
+            if self._extra is None or key not in self._extra:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def compact_rooms(rooms):
+    """Convert every room dict in `rooms` to a Room, in place. Returns rooms."""
+    for room_id, room in rooms.items():
+        if not isinstance(room, Room):
+            rooms[room_id] = Room(room)
+    return rooms
@@ -10,8 +10,9 @@ Format notes (each monster is a dict):
 - hp            : typical hit points (int). If omitted, use hd * average per-die.
 - ac            : Armor Class (B/X style: lower is better; e.g., 6)
 - attack        : a simple attack bonus / to-hit baseline (int)
-- attacks       : list of attack strings e.g., "bite 1d4"
-- damage        : fallback damage expression string (e.g., "1d6")
+- attacks       : list of attack strings e.g., "bite 1d4" (each rolls to hit)
+- damage        : fallback damage expression string (e.g., "1d6"), used when
+                  there is no "attacks" list. Notation is in game/dice.py.
 - xp            : XP awarded for defeating the creature
 - loot          : list of item ids to drop on death (optional)
 - spawn_rooms   : list of room ids where this monster may spawn (optional)
@@ -5,10 +5,15 @@ LocalMUD — Command Parser
 Handles all player input and command logic. Supports aliases, dirty word tracking,
 and command routing to appropriate game functions.
 
+Commands are registered with the @command decorator from game/commands.py and
+dispatched through a single dict lookup. COMMANDS and HELP are generated from
+the registry.
+
 Author: Alex
 """
 
 from game.character import CORE_STATS
+from game.commands import command, dispatch, get_help, COMMANDS
 from config    import VERSION, DEV_NOTE, DIRTY_WORDS, DIRECTION_ALIASES
 from datetime  import datetime
 import traceback
@@ -16,14 +21,14 @@ import random
 import curses
 from utils.log_manager import log_room_error, verify_room_links, prune_error_logs
 from utils.helpers import normalize_room_id
-
-
-COMMANDS = [
-    "examine", "talk to", "go",
-    "look", "inventory", "take", "get", "use",
-    "about", "title", "drop", "character", "help",
-    "clear", "motd", "quit", "exit"
-]
+from world.world_index import get_index, dir_code, NO_ROOM
+from game.world_journal import WORLD_JOURNAL
+from game.result import (
+    CommandResult, QUIT, CONFIRM_TITLE,
+    TAG_ROOM, TAG_ITEM, TAG_NPC, TAG_MONSTER, TAG_EXIT,
+)
+import game.travel      # registers TRAVEL
+import game.combat      # registers ATTACK, FLEE, AUTO
 
 
 def run_curses_game(game_func):
@@ -46,17 +51,15 @@ def handle_command(
     npcs
 ):
     """
-    Interpret a player's text command and return either:
-    - a string
-    - a list of strings
-    - special tokens like "quit" or "confirm_title"
+    Interpret a player's text command and return a CommandResult
+    (game/result.py): lines, tags, events and a QUIT / CONFIRM_TITLE signal.
     """
 
     room_id = normalize_room_id(game_state["current_room"])
     room = rooms.get(room_id)
 
     if not room:
-        return [f"ERROR: Room '{room_id}' not found. You may be stuck in the void."]
+        return CommandResult([f"ERROR: Room '{room_id}' not found. You may be stuck in the void."])
 
     tokens = command.lower().split()
 
@@ -64,96 +67,160 @@ def handle_command(
     for w in tokens:
         if w in DIRTY_WORDS:
             player["curse_count"] = player.get("curse_count", 0) + 1
-            return [
+            return CommandResult([
                 "Let's try to keep it clean.",
                 "*The narrator sighs and adjusts your character sheet.*"
-            ]
+            ])
 
     if not tokens:
-        return "No command entered."
-
-    # EXAMINE
-    if tokens[0] in ("examine", "x"):
-        target = " ".join(tokens[1:])
-        # inventory first
-        for inv in player["inventory"]:
-            if inv.lower() == target:
-                data = items.get(inv, {})
-                return data.get("examine_text",
-                                f"You examine the {inv}, but find nothing unusual.")
-        # room examine targets
-        desc = room.get("examine_targets", {}).get(target)
-        if desc:
-            return desc
-        return "You see nothing special."
-
-    # -----------------------------------------------------------------------------
-    # TALK TO branch:
-    if tokens[0] == "talk" and len(tokens) > 2 and tokens[1] == "to":
-        # 1) split off any "about <topic>"
-        parts = tokens[2:]
-        if "about" in parts:
-            idx = parts.index("about")
-            target_tokens = parts[:idx]
-            topic = " ".join(parts[idx+1:]).lower()
-        else:
-            target_tokens = parts
-            topic = None
-
-        target_name = " ".join(target_tokens).lower()
-        room_key    = game_state["current_room"]
+        return CommandResult(["No command entered."])
+
+    ctx = {
+        "game_state":  game_state,
+        "player":      player,
+        "rooms":       rooms,
+        "items":       items,
+        "motd":        current_motd,
+        "message_log": message_log,
+        "npcs":        npcs,
+        "room":        room,
+        "room_id":     room_id,
+    }
+
+    result = dispatch(ctx, tokens)
 
+    # FALL-THROUGH
+    if result is None:
+        return CommandResult(["Unknown command."])
+    return result
+
+
+# -----------------------------------------------------------------------------
+# EXAMINE
+@command("examine", "x")
+def cmd_examine(ctx, tokens):
+    player = ctx["player"]
+    target = " ".join(tokens[1:])
+    # inventory first
+    for inv in player["inventory"]:
+        if inv.lower() == target:
+            data = ctx["items"].get(inv, {})
+            return data.get("examine_text",
+                            f"You examine the {inv}, but find nothing unusual.")
+    # room examine targets
+    desc = ctx["room"].get("examine_targets", {}).get(target)
+    if desc:
+        return desc
+    return "You see nothing special."
+
+
+# -----------------------------------------------------------------------------
+# TALK TO
+@command("talk", name="talk to")
+def cmd_talk(ctx, tokens):
+    if len(tokens) <= 2 or tokens[1] != "to":
+        return None
+
+    player      = ctx["player"]
+    message_log = ctx["message_log"]
+    debug       = player.get("debug_mode", False)
+
+    # 1) split off any "about <topic>"
+    parts = tokens[2:]
+    if "about" in parts:
+        idx = parts.index("about")
+        target_tokens = parts[:idx]
+        topic = " ".join(parts[idx+1:]).lower()
+    else:
+        target_tokens = parts
+        topic = None
+
+    target_name = " ".join(target_tokens).lower()
+    room_key    = ctx["game_state"]["current_room"]
+
+    if debug:
         message_log.append(f"[DEBUG] room_key: {room_key}, looking for '{target_name}', topic={topic}")
 
-        # 2) find NPCs in this room
-        present = npcs.get(room_key, [])
-        if not present:
+    # 2) find NPCs in this room
+    present = ctx["npcs"].get(room_key, [])
+    if not present:
+        if debug:
             message_log.append(f"[DEBUG] no NPCs in this room")
-            return f"You don't see anyone named '{target_name}' here."
+        return f"You don't see anyone named '{target_name}' here."
 
-        for npc in present:
-            npc_key   = npc["id"]
-            npc_name  = npc.get("name", "<unnamed>").lower()
-            aliases   = [a.lower() for a in npc.get("aliases", [])]
+    for npc in present:
+        npc_key   = npc["id"]
+        npc_name  = npc.get("name", "<unnamed>").lower()
+        aliases   = [a.lower() for a in npc.get("aliases", [])]
 
+        if debug:
             message_log.append(f"[DEBUG] checking NPC: {npc_name}, aliases={aliases}")
 
-            if target_name in [npc_name] + aliases:
-                # 3) triggers
-                try:
-                    for trig in npc.get("triggers", []):
-                        # you can expand this to eval arbitrary conditions
-                        if trig["condition"] == "player_xp > 5" and player.get("xp", 0) > 5:
-                            return trig["response"]
-
-                    # 4) topic-based responses
+        if target_name in [npc_name] + aliases:
+            # 3) triggers
+            try:
+                reply = None
+                for trig in npc.get("triggers", []):
+                    # you can expand this to eval arbitrary conditions
+                    if trig["condition"] == "player_xp > 5" and player.get("xp", 0) > 5:
+                        reply = trig["response"]
+                        break
+
+                # 4) topic-based responses
+                if reply is None:
                     responses = npc.get("responses", {})
                     # exact match, then fallback on None
                     replies  = responses.get(topic) or responses.get(None)
-
                     if replies:
-                        return random.choice(replies)
-
-                    # 5) final fallback: greeting
-                    return npc.get("greeting", f"{npc['name']} has nothing to say.")
-
-                except Exception as e:
-                    message_log.append(f"[ERROR] exception in talk-to: {e}")
-                    for line in traceback.format_exc().splitlines():
-                        message_log.append(f"  {line}")
-                    return "Something went wrong while talking."
-
-        # no match found
-        return f"You don't see anyone named '{target_name}' here."
-    # -----------------------------------------------------------------------------
-
-    # MOVE: GO [direction]
-    if tokens[0] == "go":
-        if len(tokens) < 2:
-            return "Go where?"
-        dir_input = tokens[1]
-        direction = DIRECTION_ALIASES.get(dir_input)
-        if not direction or direction not in room.get("exits", {}):
+                        reply = random.choice(replies)
+
+                # 5) final fallback: greeting
+                if reply is None:
+                    reply = npc.get("greeting", f"{npc['name']} has nothing to say.")
+
+                result = CommandResult().say(reply)
+                return result.event("talked", npc=npc_key, topic=topic)
+
+            except Exception as e:
+                message_log.append(f"[ERROR] exception in talk-to: {e}")
+                for line in traceback.format_exc().splitlines():
+                    message_log.append(f"  {line}")
+                return "Something went wrong while talking."
+
+    # no match found
+    return f"You don't see anyone named '{target_name}' here."
+
+
+# -----------------------------------------------------------------------------
+# MOVE: GO [direction]
+@command("go", help=[
+    "GO [direction] — Move to another room (N/S/E/W/U/D).",
+    "First discovery grants XP; revisit uses look_description only if verbose."
+])
+def cmd_go(ctx, tokens):
+    if len(tokens) < 2:
+        return "Go where?"
+
+    game_state = ctx["game_state"]
+    player     = ctx["player"]
+    rooms      = ctx["rooms"]
+    room       = ctx["room"]
+
+    dir_input = tokens[1]
+    direction = DIRECTION_ALIASES.get(dir_input)
+    if not direction:
+        return ["You can't go that way."]
+
+    # Fast path: integer lookup in the world index
+    index = get_index(rooms)
+    src = index.id_of(ctx["room_id"])
+    dst = index.step(src, dir_code(direction)) if src is not None else NO_ROOM
+
+    if dst != NO_ROOM:
+        new_room = index.room_id(dst)
+    else:
+        # Blocked, dangling, or into a region that isn't loaded yet
+        if direction not in room.get("exits", {}):
             return ["You can't go that way."]
         new_room = room["exits"][direction]
 
@@ -165,312 +232,343 @@ def handle_command(
                 " no room lies that way."
             ]
 
-        # door locked?
-        for trig in rooms[new_room].get("triggers", []):
-            if trig.get("condition") == "requires_item":
-                req = trig["item"]
-                if req not in player["inventory"]:
-                    return [f"The way is locked. You need the {req}."]
-
-        # update visited & xp (tolerant to missing "visited" key)
-        first = not rooms[new_room].get("visited", False)
-        rooms[new_room]["visited"] = True
-        if first:
-            player["xp"] = player.get("xp", 0) + 1
-
-
-        # update location
-        game_state["current_room"] = new_room
-        player["location"] = new_room
-
-        msg = []
-        if direction in ("up", "down"):
-            msg.append(f"You move {direction.upper()}. - {rooms[new_room]['name']}")
-        else:
-            msg.append(f"You go {direction}. - {rooms[new_room]['name']}")
-        if first:
-            msg.append(f"You gain 1 XP for discovering {rooms[new_room]['name']}.")
-        if first or player.get("verbose_travel"):
-            msg.append(rooms[new_room]["look_description"])
-        return msg
-
-    # DIRECTION SHORTCUTS (n, s, e, w, u, d)
-    if tokens[0] in DIRECTION_ALIASES:
-        return handle_command(f"go {tokens[0]}", game_state, player,
-                              rooms, items, current_motd, message_log, npcs)
-
-    # LOOK / L
-    if tokens[0] in ("look", "l"):
-        out = []
-        # description
-        out.append(room.get("look_description", room["description"]))
-        # items
-        items_here = room.get("items", [])
-        out.append(
-            items_here and "Items here: " + ", ".join(items_here)
-            or "There are no items here."
-        )
-        # NPCs (Depricated)
-        present_npcs = npcs.get(game_state["current_room"], [])
-        if present_npcs:
-            npc_names = [npc["name"] for npc in present_npcs]
-            out.append("You see here: " + ", ".join(npc_names))
-
-        # Monsters
-        from game.spawn import get_room_instances
-        monster_instances = get_room_instances(game_state["current_room"])
-        if monster_instances:
-            monster_names = [m["name"] for m in monster_instances]
-            out.append("You see: " + ", ".join(monster_names))
-
-
-        # exits
-        exits = room.get("exits", {})
-        if exits:
-            exit_names = [DIRECTION_ALIASES[d] for d in exits]
-            out.append("Exits: " + ", ".join(exit_names))
-        return out
-
-    # INVENTORY
-    if tokens[0] in ("inventory", "i"):
-        inv = player.get("inventory", [])
-        if not inv:
-            return "Your inventory is empty."
-        lines = ["You are carrying:"]
-        for it in inv:
-            desc = items.get(it, {}).get("description", "")
-            lines.append(f"- {it}: {desc}")
+    # door locked?
+    for trig in rooms[new_room].get("triggers", []):
+        if trig.get("condition") == "requires_item":
+            req = trig["item"]
+            if req not in player["inventory"]:
+                return [f"The way is locked. You need the {req}."]
+
+    # update visited & xp (tolerant to missing "visited" key)
+    first = not rooms[new_room].get("visited", False)
+    rooms[new_room]["visited"] = True
+    if first:
+        player["xp"] = player.get("xp", 0) + 1
+        WORLD_JOURNAL.mark_room(new_room)
+
+
+    # update location
+    game_state["current_room"] = new_room
+    player["location"] = new_room
+
+    name = rooms[new_room]["name"]
+    msg = CommandResult()
+    if direction in ("up", "down"):
+        msg.say(f"You move {direction.upper()}. - {name}", (TAG_ROOM, name))
+    else:
+        msg.say(f"You go {direction}. - {name}", (TAG_ROOM, name))
+    if first:
+        msg.say(f"You gain 1 XP for discovering {name}.", (TAG_ROOM, name))
+    if first or player.get("verbose_travel"):
+        msg.say(rooms[new_room]["look_description"])
+    msg.event("moved", room=new_room, previous=ctx["room_id"], direction=direction, discovered=first)
+    return msg
+
+
+# DIRECTION SHORTCUTS (n, s, e, w, u, d)
+@command(*DIRECTION_ALIASES, hidden=True)
+def cmd_direction(ctx, tokens):
+    return cmd_go(ctx, ["go", tokens[0]])
+
+
+# -----------------------------------------------------------------------------
+# LOOK / L
+@command("look", "l", help=[
+    "LOOK — Show this room's description, items, and exits.",
+    "L is a shortcut."
+])
+def cmd_look(ctx, tokens):
+    room       = ctx["room"]
+    current    = ctx["game_state"]["current_room"]
+
+    out = CommandResult()
+    # description
+    out.say(room.get("look_description", room["description"]))
+    # items
+    items_here = room.get("items", [])
+    if items_here:
+        out.say("Items here: " + ", ".join(items_here), *((TAG_ITEM, it) for it in items_here))
+    else:
+        out.say("There are no items here.")
+    # NPCs (Depricated)
+    present_npcs = ctx["npcs"].get(current, [])
+    if present_npcs:
+        npc_names = [npc["name"] for npc in present_npcs]
+        out.say("You see here: " + ", ".join(npc_names), *((TAG_NPC, n) for n in npc_names))
+
+    # Monsters
+    from game.spawn import get_room_instances
+    monster_instances = get_room_instances(current)
+    if monster_instances:
+        monster_names = [m["name"] for m in monster_instances]
+        out.say("You see: " + ", ".join(monster_names), *((TAG_MONSTER, n) for n in monster_names))
+
+
+    # exits
+    exits = room.get("exits", {})
+    if exits:
+        exit_names = [DIRECTION_ALIASES[d] for d in exits]
+        out.say("Exits: " + ", ".join(exit_names), *((TAG_EXIT, e) for e in exit_names))
+    return out
+
+
+# -----------------------------------------------------------------------------
+# INVENTORY
+@command("inventory", "i")
+def cmd_inventory(ctx, tokens):
+    inv = ctx["player"].get("inventory", [])
+    if not inv:
+        return "Your inventory is empty."
+    lines = ["You are carrying:"]
+    for it in inv:
+        desc = ctx["items"].get(it, {}).get("description", "")
+        lines.append(f"- {it}: {desc}")
+    return lines
+
+
+# TAKE / GET
+@command("take", "get")
+def cmd_take(ctx, tokens):
+    room = ctx["room"]
+    want = " ".join(tokens[1:])
+    for it in list(room.get("items", [])):
+        if it.lower() == want:
+            ctx["player"]["inventory"].append(it)
+            room["items"].remove(it)
+            WORLD_JOURNAL.mark_room(ctx["room_id"])
+            result = CommandResult().say(f"You take the {it}.", (TAG_ITEM, it))
+            return result.event("took", item=it, room=ctx["room_id"])
+    return "That item isn't here."
+
+
+# USE
+@command("use")
+def cmd_use(ctx, tokens):
+    game_state = ctx["game_state"]
+    want = " ".join(tokens[1:])
+    for inv in ctx["player"].get("inventory", []):
+        if inv.lower() == want:
+            data = ctx["items"].get(inv, {})
+            use_data = data.get("use")
+            if use_data:
+                item_room = normalize_room_id(use_data.get("location"))
+                current_room = normalize_room_id(game_state["current_room"])
+
+                if item_room == current_room:
+                    effect  = use_data.get("effect")
+                    message = use_data.get("message", f"You use the {inv}.")
+                    if effect == "win":
+                        return message
+                    if effect == "unlock":
+                        ctx["rooms"][game_state["current_room"]].setdefault("flags", {})["door_unlocked"] = True
+                        WORLD_JOURNAL.mark_room(game_state["current_room"])
+                        return message
+                return f"You can't use the {inv} here."
+            return f"You use the {inv}, but nothing happens."
+    return "You don't have that item."
+
+
+# -----------------------------------------------------------------------------
+# ABOUT
+@command("about")
+def cmd_about(ctx, tokens):
+    return [f"LocalMUD {VERSION}", DEV_NOTE]
+
+
+# DIR
+@command("dir", hidden=True)
+def cmd_dir(ctx, tokens):
+    return [f"Bro, this isn't DOS. Sorry."]
+
+
+# TITLE
+@command("title")
+def cmd_title(ctx, tokens):
+    return CommandResult(signal=CONFIRM_TITLE)
+
+
+# DROP [ITEM]
+@command("drop")
+def cmd_drop(ctx, tokens):
+    if len(tokens) < 2:
+        return None
+
+    player    = ctx["player"]
+    item_name = " ".join(tokens[1:])
+    room      = ctx["rooms"][player["location"]]
+
+    if item_name not in player["inventory"]:
+        return f"You don't have '{item_name}' to drop."
+
+    player["inventory"].remove(item_name)
+    room.setdefault("items", []).append(item_name)
+    WORLD_JOURNAL.mark_room(player["location"])
+
+    result = CommandResult().say(f"You dropped '{item_name}'. It now lies here.", (TAG_ITEM, item_name))
+    return result.event("dropped", item=item_name, room=player["location"])
+
+
+# CHARACTER SHEET
+@command("character", "c")
+def cmd_character(ctx, tokens):
+    player = ctx["player"]
+    out = []
+    out.append(f"Name: {player.get('name', 'Unknown')}")
+    out.append(f"Background: {player.get('background', 'None')}")
+    xp = player.get("xp", 0)
+    out.append(f"XP: {xp}")
+
+    gold = player.get("gold", 0)
+    out.append(f"Gold: {gold}")  # 💰 Add this line
+
+    out.append("Stats:")
+    stats     = player.get("stats", {})
+    modifiers = player.get("modifiers", {})
+    for stat in CORE_STATS:
+        val = stats.get(stat, 0)
+        mod = modifiers.get(stat, 0)
+        out.append(f"  {stat}: {val} ({mod:+d})")
+
+    curse_count = player.get("curse_count", 0)
+    if curse_count:
+        out.append(f"Curses: {curse_count}")
+
+    return out
+
+
+# HELP
+@command("help")
+def cmd_help(ctx, tokens):
+    if len(tokens) == 1:
+        lines = ["Available commands:"] + [f"- {c}" for c in COMMANDS]
+        lines.append("Type HELP [COMMAND] for details.")
+        return lines
+    cmd = tokens[1]
+    return get_help(cmd) or [f"No detailed help for '{cmd}'."]
+
+
+# -----------------------------------------------------------------------------
+# DEBUG COMMANDS
+def _debug_blackjack(ctx, tokens):
+    import minigames.blackjack as blackjack
+    player = ctx["player"]
+    return run_curses_game(lambda stdscr: blackjack.play(player, stdscr))
+
+def _debug_slots(ctx, tokens):
+    import minigames.slots as slots
+    player = ctx["player"]
+    return run_curses_game(lambda stdscr: slots.play_slots(stdscr, player))
+
+def _debug_dicehighlow(ctx, tokens):
+    import minigames.dicehighlow as dicehighlow
+    player = ctx["player"]
+    return run_curses_game(lambda stdscr: dicehighlow.play(player, stdscr))
+
+def _debug_grimoiregambit(ctx, tokens):
+    import minigames.grimoire_gambit as grimoire_gambit
+    return run_curses_game(lambda stdscr: grimoire_gambit.start_game(stdscr))
+
+def _debug_heal(ctx, tokens):
+    player = ctx["player"]
+    player["hp"] = player.get("max_hp", 6)
+    return f"Player healed to full HP ({player['hp']}/{player['max_hp']})."
+
+def _debug_givegold(ctx, tokens):
+    player = ctx["player"]
+    if len(tokens) < 3 or not tokens[2].isdigit():
+        return "Usage: DEBUG GIVEGOLD <amount>"
+    amount = int(tokens[2])
+    player["gold"] = player.get("gold", 0) + amount
+    return f"Gave {amount} gold. Player now has {player['gold']} gold."
+
+def _debug_teleport(ctx, tokens):
+    # Usage: DEBUG TELEPORT <room_id>
+    if len(tokens) < 3:
+        return "Usage: DEBUG TELEPORT <room_id>"
+
+    # Join the rest of the tokens to allow room ids with punctuation or underscores
+    target_room = " ".join(tokens[2:])
+    _rooms = ctx["rooms"]
+
+    if target_room not in _rooms:
+        # Offer a short helpful hint listing similarly named rooms
+        similar = [r for r in _rooms.keys() if target_room.lower() in r.lower()]
+        hint = f" Did you mean: {', '.join(similar)}?" if similar else ""
+        return f"Teleport failed: unknown room id '{target_room}'.{hint}"
+
+    ctx["game_state"]["current_room"] = target_room
+    ctx["player"]["location"] = target_room
+
+    # Optionally call spawn logic if provided (keeps dev workflow fast)
+    # If you have a spawn helper like spawn_by_room in utils/monster_manager, call it.
+    try:
+        try:
+            from utils.monster_manager import spawn_by_room as spawn_fn  # type: ignore
+        except Exception:
+            spawn_fn = None
+        if callable(spawn_fn):
+            spawn_fn(_rooms, target_room)
+    except Exception:
+        # Don't let spawn errors break debug teleport; swallow and continue
+        pass
+
+    # Return confirmation
+    return f"Teleported to {target_room} ({_rooms[target_room].get('name','Unnamed room')})."
+
+def _debug_prunelogs(ctx, tokens):
+    result = prune_error_logs()
+    return f"[DEBUG] {result}"
+
+DEBUG_ACTIONS = {
+    "blackjack":      _debug_blackjack,
+    "slots":          _debug_slots,
+    "dicehighlow":    _debug_dicehighlow,
+    "grimoiregambit": _debug_grimoiregambit,
+    "heal":           _debug_heal,
+    "givegold":       _debug_givegold,
+    "teleport":       _debug_teleport,
+    "prunelogs":      _debug_prunelogs,
+}
+
+@command("debug", hidden=True)
+def cmd_debug(ctx, tokens):
+    if not ctx["player"].get("debug_mode", False):
+        return "Debug mode is not enabled."
+
+    if len(tokens) < 2:
+        lines = [
+            "Specify a debug action. Example: DEBUG BLACKJACK",
+            "Available commands:",
+        ]
+        lines.extend(f" - {action.upper()}" for action in DEBUG_ACTIONS)
         return lines
 
-    # TAKE / GET
-    if tokens[0] in ("take", "get"):
-        want = " ".join(tokens[1:])
-        for it in list(room.get("items", [])):
-            if it.lower() == want:
-                player["inventory"].append(it)
-                room["items"].remove(it)
-                return f"You take the {it}."
-        return "That item isn't here."
-
-    # USE
-    if tokens[0] == "use":
-        want = " ".join(tokens[1:])
-        for inv in player.get("inventory", []):
-            if inv.lower() == want:
-                data = items.get(inv, {})
-                use_data = data.get("use")
-                if use_data:
-                    item_room = normalize_room_id(use_data.get("location"))
-                    current_room = normalize_room_id(game_state["current_room"])
-
-                    if item_room == current_room:
-                        effect  = use_data.get("effect")
-                        message = use_data.get("message", f"You use the {inv}.")
-                        if effect == "win":
-                            return message
-                        if effect == "unlock":
-                            rooms[game_state["current_room"]].setdefault("flags", {})["door_unlocked"] = True
-                            return message
-                    return f"You can't use the {inv} here."
-                return f"You use the {inv}, but nothing happens."
-        return "You don't have that item."
-
-    # ABOUT
-    if tokens[0] == "about":
-        return [f"LocalMUD {VERSION}", DEV_NOTE]
-
-    # DIR
-    if tokens[0] == "dir":
-        return [f"Bro, this isn't DOS. Sorry."]
-
-    # TITLE
-    if tokens[0] == "title":
-        return "confirm_title"
-
-    # DROP [ITEM]
-    if tokens[0] == "drop" and len(tokens) > 1:
-        item_name = " ".join(tokens[1:])
-        room = rooms[player["location"]]
-
-        if item_name not in player["inventory"]:
-            return f"You don't have '{item_name}' to drop."
-
-        player["inventory"].remove(item_name)
-        room.setdefault("items", []).append(item_name)
-
-        return f"You dropped '{item_name}'. It now lies here."
-
-
-    # CHARACTER SHEET
-    if tokens[0] in ("character", "c"):
-        out = []
-        out.append(f"Name: {player.get('name', 'Unknown')}")
-        out.append(f"Background: {player.get('background', 'None')}")
-        xp = player.get("xp", 0)
-        out.append(f"XP: {xp}")
-        
-        gold = player.get("gold", 0)
-        out.append(f"Gold: {gold}")  # 💰 Add this line
-
-        out.append("Stats:")
-        stats     = player.get("stats", {})
-        modifiers = player.get("modifiers", {})
-        for stat in CORE_STATS:
-            val = stats.get(stat, 0)
-            mod = modifiers.get(stat, 0)
-            out.append(f"  {stat}: {val} ({mod:+d})")
-        
-        curses = player.get("curse_count", 0)
-        if curses:
-            out.append(f"Curses: {curses}")
-        
-        return out
-
-    # HELP
-    if tokens[0] == "help":
-        if len(tokens) == 1:
-            lines = ["Available commands:"] + [f"- {c}" for c in COMMANDS]
-            lines.append("Type HELP [COMMAND] for details.")
-            return lines
-        cmd = tokens[1]
-        if cmd == "go":
-            return [
-                "GO [direction] — Move to another room (N/S/E/W/U/D).",
-                "First discovery grants XP; revisit uses look_description only if verbose."
-            ]
-        if cmd == "look":
-            return [
-                "LOOK — Show this room's description, items, and exits.",
-                "L is a shortcut."
-            ]
-        return [f"No detailed help for '{cmd}'."]
-
-    # DEBUG COMMANDS
-    if tokens[0].lower() == "debug":
-        if not player.get("debug_mode", False):
-            return "Debug mode is not enabled."
-
-        if len(tokens) < 2:
-            lines = [
-                "Specify a debug action. Example: DEBUG BLACKJACK",
-                "Available commands:",
-                " - BLACKJACK",
-                " - DICEHIGHLOW",
-                " - SLOTS",
-                " - GRIMOIREGAMBIT",
-                " - GIVEGOLD",
-                " - HEAL",
-                " - PRUNELOGS",
-            ]
-            return lines
-
-        action = tokens[1].lower()
-
-        if action == "blackjack":
-            import minigames.blackjack as blackjack
-            return run_curses_game(lambda stdscr: blackjack.play(player, stdscr))
-
-        elif action == "slots":
-            import minigames.slots as slots
-            return run_curses_game(lambda stdscr: slots.play_slots(stdscr, player))
-
-        elif action == "dicehighlow":
-            import minigames.dicehighlow as dicehighlow
-            return run_curses_game(lambda stdscr: dicehighlow.play(player, stdscr))
-            
-        elif action == "grimoiregambit":
-            import minigames.grimoire_gambit as grimoire_gambit
-            return run_curses_game(lambda stdscr: grimoire_gambit.start_game(stdscr))
-
-
-
-            
-        elif action == "heal":
-            player["hp"] = player.get("max_hp", 6)
-            return f"Player healed to full HP ({player['hp']}/{player['max_hp']})."
-            
-        elif action == "givegold":
-            if len(tokens) < 3 or not tokens[2].isdigit():
-                return "Usage: DEBUG GIVEGOLD <amount>"
-            amount = int(tokens[2])
-            player["gold"] = player.get("gold", 0) + amount
-            return f"Gave {amount} gold. Player now has {player['gold']} gold."
-
-        elif action == "teleport":
-            # Usage: DEBUG TELEPORT <room_id>
-            if len(tokens) < 3:
-                return "Usage: DEBUG TELEPORT <room_id>"
-
-            # Join the rest of the tokens to allow room ids with punctuation or underscores
-            target_room = " ".join(tokens[2:])
-
-            # Validate rooms mapping is available
-            if "rooms" not in locals() and "rooms" not in globals():
-                return "Teleport failed: room data (rooms) is not available in this context."
-
-            # Prefer local then global
-            _rooms = locals().get("rooms") or globals().get("rooms")
-
-            if target_room not in _rooms:
-                # Offer a short helpful hint listing similarly named rooms
-                similar = [r for r in _rooms.keys() if target_room.lower() in r.lower()]
-                hint = f" Did you mean: {', '.join(similar)}?" if similar else ""
-                return f"Teleport failed: unknown room id '{target_room}'.{hint}"
-
-            # Apply the teleport: prefer game_state current room if available, else player location
-            if "game_state" in locals() or "game_state" in globals():
-                gs = locals().get("game_state") or globals().get("game_state")
-                gs["current_room"] = target_room
-            else:
-                player["location"] = target_room
-
-            # Optionally call spawn logic if provided (keeps dev workflow fast)
-            # If you have a spawn helper like spawn_by_room in utils/monster_manager, call it.
-            try:
-                spawn_fn = None
-                if "spawn_by_room" in globals():
-                    spawn_fn = globals()["spawn_by_room"]
-                elif "spawn_by_room" in locals():
-                    spawn_fn = locals()["spawn_by_room"]
-                else:
-                    # try common import without failing if module missing
-                    try:
-                        from utils.monster_manager import spawn_by_room as spawn_fn  # type: ignore
-                    except Exception:
-                        spawn_fn = None
-                if callable(spawn_fn):
-                    spawn_fn(_rooms, target_room)
-            except Exception:
-                # Don't let spawn errors break debug teleport; swallow and continue
-                pass
-
-            # Return confirmation
-            return f"Teleported to {target_room} ({_rooms[target_room].get('name','Unnamed room')})."
-
-
-        elif action == "prunelogs":
-            result = prune_error_logs()
-            return f"[DEBUG] {result}"
-
+    action = tokens[1].lower()
+    handler = DEBUG_ACTIONS.get(action)
+    if handler is None:
         return f"Unknown debug action: {action}"
-
-    # CLEAR
-    if tokens[0] == "clear":
-        message_log.clear()
-        return "Screen cleared."
-        
-    # CLS
-    if tokens[0] == "cls":
-        message_log.clear()
-        return "Fine, I’ll clear the screen. But just so you know, I’m judging you."
-
-    # MOTD
-    if tokens[0] == "motd":
-        return f"MOTD: {current_motd}"
-
-    # QUIT / EXIT
-    if tokens[0] in ("quit", "exit"):
-        return "quit"
-
-    # FALL-THROUGH
-    return "Unknown command."
+    return handler(ctx, tokens)
+
+
+# -----------------------------------------------------------------------------
+# CLEAR
+@command("clear")
+def cmd_clear(ctx, tokens):
+    ctx["message_log"].clear()
+    return "Screen cleared."
+
+# CLS
+@command("cls", hidden=True)
+def cmd_cls(ctx, tokens):
+    ctx["message_log"].clear()
+    return "Fine, I’ll clear the screen. But just so you know, I’m judging you."
+
+# MOTD
+@command("motd")
+def cmd_motd(ctx, tokens):
+    return f"MOTD: {ctx['motd']}"
+
+# QUIT / EXIT
+@command("quit", "exit")
+def cmd_quit(ctx, tokens):
+    return CommandResult(signal=QUIT)
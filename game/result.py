@@ -0,0 +1,106 @@
+# game/result.py
+"""
+LocalMUD — Command Results
+
+handle_command() returns a CommandResult instead of "a string, a list of
+strings, or a magic token". It carries:
+
+    lines   : the text to show, in order
+    tags    : (line number, tag, text) marking what a piece of a line is
+              (TAG_ROOM, TAG_ITEM, TAG_NPC, TAG_MONSTER, TAG_EXIT, TAG_DAMAGE)
+    events  : dicts describing state changes ({"event": "moved", ...})
+    signal  : None, QUIT or CONFIRM_TITLE
+
+Front-ends render from this without re-parsing text: curses and plain text
+only need lines and signal; a colour terminal can look up tags; the server
+can fan events out to other sessions.
+
+Typical usage in a handler:
+
+    result = CommandResult()
+    result.say(f"You take the {item}.", (TAG_ITEM, item))
+    result.event("took", item=item, room=room_id)
+    return result
+
+Handlers may still return a plain string or list; dispatch wraps them with
+CommandResult.of(), so old handlers keep working.
+
+Author: Alex
+
+Dev Notes:
+- A tag's text is a substring of its line, so a front-end can find and
+  style it without knowing the sentence it sits in.
+- Events are plain dicts so they pickle and JSON-encode as they are.
+"""
+
+
+# Control signals
+QUIT = "quit"
+CONFIRM_TITLE = "confirm_title"
+SIGNALS = (QUIT, CONFIRM_TITLE)
+
+# Semantic tags
+TAG_ROOM    = "room"
+TAG_ITEM    = "item"
+TAG_NPC     = "npc"
+TAG_MONSTER = "monster"
+TAG_EXIT    = "exit"
+TAG_DAMAGE  = "damage"
+
+
+class CommandResult:
+    """Lines, semantic tags, state-change events and a control signal."""
+
+    __slots__ = ("lines", "tags", "events", "signal")
+
+    def __init__(self, lines=None, signal=None):
+        self.lines  = list(lines) if lines else []
+        self.tags   = []
+        self.events = []
+        self.signal = signal
+
+    @classmethod
+    def of(cls, value):
+        """Wrap a legacy handler return (str, list, None or signal string)."""
+        if isinstance(value, cls):
+            return value
+        if value in SIGNALS:
+            return cls(signal=value)
+        if isinstance(value, str):
+            return cls([value])
+        if isinstance(value, (list, tuple)):
+            return cls(value)
+        return cls()
+
+    def say(self, line, *tags):
+        """Add a line. Each tag is a (tag, text) pair, text found in line."""
+        number = len(self.lines)
+        self.lines.append(line)
+        for tag, text in tags:
+            self.tags.append((number, tag, text))
+        return self
+
+    def extend(self, other):
+        """Append another result's lines, tags and events (and its signal)."""
+        offset = len(self.lines)
+        self.lines.extend(other.lines)
+        self.tags.extend((number + offset, tag, text) for number, tag, text in other.tags)
+        self.events.extend(other.events)
+        self.signal = self.signal or other.signal
+        return self
+
+    def event(self, kind, **data):
+        data["event"] = kind
+        self.events.append(data)
+        return self
+
+    def tagged(self, tag):
+        """(line number, text) for every tag of this kind."""
+        return [(number, text) for number, t, text in self.tags if t == tag]
+
+    def __bool__(self):
+        return bool(self.lines or self.events or self.signal)
+
+    def __repr__(self):
+        extra = f", signal={self.signal!r}" if self.signal else ""
+        return f"CommandResult({self.lines!r}{extra})"
@@ -1,23 +1,417 @@
 # save.py
+"""
+LocalMUD — Save Store
 
-import os
+Players, settings and saved world state live in one SQLite database,
+save/localmud.db, instead of one JSON file per thing.
+
+- WAL mode: the game (or the server's tick loop) can write while another
+  thread (e.g. the world journal compactor) reads.
+- Every statement is a fixed, parameterized SQL string, so sqlite3's
+  statement cache prepares each one once per connection.
+- Bulk writes (save_players, apply_world_delta) run as one transaction with
+  executemany, so an autosave of many players is one fsync, not one per row.
+- Players are indexed by name (case-insensitive), monster instances by room.
+
+The old save/player.json and save/settings.json are imported the first time
+the database is created; the files are left in place.
+
+Saving never blocks the game: save_player() and save_settings() hand a
+serialized snapshot to SAVE_WRITER, which writes on its own thread and only
+writes the latest snapshot when saves arrive faster than the disk. SQLite
+commits are atomic, so a crash mid-save leaves the previous save intact.
+
+Typical usage:
+    save_player(player)
+    player = load_player("Alex")      # or load_player() for the most recent
+
+Author: Alex
+
+Dev Notes:
+- One connection per thread (sqlite3 connections can't be shared across
+  threads by default). The store connects lazily, so importing this module
+  never touches the disk.
+- Players are stored in the binary format from game/save_format.py. Rows
+  written as JSON by older builds still load. Room and instance states are
+  JSON text.
+"""
+
+import atexit
 import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 
-def save_player(player):
-    save_dir = "save"
-    os.makedirs(save_dir, exist_ok=True)  # ✅ Create 'save/' if it doesn't exist
+from game.save_format import encode_player, decode_player, compress_blob
 
-    save_path = os.path.join(save_dir, "player.json")
-    with open(save_path, "w", encoding="utf-8") as f:
-        json.dump(player, f, indent=2)
 
+SAVE_DIR = "save"
+DB_PATH = os.path.join(SAVE_DIR, "localmud.db")
+LEGACY_PLAYER_PATH = os.path.join(SAVE_DIR, "player.json")
+LEGACY_SETTINGS_PATH = os.path.join(SAVE_DIR, "settings.json")
 
-def load_player():
-    try:
-        with open("save/player.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return None
+SCHEMA_VERSION = 1
+FLUSH_TIMEOUT = 5.0         # longest a load waits for queued saves
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    id         INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL COLLATE NOCASE,
+    data       BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS players_name ON players (name);
+CREATE INDEX IF NOT EXISTS players_updated ON players (updated_at);
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    room_id TEXT PRIMARY KEY,
+    data    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS instances (
+    id      TEXT PRIMARY KEY,
+    room_id TEXT NOT NULL,
+    data    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS instances_room ON instances (room_id);
+"""
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(data):
+    return json.dumps(data, default=_json_default, separators=(",", ":"))
+
+
+class SaveStore:
+    """SQLite-backed store for players, settings and world state."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._ready = False
+
+    # -----------------------
+    # Connections
+    # -----------------------
+    def connect(self):
+        """Return this thread's connection, creating the database if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        self._local.conn = conn
+
+        with self._init_lock:
+            if not self._ready:
+                self._create_schema(conn)
+                self._ready = True
+        return conn
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT, rolled back on error."""
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _create_schema(self, conn):
+        conn.executescript(SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None:
+            with self.transaction():
+                conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+                             (str(SCHEMA_VERSION),))
+                self._migrate_json(conn)
+
+    def _migrate_json(self, conn):
+        """Import the pre-SQLite save/player.json and save/settings.json."""
+        try:
+            with open(LEGACY_PLAYER_PATH, "r", encoding="utf-8") as f:
+                player = json.load(f)
+            if isinstance(player, dict):
+                conn.execute(
+                    "INSERT OR REPLACE INTO players (name, data, updated_at) VALUES (?, ?, ?)",
+                    (player.get("name", ""), encode_player(player), time.time())
+                )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.error(f"[ERROR] Could not migrate {LEGACY_PLAYER_PATH}: {e}")
+
+        try:
+            with open(LEGACY_SETTINGS_PATH, "r", encoding="utf-8") as f:
+                settings = json.load(f)
+            if isinstance(settings, dict):
+                conn.executemany(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                    [(key, json.dumps(value)) for key, value in settings.items()]
+                )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.error(f"[ERROR] Could not migrate {LEGACY_SETTINGS_PATH}: {e}")
+
+    # -----------------------
+    # Meta
+    # -----------------------
+    def get_meta(self, key, default=None):
+        row = self.connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value, conn=None):
+        (conn or self.connect()).execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    # -----------------------
+    # Players
+    # -----------------------
+    def save_player(self, player):
+        self.save_players([player])
+
+    def save_players(self, players):
+        """Upsert many players in one transaction."""
+        self.write_player_rows([(p.get("name", ""), encode_player(p)) for p in players])
 
+    def write_player_rows(self, rows):
+        """Upsert already-encoded (name, data) rows in one transaction."""
+        now = time.time()
+        rows = [(name, compress_blob(data), now) for name, data in rows]
+        if not rows:
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO players (name, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                rows
+            )
 
+    def load_player(self, name=None):
+        """Load a player by name (case-insensitive), or the most recently
+        saved player when name is None. Returns None if there isn't one."""
+        conn = self.connect()
+        if name is None:
+            row = conn.execute("SELECT data FROM players ORDER BY updated_at DESC LIMIT 1").fetchone()
+        else:
+            row = conn.execute("SELECT data FROM players WHERE name = ?", (name,)).fetchone()
+        return decode_player(row[0]) if row else None
 
+    def list_players(self):
+        return [row[0] for row in self.connect().execute("SELECT name FROM players ORDER BY name")]
+
+    def delete_player(self, name):
+        self.connect().execute("DELETE FROM players WHERE name = ?", (name,))
+
+    # -----------------------
+    # Settings
+    # -----------------------
+    def save_settings(self, settings):
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in settings.items()]
+            )
+
+    def load_settings(self):
+        rows = self.connect().execute("SELECT key, value FROM settings")
+        return {key: json.loads(value) for key, value in rows}
+
+    # -----------------------
+    # World state
+    # -----------------------
+    def apply_world_delta(self, rooms, instances, seq=None):
+        """
+        Write room states and instance states in one transaction.
+        rooms: room_id -> state dict. instances: id -> state dict, or None
+        to delete it.
+        """
+        live = [(i, data["room"], _dumps(data)) for i, data in instances.items() if data]
+        dead = [(i,) for i, data in instances.items() if not data]
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO rooms (room_id, data) VALUES (?, ?)",
+                [(room_id, _dumps(state)) for room_id, state in rooms.items()]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO instances (id, room_id, data) VALUES (?, ?, ?)", live
+            )
+            conn.executemany("DELETE FROM instances WHERE id = ?", dead)
+            if seq is not None:
+                self.set_meta("world_seq", seq, conn)
+            if instances:
+                self.set_meta("world_instances", 1, conn)
+
+    def load_world(self):
+        """Return {"seq", "rooms", "instances", "instances_saved"}.
+        instances_saved is False when no instance set was ever written, so the
+        caller keeps its fresh spawns."""
+        conn = self.connect()
+        rooms = {room_id: json.loads(data) for room_id, data in conn.execute("SELECT room_id, data FROM rooms")}
+        instances = {i: json.loads(data) for i, data in conn.execute("SELECT id, data FROM instances")}
+        return {
+            "seq": int(self.get_meta("world_seq", 0)),
+            "rooms": rooms,
+            "instances": instances,
+            "instances_saved": bool(self.get_meta("world_instances")),
+        }
+
+    def room_instances(self, room_id):
+        """Saved instance states in one room (uses the room_id index)."""
+        rows = self.connect().execute("SELECT data FROM instances WHERE room_id = ?", (room_id,))
+        return [json.loads(data) for (data,) in rows]
+
+    def clear_world(self):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM rooms")
+            conn.execute("DELETE FROM instances")
+            conn.execute("DELETE FROM meta WHERE key IN ('world_seq', 'world_instances')")
+
+
+class SaveWriter:
+    """
+    Background writer in front of the store. save_player() only serializes
+    the snapshot (so later changes to the dict can't leak into it) and
+    queues it; a daemon thread compresses and writes the queue in one
+    transaction.
+
+    Saves coalesce: if the same player is saved again before the thread gets
+    to it, only the newest snapshot is written.
+    """
+
+    RETRY_SECONDS = 1.0
+
+    def __init__(self, store):
+        self.store = store
+        self.submitted = 0
+        self.coalesced = 0
+        self.batches = 0
+        self._pending = {}      # ("player", name) | ("settings", None) -> payload
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _submit(self, key, payload):
+        with self._cond:
+            self.submitted += 1
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = payload
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def save_player(self, player):
+        name = player.get("name", "")
+        # Compression happens on the writer thread (write_player_rows)
+        self._submit(("player", name.lower()), (name, encode_player(player, compress=False)))
+
+    def save_players(self, players):
+        for player in players:
+            self.save_player(player)
+
+    def save_settings(self, settings):
+        self._submit(("settings", None), dict(settings))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is on disk. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def _write(self, batch):
+        rows = [payload for (kind, _), payload in batch.items() if kind == "player"]
+        if rows:
+            self.store.write_player_rows(rows)
+        settings = batch.get(("settings", None))
+        if settings is not None:
+            self.store.save_settings(settings)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                batch, self._pending = self._pending, {}
+                self._busy = True
+            failed = False
+            try:
+                self._write(batch)
+                self.batches += 1
+            except sqlite3.Error as e:
+                logging.error(f"[ERROR] Background save failed, retrying: {e}")
+                failed = True
+            except Exception as e:
+                # Not the database: retrying the same batch would fail the same way
+                logging.error(f"[ERROR] Background save failed, batch dropped: {e!r}")
+            finally:
+                with self._cond:
+                    if failed:
+                        # Anything newer queued meanwhile wins over the retry
+                        for key, payload in batch.items():
+                            self._pending.setdefault(key, payload)
+                    self._busy = False
+                    self._cond.notify_all()
+            if failed:
+                time.sleep(self.RETRY_SECONDS)
+
+
+# Runtime registry: the game's save store and its background writer
+STORE = SaveStore()
+SAVE_WRITER = SaveWriter(STORE)
+
+# Don't lose queued saves when the game exits normally
+atexit.register(SAVE_WRITER.flush, FLUSH_TIMEOUT)
+
+
+def save_player(player):
+    """Queue a save of player; returns immediately (see SaveWriter)."""
+    SAVE_WRITER.save_player(player)
+
+
+def flush_saves(loading):
+    """
+    Wait (at most FLUSH_TIMEOUT) for queued saves before reading `loading`
+    back. If the writer is stuck, log it and let the caller read what is on
+    disk rather than hang.
+    """
+    if not SAVE_WRITER.flush(FLUSH_TIMEOUT):
+        logging.error(f"[ERROR] Saves still pending after {FLUSH_TIMEOUT}s; loading {loading} from disk as is.")
+
+
+def load_player(name=None):
+    try:
+        flush_saves("player")
+        return STORE.load_player(name)
+    except sqlite3.Error as e:
+        logging.error(f"[ERROR] Could not load player: {e}")
+        return None
@@ -0,0 +1,285 @@
+# game/save_format.py
+"""
+LocalMUD — Binary Save Format
+
+A compact, versioned encoding for player saves (the "data" column of the
+players table in game/save.py). Replaces pretty-printed JSON, which is large
+for long-played characters and can't hold the "visited" set at all.
+
+Layout (integers little-endian):
+    MAGIC            6 bytes   b"LMSAVE"
+    FORMAT_VERSION   u16
+    flags            u16       bit 0: body is zlib-compressed
+    body:
+        string table    u32 count, u32 byte length, utf-8 text with the
+                        strings separated by NUL
+        field count     u16
+        fields          u8 field id, u8 type, u32 length, payload
+
+- Every string (room ids, item ids, name, location...) is stored once in the
+  string table; fields refer to it by index. The largest set (visited) comes
+  first, followed by every other string, sorted.
+- Sets (visited) are sorted indexes, stored as u32 (start, length) runs;
+  the big set is one run. Lists (inventory) are u32 index arrays in their
+  original order.
+- Keys outside PLAYER_SCHEMA go into one JSON field, so new player keys
+  never need a format bump to be saved.
+
+Typical usage:
+    blob   = encode_player(player)
+    player = decode_player(blob)          # also accepts old JSON saves
+
+    raw    = encode_player(player, compress=False)   # fast, on the game thread
+    blob   = compress_blob(raw)                       # later, off it
+
+Author: Alex
+
+Dev Notes:
+- Field ids are permanent. Add new fields with new ids; readers skip ids
+  they don't know, so older builds can still read newer saves of the same
+  FORMAT_VERSION. Bump FORMAT_VERSION only when the layout itself changes.
+- Repeated region prefixes in room ids compress very well, hence zlib on by
+  default (level 1: cheap).
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+
+MAGIC = b"LMSAVE"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 1
+
+HEADER = struct.Struct("<6sHH")
+FIELD  = struct.Struct("<BBI")
+U16    = struct.Struct("<H")
+U32    = struct.Struct("<I")
+I64    = struct.Struct("<q")
+
+# Field types
+T_STR, T_INT, T_BOOL, T_STR_LIST, T_STR_SET, T_JSON = range(6)
+
+# field id -> (key, type). Ids are permanent; never reuse one.
+PLAYER_SCHEMA = {
+    1:  ("name", T_STR),
+    2:  ("background", T_STR),
+    3:  ("location", T_STR),
+    4:  ("inventory", T_STR_LIST),
+    5:  ("visited", T_STR_SET),
+    6:  ("hp", T_INT),
+    7:  ("max_hp", T_INT),
+    8:  ("ac", T_INT),
+    9:  ("level", T_INT),
+    10: ("xp", T_INT),
+    11: ("gold", T_INT),
+    12: ("curse_count", T_INT),
+    13: ("str", T_INT),
+    14: ("dex", T_INT),
+    15: ("con", T_INT),
+    16: ("int", T_INT),
+    17: ("wis", T_INT),
+    18: ("cha", T_INT),
+    19: ("verbose_travel", T_BOOL),
+    20: ("screen_reader_mode", T_BOOL),
+    21: ("debug_mode", T_BOOL),
+    255: (None, T_JSON),            # everything else
+}
+_FIELD_OF = {key: (field_id, kind) for field_id, (key, kind) in PLAYER_SCHEMA.items() if key}
+EXTRA_FIELD = 255
+
+_SWAP = sys.byteorder == "big"
+
+
+def _u32_array(values):
+    arr = array("I", values)
+    if _SWAP:
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _u32_unpack(payload):
+    arr = array("I")
+    arr.frombytes(payload)
+    if _SWAP:
+        arr.byteswap()
+    return arr
+
+
+def _runs(indexes):
+    """Sorted, unique indexes -> flat [start, length, start, length, ...]."""
+    runs = []
+    for i in indexes:
+        if runs and runs[-2] + runs[-1] == i:
+            runs[-1] += 1
+        else:
+            runs += (i, 1)
+    return runs
+
+
+def _fits(kind, value):
+    """Does value match the schema type? If not it goes into the JSON field."""
+    if kind == T_STR:
+        return isinstance(value, str)
+    if kind == T_INT:
+        return isinstance(value, int) and not isinstance(value, bool) and -2**63 <= value < 2**63
+    if kind == T_BOOL:
+        return isinstance(value, bool)
+    if kind == T_STR_LIST:
+        return isinstance(value, list) and all(isinstance(v, str) for v in value)
+    if kind == T_STR_SET:
+        return isinstance(value, (set, frozenset)) and all(isinstance(v, str) for v in value)
+    return False
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_player(player, compress=True):
+    """Encode a player dict as bytes."""
+    typed = []
+    extra = {}
+    strings = set()
+    big_set = frozenset()
+    for key, value in player.items():
+        spec = _FIELD_OF.get(key)
+        if spec and _fits(spec[1], value):
+            typed.append((spec, value))
+            kind = spec[1]
+            if kind == T_STR:
+                strings.add(value)
+            elif kind == T_STR_LIST:
+                strings.update(value)
+            elif kind == T_STR_SET:
+                if len(value) > len(big_set):
+                    strings.update(big_set)
+                    big_set = value
+                else:
+                    strings.update(value)
+        else:
+            extra[key] = value
+
+    # The largest set (visited) fills the front of the table, so its indexes
+    # are the single run 0..n-1: no per-room lookups and no sorting.
+    # Everything else follows; a string in both places is stored twice.
+    rest = sorted(strings)
+    front_len = len(big_set)
+    count = front_len + len(rest)
+    index_of = dict(zip(rest, range(front_len, count))).__getitem__
+
+    text = "\0".join(big_set)
+    if rest:
+        text = (text + "\0" if big_set else "") + "\0".join(rest)
+    if text.count("\0") != max(count - 1, 0):
+        raise ValueError("Save strings may not contain NUL characters.")
+    text = text.encode("utf-8")
+
+    fields = []
+    for (field_id, kind), value in typed:
+        if kind == T_STR:
+            payload = U32.pack(index_of(value))
+        elif kind == T_INT:
+            payload = I64.pack(value)
+        elif kind == T_BOOL:
+            payload = b"\x01" if value else b"\x00"
+        elif kind == T_STR_LIST:
+            payload = _u32_array(map(index_of, value))
+        elif value is big_set:
+            payload = _u32_array((0, front_len))
+        else:
+            payload = _u32_array(_runs(sorted(map(index_of, value))))
+        fields.append(FIELD.pack(field_id, kind, len(payload)) + payload)
+    if extra:
+        payload = json.dumps(extra, default=_json_default, separators=(",", ":")).encode("utf-8")
+        fields.append(FIELD.pack(EXTRA_FIELD, T_JSON, len(payload)) + payload)
+
+    body = b"".join([
+        U32.pack(count), U32.pack(len(text)), text,
+        U16.pack(len(fields)), *fields,
+    ])
+
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 1)
+        flags |= FLAG_ZLIB
+    return HEADER.pack(MAGIC, FORMAT_VERSION, flags) + body
+
+
+def compress_blob(blob):
+    """zlib-compress an encode_player(compress=False) blob. Lets a caller
+    encode on the game thread and leave compression to a background writer."""
+    magic, version, flags = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or flags & FLAG_ZLIB:
+        return blob
+    body = zlib.compress(memoryview(blob)[HEADER.size:], 1)
+    return HEADER.pack(MAGIC, version, flags | FLAG_ZLIB) + body
+
+
+def decode_player(data):
+    """Decode a player from encode_player() bytes or a legacy JSON save."""
+    if isinstance(data, str) or not data.startswith(MAGIC):
+        return _decode_json(data)
+
+    magic, version, flags = HEADER.unpack_from(data, 0)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Save format {version} is newer than this build ({FORMAT_VERSION}).")
+    body = memoryview(data)[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        body = memoryview(zlib.decompress(body))
+
+    count, text_len = U32.unpack_from(body, 0)[0], U32.unpack_from(body, 4)[0]
+    pos = 8
+    table = str(body[pos:pos + text_len], "utf-8").split("\0") if count else []
+    pos += text_len
+    if len(table) != count:
+        raise ValueError("Corrupt save: string table size mismatch.")
+    lookup = table.__getitem__
+
+    (field_count,) = U16.unpack_from(body, pos)
+    pos += U16.size
+    player = {}
+    for _ in range(field_count):
+        field_id, kind, length = FIELD.unpack_from(body, pos)
+        pos += FIELD.size
+        payload = body[pos:pos + length]
+        pos += length
+
+        key = PLAYER_SCHEMA.get(field_id, (None, None))[0]
+        if kind == T_JSON:
+            player.update(json.loads(str(payload, "utf-8")))
+        elif key is None:
+            continue                    # a field from a newer build
+        elif kind == T_STR:
+            player[key] = table[U32.unpack_from(payload, 0)[0]]
+        elif kind == T_INT:
+            player[key] = I64.unpack_from(payload, 0)[0]
+        elif kind == T_BOOL:
+            player[key] = payload[0] == 1
+        elif kind == T_STR_LIST:
+            player[key] = list(map(lookup, _u32_unpack(payload)))
+        elif kind == T_STR_SET:
+            runs = _u32_unpack(payload)
+            value = set()
+            for start, length in zip(runs[::2], runs[1::2]):
+                value.update(table[start:start + length])
+            player[key] = value
+    return player
+
+
+# Player keys that hold sets in memory but are lists in JSON
+SET_KEYS = ("visited",)
+
+
+def _decode_json(data):
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    player = json.loads(data)
+    for key in SET_KEYS:
+        if isinstance(player.get(key), list):
+            player[key] = set(player[key])
+    return player
@@ -0,0 +1,192 @@
+# scheduler.py
+"""
+LocalMUD — World Tick Scheduler
+
+Runs timed world events (NPC idle lines, monster respawns, status effects) on a
+fixed cadence, independent of player input. Events live in a min-heap keyed by
+the tick they are due, so each tick only touches events that are actually due;
+idle rooms and quiet NPCs cost nothing.
+
+Typical usage:
+- Front-ends create one Scheduler per world and call advance() regularly
+  (curses input timeout, the server's tick task, or before each command).
+- init_world_events() schedules NPC idle actions and respawns for a world.
+- add_timed_effect() puts an expiring status effect on a player.
+
+Author: Alex
+
+Dev Notes:
+- Ticks are whole numbers; TICK_SECONDS converts wall time into ticks.
+- Repeating events are rescheduled from the tick they fired on, so a long
+  pause (e.g. blocking input()) fires each event once instead of replaying
+  every missed tick.
+"""
+
+import heapq
+import itertools
+import random
+import time
+
+from game import spawn
+from utils.helpers import normalize_room_id
+
+
+TICK_SECONDS = 1.0
+
+# Chance per tick that an NPC performs an idle action (was rolled per command)
+NPC_IDLE_CHANCE = 0.25
+
+
+class Event:
+    """A scheduled callback. Keep the handle to cancel it later."""
+
+    __slots__ = ("due", "callback", "args", "every", "cancelled")
+
+    def __init__(self, due, callback, args, every):
+        self.due       = due
+        self.callback  = callback
+        self.args      = args
+        self.every     = every
+        self.cancelled = False
+
+
+class Scheduler:
+    """Min-heap of events keyed by due tick."""
+
+    def __init__(self, tick_seconds=TICK_SECONDS, clock=time.monotonic):
+        self.tick_seconds = tick_seconds
+        self.clock = clock
+        self.started = clock()
+        self.tick = 0
+        self._heap = []
+        self._seq = itertools.count()   # tie-breaker keeps same-tick events FIFO
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, delay, callback, *args, every=None):
+        """
+        Run callback(*args) `delay` ticks from now.
+        If `every` is given, repeat every `every` ticks after that. `every` may
+        be a callable returning the next delay, for randomized intervals.
+        """
+        event = Event(self.tick + max(1, int(delay)), callback, args, every)
+        heapq.heappush(self._heap, (event.due, next(self._seq), event))
+        return event
+
+    def cancel(self, event):
+        """Cancel an event. It is dropped lazily when it reaches the heap top."""
+        event.cancelled = True
+
+    def run_due(self, tick):
+        """Advance to `tick` and fire every event due at or before it."""
+        self.tick = max(self.tick, tick)
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= self.tick:
+            _, _, event = heapq.heappop(heap)
+            if event.cancelled:
+                continue
+            event.callback(*event.args)
+            fired += 1
+            if event.every is not None and not event.cancelled:
+                step = event.every() if callable(event.every) else event.every
+                event.due = self.tick + max(1, int(step))
+                heapq.heappush(heap, (event.due, next(self._seq), event))
+        return fired
+
+    def advance(self, now=None):
+        """Fire everything due up to the wall-clock time `now`."""
+        if now is None:
+            now = self.clock()
+        return self.run_due(int((now - self.started) / self.tick_seconds))
+
+
+# -----------------------
+# World events
+# -----------------------
+def _geometric_delay(chance):
+    """Ticks until the next success of a per-tick roll with the given chance."""
+    delay = 1
+    while random.random() >= chance:
+        delay += 1
+    return delay
+
+
+def _npc_idle(room_key, npc, emit):
+    emit(room_key, random.choice(npc["idle_actions"]))
+
+
+def schedule_npc_idle(scheduler, npcs, emit, chance=NPC_IDLE_CHANCE):
+    """
+    Schedule idle actions for every NPC that has them. Instead of rolling for
+    every NPC each tick, each NPC draws how long until its next action.
+    emit(room_key, line) delivers the line to whoever is in the room.
+    """
+    events = []
+    for room_key, present in npcs.items():
+        room_key = normalize_room_id(room_key)
+        for npc in present:
+            if not npc.get("idle_actions"):
+                continue
+            events.append(scheduler.schedule(
+                _geometric_delay(chance), _npc_idle, room_key, npc, emit,
+                every=lambda: _geometric_delay(chance)
+            ))
+    return events
+
+
+def schedule_respawns(scheduler, emit=None, engine=spawn.RESPAWNS):
+    """
+    Check the respawn engine's heap every tick. Spawn tables register
+    themselves when a region's monsters first spawn (spawn.init_region_spawns),
+    so lazily loaded regions need nothing extra here.
+    """
+    return scheduler.schedule(1, _respawn, engine, emit, every=1)
+
+
+def _respawn(engine, emit):
+    created = engine.run_due()
+    if emit:
+        for inst in created:
+            emit(inst["room"], f"A {inst['name']} emerges from the shadows.")
+
+
+def init_world_events(scheduler, rooms, npcs, emit):
+    """Schedule all recurring world events for a freshly loaded world."""
+    schedule_npc_idle(scheduler, npcs, emit)
+    schedule_respawns(scheduler, emit)
+
+
+# -----------------------
+# Status effects
+# -----------------------
+def add_timed_effect(scheduler, player, name, duration, *,
+                     notify=None, on_tick=None, expire_message=None):
+    """
+    Put a status effect on the player for `duration` ticks.
+    - on_tick(player) runs every tick while active and may return a line
+    - notify(line) delivers messages to the affected player
+    Returns the effect dict stored in player["status"].
+    """
+    effect = {"name": name, "expires": scheduler.tick + duration}
+    player.setdefault("status", []).append(effect)
+
+    ticker = None
+    if on_tick is not None:
+        def _tick():
+            line = on_tick(player)
+            if line and notify:
+                notify(line)
+        ticker = scheduler.schedule(1, _tick, every=1)
+
+    def _expire():
+        if ticker is not None:
+            scheduler.cancel(ticker)
+        if effect in player.get("status", []):
+            player["status"].remove(effect)
+        if notify:
+            notify(expire_message or f"The {name} effect wears off.")
+
+    scheduler.schedule(duration, _expire)
+    return effect
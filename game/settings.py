@@ -1,23 +1,26 @@
-import os
-import json
+import logging
+import sqlite3
 
-SETTINGS_PATH = os.path.join("save", "settings.json")
+from game.save import STORE, SAVE_WRITER, flush_saves
 
 DEFAULT_SETTINGS = {
     "max_hp_bonus": False,
     "verbose_travel": False,
     "screen_reader_mode": False,
-    "debug_mode": False
+    "debug_mode": False,
+    "coalesce_output": True,            # screen reader mode: fold repeated lines
+    "output_lines_per_second": 0,       # screen reader mode: 0 = no cap
 }
 
 def save_settings(player):
-    os.makedirs("save", exist_ok=True)
     settings = {key: player.get(key, DEFAULT_SETTINGS[key]) for key in DEFAULT_SETTINGS}
-    with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2)
+    SAVE_WRITER.save_settings(settings)
 
 def load_settings():
-    if os.path.exists(SETTINGS_PATH):
-        with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return DEFAULT_SETTINGS.copy()
+    settings = DEFAULT_SETTINGS.copy()
+    try:
+        flush_saves("settings")
+        settings.update(STORE.load_settings())
+    except sqlite3.Error as e:
+        logging.error(f"[ERROR] Could not load settings: {e}")
+    return settings
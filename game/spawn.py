@@ -1,61 +1,394 @@
 # game/spawn.py
+"""
+LocalMUD — Monster Spawning
+
+Runtime monster instances, the per-room rosters used for targeting, and the
+respawn engine that keeps rooms populated.
+
+A room's "spawns" list declares its spawn table:
+
+    {
+        "type": "monster",
+        "key": "kobold_bx",             # or a weighted pool:
+        "pool": {"kobold_bx": 3, "goblin": 1},
+        "initial_count": 2,             # spawned at world load
+        "max_count": 4,                 # population cap (default initial_count)
+        "respawn_seconds": 60,          # omit to never respawn
+        "respawn_count": 1,             # monsters per respawn wave
+    }
+
+Author: Alex
+
+Dev Notes:
+- Respawns are driven by deaths, not polling: when a spawned monster is
+  removed, its entry arms a timer on RESPAWNS' min-heap (one pending timer per
+  entry). run_due() only pops timers that are due; a wave refills up to the
+  cap and re-arms while the entry is still short.
+- Instance ids are "<template>:<process prefix><counter>", one uuid4 per
+  process instead of one per monster, so spawn_many() can create a large
+  batch cheaply. The random prefix keeps ids from earlier sessions (restored
+  by world_journal) from colliding.
+"""
+
+import heapq
+import itertools
 import uuid
 import random
 import time
 from game.monsters import MONSTER_DEFS
+from game.entities import MonsterInstance
+from game.world_journal import WORLD_JOURNAL
+
+
+def _split_index(name):
+    """ "kobold 2" / "kobold#2" -> ("kobold", 2); "kobold" -> ("kobold", None)."""
+    parts = name.strip().lower().replace("#", " ").rsplit(" ", 1)
+    if len(parts) == 2 and parts[1].isdigit():
+        return parts[0].strip(), int(parts[1])
+    return parts[0], None
+
+
+class RoomRoster:
+    """
+    The monsters in one room, in spawn order, indexed for targeting:
+
+        by_name   : lowercased name -> list of instances, oldest first
+        prefixes  : every prefix of the name and of each word in it
+                    ("kob", "sca" for "Scaly Kobold") -> names, first seen first
+        templates : template key -> live count
+
+    find("kobold 2") is two dict lookups and a list index, however many
+    monsters share the room, and always means the same kobold until it dies.
+    """
+
+    __slots__ = ("instances", "by_name", "prefixes", "templates")
+
+    def __init__(self):
+        self.instances = {}     # instance_id -> instance (insertion = spawn order)
+        self.by_name   = {}
+        self.prefixes  = {}
+        self.templates = {}
+
+    def add(self, inst):
+        self.instances[inst["id"]] = inst
+        key = inst["name"].lower()
+        same = self.by_name.get(key)
+        if same is None:
+            same = self.by_name[key] = []
+            for prefix in self._prefixes_of(key):
+                self.prefixes.setdefault(prefix, {})[key] = None
+        same.append(inst)
+        self.templates[inst["template"]] = self.templates.get(inst["template"], 0) + 1
+
+    def discard(self, instance_id):
+        inst = self.instances.pop(instance_id, None)
+        if inst is None:
+            return
+        key = inst["name"].lower()
+        same = self.by_name[key]
+        same.remove(inst)
+        if not same:
+            del self.by_name[key]
+            for prefix in self._prefixes_of(key):
+                names = self.prefixes[prefix]
+                del names[key]
+                if not names:
+                    del self.prefixes[prefix]
+        left = self.templates[inst["template"]] - 1
+        if left:
+            self.templates[inst["template"]] = left
+        else:
+            del self.templates[inst["template"]]
+
+    @staticmethod
+    def _prefixes_of(key):
+        prefixes = set()
+        for word in {key, *key.split()}:
+            prefixes.update(word[:i] for i in range(1, len(word) + 1))
+        return prefixes
+
+    def find(self, name):
+        """
+        Resolve "kobold", "kobold 2", "kobold#2" or a prefix like "kob 2".
+        An exact name wins over a prefix; among prefix matches the name that
+        arrived first wins. Returns the instance or None.
+        """
+        wanted, idx = _split_index(name)
+        same = self.by_name.get(wanted)
+        if same is None:
+            names = self.prefixes.get(wanted)
+            if not names:
+                return None
+            same = self.by_name[next(iter(names))]
+        if idx is None:
+            return same[0]
+        if idx <= 0 or idx > len(same):
+            return None
+        return same[idx - 1]
+
+    def count(self, template_key):
+        return self.templates.get(template_key, 0)
+
+    def __len__(self):
+        return len(self.instances)
+
+    def __iter__(self):
+        return iter(self.instances.values())
+
+
+_EMPTY_ROSTER = RoomRoster()
 
 # Runtime registries
 INSTANCES = {}         # instance_id -> instance dict
-ROOM_INDEX = {}        # room_key -> set of instance_ids
+ROOM_INDEX = {}        # room_key -> RoomRoster
+
+_ID_PREFIX = uuid.uuid4().hex[:6]
+_ids = itertools.count(1)
+
+def _new_id(template_key):
+    return f"{template_key}:{_ID_PREFIX}{next(_ids):x}"
 
 def create_instance(template_key, room_key):
     """Create a runtime monster instance from a template and place it in a room."""
+    created = spawn_many(template_key, room_key, 1)
+    return created[0] if created else None
+
+def spawn_many(template_key, room_key, count):
+    """
+    Create `count` instances of a template in a room in one pass.
+    Returns the list of instances ([] for an unknown template).
+    """
     template = MONSTER_DEFS.get(template_key)
-    if not template:
-        return None
+    if not template or count <= 0:
+        return []
 
-    instance_id = f"{template_key}:{uuid.uuid4().hex[:6]}"
-    hp = template.get("hp", random.randint(1, 6))  # fallback if not defined
-    stats = template.get("base_stats", {})
-    instance = {
-        "id": instance_id,
-        "template": template_key,
-        "name": template["name"],
-        "hp": hp,
-        "max_hp": hp,
-        "ac": template.get("ac", 10),
-        "stats": stats,
-        "room": room_key,
-        "hostile": template.get("hostile", True),
-        "created_at": time.time(),
-        "description": template.get("description", ""),
-        "xp": template.get("xp", 0),
-        "loot": template.get("loot", []),
-    }
+    name = template["name"]
+    ac = template.get("ac", 10)
+    hostile = template.get("hostile", True)
+    fixed_hp = template.get("hp")
+    now = time.time()
+    roster = _roster(room_key)
+
+    created = []
+    for _ in range(count):
+        instance_id = _new_id(template_key)
+        hp = fixed_hp if fixed_hp is not None else random.randint(1, 6)  # fallback if not defined
+        # stats, description, xp and loot are read through from the template
+        instance = MonsterInstance(
+            id=instance_id,
+            template=template_key,
+            name=name,
+            hp=hp,
+            max_hp=hp,
+            ac=ac,
+            room=room_key,
+            hostile=hostile,
+            created_at=now,
+        )
+        INSTANCES[instance_id] = instance
+        roster.add(instance)
+        WORLD_JOURNAL.mark_instance(instance_id)
+        created.append(instance)
+    return created
 
-    INSTANCES[instance_id] = instance
-    ROOM_INDEX.setdefault(room_key, set()).add(instance_id)
+def restore_instance(data):
+    """Re-create a saved instance (see game/world_journal.py) under its old id."""
+    instance = MonsterInstance(data)
+    INSTANCES[instance["id"]] = instance
+    _roster(instance["room"]).add(instance)
+    RESPAWNS.adopt(instance)
     return instance
 
+def _roster(room_key):
+    roster = ROOM_INDEX.get(room_key)
+    if roster is None:
+        roster = ROOM_INDEX[room_key] = RoomRoster()
+    return roster
+
+def room_roster(room_key):
+    """The room's RoomRoster (an empty one if no monster was ever there)."""
+    return ROOM_INDEX.get(room_key, _EMPTY_ROSTER)
+
 def get_room_instances(room_key):
-    """Return a list of instance dicts currently in the room."""
-    ids = ROOM_INDEX.get(room_key, set())
-    return [INSTANCES[i] for i in ids if i in INSTANCES]
+    """Return a list of instance dicts currently in the room, in spawn order."""
+    return list(room_roster(room_key))
+
+def find_in_room(room_key, name):
+    """The monster "kobold", "kobold 2" or "kob" refers to in a room, or None."""
+    return room_roster(room_key).find(name)
 
 def remove_instance(instance_id):
-    """Remove a monster instance from the world."""
+    """Remove a monster instance from the world (arming its respawn, if any)."""
     inst = INSTANCES.pop(instance_id, None)
     if inst:
-        room_key = inst["room"]
-        ROOM_INDEX.get(room_key, set()).discard(instance_id)
+        roster = ROOM_INDEX.get(inst["room"])
+        if roster is not None:
+            roster.discard(instance_id)
+            if not roster:
+                del ROOM_INDEX[inst["room"]]
+        WORLD_JOURNAL.mark_instance(instance_id)
+        RESPAWNS.removed(instance_id)
+
+def clear_instances(tables=False):
+    """
+    Forget every runtime instance. With tables=True also forget every spawn
+    table (a full world reload); otherwise the tables stay and each respawning
+    entry re-arms, e.g. when world_journal restores saved instances.
+    """
+    INSTANCES.clear()
+    ROOM_INDEX.clear()
+    if tables:
+        RESPAWNS.clear()
+    else:
+        RESPAWNS.forget_instances()
 
 def init_region_spawns(region_data):
-    """Spawn initial monsters based on room spawn metadata."""
+    """Register every room's spawn table and spawn its initial monsters."""
     for room_key, room in region_data.items():
-        for spawn in room.get("spawns", []):
-            if spawn.get("type") != "monster":
+        for index, entry in enumerate(room.get("spawns", [])):
+            if entry.get("type") != "monster":
                 continue
-            key = spawn.get("key")
-            count = spawn.get("initial_count", 0)
-            for _ in range(count):
-                create_instance(key, room_key)
+            RESPAWNS.add_entry(room_key, index, entry)
+
+# -----------------------
+# Respawn engine
+# -----------------------
+class SpawnEntry:
+    """One compiled "spawns" entry: what, where, how many, how often."""
+
+    __slots__ = ("room", "keys", "cum_weights", "cap", "interval", "wave",
+                 "live", "timer")
+
+    def __init__(self, room_key, entry):
+        pool = entry.get("pool") or {entry.get("key"): 1}
+        self.room        = room_key
+        self.keys        = list(pool)
+        self.cum_weights = list(itertools.accumulate(pool.values()))
+        self.cap         = entry.get("max_count", entry.get("initial_count", 0))
+        self.interval    = entry.get("respawn_seconds") or None
+        self.wave        = max(1, entry.get("respawn_count", 1))
+        self.live        = 0
+        self.timer       = None     # sequence number of the pending heap timer
+
+    def pick(self, count):
+        """`count` template keys drawn from the weighted pool."""
+        if len(self.keys) == 1:
+            return {self.keys[0]: count}
+        picked = {}
+        for key in random.choices(self.keys, cum_weights=self.cum_weights, k=count):
+            picked[key] = picked.get(key, 0) + 1
+        return picked
+
+
+class RespawnEngine:
+    """Spawn tables plus a min-heap of (due time, seq, entry) respawn timers."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock   = clock
+        self.entries = {}       # (room_key, index) -> SpawnEntry
+        self.by_room = {}       # room_key -> [SpawnEntry]
+        self.origin  = {}       # instance_id -> SpawnEntry it came from
+        self._heap   = []
+        self._seq    = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add_entry(self, room_key, index, entry):
+        """
+        Register (or replace) a spawn entry and fill it up to initial_count.
+        Monsters of its pool already in the room that no other entry counts
+        (restored by world_journal before a lazy region loaded, or counted by
+        the entry being replaced) are adopted first, so they aren't doubled.
+        """
+        old = self.entries.get((room_key, index))
+        if old is not None:
+            self._retire(old)
+            self.by_room[room_key].remove(old)
+        spawn_entry = self.entries[(room_key, index)] = SpawnEntry(room_key, entry)
+        self.by_room.setdefault(room_key, []).append(spawn_entry)
+
+        for inst in room_roster(room_key):
+            if inst["template"] in spawn_entry.keys and self.origin.get(inst["id"], old) is old:
+                self.origin[inst["id"]] = spawn_entry
+                spawn_entry.live += 1
+        self.populate(spawn_entry, max(0, entry.get("initial_count", 0) - spawn_entry.live))
+        self._arm(spawn_entry)
+        return spawn_entry
+
+    def populate(self, spawn_entry, count):
+        created = []
+        for key, n in spawn_entry.pick(count).items():
+            created.extend(spawn_many(key, spawn_entry.room, n))
+        for inst in created:
+            self.origin[inst["id"]] = spawn_entry
+        spawn_entry.live += len(created)
+        return created
+
+    def _arm(self, spawn_entry, now=None):
+        """Start the entry's respawn timer if it respawns, is short and has none."""
+        if spawn_entry.interval is None or spawn_entry.timer is not None:
+            return
+        if spawn_entry.live >= spawn_entry.cap:
+            return
+        due = (self.clock() if now is None else now) + spawn_entry.interval
+        spawn_entry.timer = next(self._seq)
+        heapq.heappush(self._heap, (due, spawn_entry.timer, spawn_entry))
+
+    def removed(self, instance_id):
+        spawn_entry = self.origin.pop(instance_id, None)
+        if spawn_entry is not None:
+            spawn_entry.live -= 1
+            self._arm(spawn_entry)
+
+    def adopt(self, instance):
+        """Count a restored instance against the entry in its room that can spawn it."""
+        for spawn_entry in self.by_room.get(instance["room"], ()):
+            if instance["template"] in spawn_entry.keys:
+                self.origin[instance["id"]] = spawn_entry
+                spawn_entry.live += 1
+                return spawn_entry
+        return None
+
+    def run_due(self, now=None):
+        """Fire every due respawn. Returns the instances created."""
+        now = self.clock() if now is None else now
+        heap = self._heap
+        created = []
+        while heap and heap[0][0] <= now:
+            _, seq, spawn_entry = heapq.heappop(heap)
+            if spawn_entry.timer != seq:
+                continue            # retired or re-armed since
+            spawn_entry.timer = None
+            short = spawn_entry.cap - spawn_entry.live
+            if short > 0:
+                created.extend(self.populate(spawn_entry, min(short, spawn_entry.wave)))
+            self._arm(spawn_entry, now)
+        return created
+
+    def forget_instances(self):
+        """Zero every population (instances were cleared) and re-arm timers."""
+        self.origin.clear()
+        self._heap.clear()
+        for spawn_entry in self.entries.values():
+            spawn_entry.live = 0
+            spawn_entry.timer = None
+            self._arm(spawn_entry)
+
+    @staticmethod
+    def _retire(spawn_entry):
+        """Stop an entry for good; its pending timer is skipped when popped."""
+        spawn_entry.interval = None
+        spawn_entry.timer = None
+
+    def clear(self):
+        for spawn_entry in self.entries.values():
+            self._retire(spawn_entry)
+        self.entries.clear()
+        self.by_room.clear()
+        self.origin.clear()
+        self._heap.clear()
+
+
+# Runtime registry: every loaded spawn table and its pending respawns
+RESPAWNS = RespawnEngine()
@@ -0,0 +1,200 @@
+# travel.py
+"""
+LocalMUD — Auto-Travel
+
+TRAVEL <room or landmark> walks the player to a room they have already
+discovered in one command, instead of a long chain of N/E/S/W.
+
+Routes are found with A* over the world index (world/world_index.py), using the
+coordinates in 'region_x_y_z' room ids as the heuristic. Routes are cached per
+(start, goal) and the cache is dropped whenever the index version changes,
+i.e. when exits are edited or regions load.
+
+Author: Alex
+
+Dev Notes:
+- The heuristic is Manhattan distance within a region and 0 across regions,
+  so cross-region routes are still found; hand-built regions with long exits
+  may get a slightly longer route than the true shortest.
+- The walk applies the same rules as GO (locked doors, first-visit XP) but
+  reports one summary instead of a message per step.
+"""
+
+import heapq
+from collections import OrderedDict
+
+from game.commands import command
+from game.result import CommandResult, TAG_ROOM, TAG_ITEM
+from game.world_journal import WORLD_JOURNAL
+from utils.helpers import parse_room_coords
+from world.world_index import get_index
+
+
+ROUTE_CACHE_SIZE = 1024
+
+_route_cache = OrderedDict()     # (src, dst) -> [room ints] including both ends
+_cache_state = {"index": None, "version": None, "coords": [], "landmarks": None}
+
+
+def _refresh(index):
+    """Drop cached routes and per-room data when the index has changed."""
+    if _cache_state["index"] is index and _cache_state["version"] == index.version:
+        return
+    _route_cache.clear()
+    _cache_state["index"] = index
+    _cache_state["version"] = index.version
+    _cache_state["coords"] = [parse_room_coords(room_id) for room_id in index.ids]
+    _cache_state["landmarks"] = None
+
+
+def _landmarks(index, rooms):
+    """Lowercased room name -> [room ints], built lazily per index version."""
+    _refresh(index)
+    landmarks = _cache_state["landmarks"]
+    if landmarks is None:
+        landmarks = _cache_state["landmarks"] = {}
+        for i, room_id in enumerate(index.ids):
+            name = rooms[room_id].get("name")
+            if name:
+                landmarks.setdefault(name.lower(), []).append(i)
+    return landmarks
+
+
+def _heuristic(coords, a, b):
+    region_a, ca = coords[a]
+    region_b, cb = coords[b]
+    if region_a != region_b or len(ca) != len(cb):
+        return 0
+    return sum(abs(x - y) for x, y in zip(ca, cb))
+
+
+def find_route(index, src, dst):
+    """
+    A* from room int src to room int dst. Returns the list of room ints
+    (src first, dst last), or None if dst is unreachable.
+    """
+    _refresh(index)
+    key = (src, dst)
+    route = _route_cache.get(key)
+    if route is not None:
+        _route_cache.move_to_end(key)
+        return route
+
+    coords = _cache_state["coords"]
+    came_from = {src: None}
+    cost = {src: 0}
+    frontier = [(_heuristic(coords, src, dst), 0, src)]
+
+    while frontier:
+        _, g, current = heapq.heappop(frontier)
+        if current == dst:
+            break
+        if g > cost[current]:
+            continue
+        for nxt in index.neighbors(current):
+            new_cost = g + 1
+            if new_cost < cost.get(nxt, new_cost + 1):
+                cost[nxt] = new_cost
+                came_from[nxt] = current
+                heapq.heappush(frontier, (new_cost + _heuristic(coords, nxt, dst), new_cost, nxt))
+    else:
+        if dst not in came_from:
+            return None
+
+    route = []
+    node = dst
+    while node is not None:
+        route.append(node)
+        node = came_from[node]
+    route.reverse()
+
+    _route_cache[key] = route
+    if len(_route_cache) > ROUTE_CACHE_SIZE:
+        _route_cache.popitem(last=False)
+    return route
+
+
+def resolve_destination(index, rooms, target):
+    """Room ints matching a room id or a room name (landmark)."""
+    _refresh(index)         # landmark ints must belong to this index version
+    i = index.id_of(target)
+    if i is None:
+        i = index.id_of(target.lower().replace(" ", "_"))
+    if i is not None:
+        return [i]
+    return _landmarks(index, rooms).get(target.lower(), [])
+
+
+def _locked_by(room, player):
+    for trig in room.get("triggers", []):
+        if trig.get("condition") == "requires_item" and trig["item"] not in player["inventory"]:
+            return trig["item"]
+    return None
+
+
+@command("travel", "goto", help=[
+    "TRAVEL [room or landmark] — Walk to a room you have already discovered.",
+    "Takes the shortest known path and stops early at locked doors."
+])
+def cmd_travel(ctx, tokens):
+    if len(tokens) < 2:
+        return "Travel where?"
+
+    rooms      = ctx["rooms"]
+    player     = ctx["player"]
+    game_state = ctx["game_state"]
+    target     = " ".join(tokens[1:])
+
+    index = get_index(rooms)
+    src = index.id_of(ctx["room_id"])
+    if src is None:
+        return "You can't get your bearings here."
+
+    goals = [g for g in resolve_destination(index, rooms, target)
+             if rooms[index.room_id(g)].get("visited")]
+    if not goals:
+        return f"You don't know the way to '{target}'."
+    if src in goals:
+        return "You are already there."
+
+    # Nearest matching landmark wins
+    route = None
+    for goal in goals:
+        candidate = find_route(index, src, goal)
+        if candidate and (route is None or len(candidate) < len(route)):
+            route = candidate
+    if route is None:
+        return f"No path leads to '{target}' from here."
+
+    # Walk it in one batch
+    steps = 0
+    discovered = []
+    blocked = None
+    for i in route[1:]:
+        room_id = index.room_id(i)
+        room = rooms[room_id]
+        blocked = _locked_by(room, player)
+        if blocked:
+            break
+        if not room.get("visited", False):
+            room["visited"] = True
+            WORLD_JOURNAL.mark_room(room_id)
+            player["xp"] = player.get("xp", 0) + 1
+            discovered.append(room["name"])
+        game_state["current_room"] = room_id
+        player["location"] = room_id
+        steps += 1
+
+    here = rooms[game_state["current_room"]]
+    out = CommandResult()
+    if steps:
+        out.say(f"You travel {steps} room{'s' if steps != 1 else ''}. - {here['name']}", (TAG_ROOM, here["name"]))
+        out.event("moved", room=game_state["current_room"], previous=ctx["room_id"], steps=steps)
+    if discovered:
+        out.say(f"You gain {len(discovered)} XP for discovering: {', '.join(discovered)}.",
+                *((TAG_ROOM, name) for name in discovered))
+    if blocked:
+        out.say(f"The way onward is locked. You need the {blocked}.", (TAG_ITEM, blocked))
+    elif steps:
+        out.say(here.get("look_description", here.get("description", "")))
+    return out
@@ -0,0 +1,296 @@
+# game/world_journal.py
+"""
+LocalMUD — World State Journal
+
+Saves what changed in the world (room items, visited flags, door flags,
+exits, monster instances) without rewriting the whole world each time.
+
+Anything that changes world state marks it dirty:
+
+    WORLD_JOURNAL.mark_room(room_id)
+    WORLD_JOURNAL.mark_instance(instance_id)
+
+save() then appends ONE json line holding just those rooms and instances to
+save/world.journal, so an autosave costs O(changes), not O(world). A
+background thread periodically folds the journal into the SQLite save store
+(game/save.py) in one transaction (compaction), so the journal never grows
+without bound.
+
+Typical usage:
+    WORLD_JOURNAL.reset()                         # new game: forget the old world
+    schedule_autosave(scheduler, rooms)           # save every AUTOSAVE_SECONDS
+    WORLD_JOURNAL.start_compactor()
+    ...
+    WORLD_JOURNAL.restore(rooms)                  # after load_overworld()
+
+Author: Alex
+
+Dev Notes:
+- Journal records look like:
+    {"seq": 12, "rooms": {"chapel_0_0_0": {"items": [], "visited": true}},
+     "instances": {"kobold_bx:1a2b3c": {...}, "kobold_bx:9f8e7d": null}}
+  A null instance was removed. Later records win.
+- A crash mid-append leaves a torn last line; load skips lines that don't parse.
+- Compaction first renames the journal aside (a quick step under the lock),
+  then merges it into the store without holding up saves. If we crash in
+  between, load reads store + the renamed journal + the new journal, in order.
+- Instance ids are random per spawn, so a world load marks every instance
+  dirty (spawn does this); the first save therefore holds the full set and
+  restore() can replace the fresh spawns with it.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from game.entities import SlotMapping, MonsterInstance
+from game.save import STORE
+
+
+SAVE_DIR = "save"
+AUTOSAVE_SECONDS = 5
+COMPACT_SECONDS = 60
+COMPACT_MIN_BYTES = 64 * 1024
+
+# Room keys that change during play
+ROOM_KEYS = ("items", "visited", "flags", "exits")
+
+
+def _plain(value):
+    if isinstance(value, SlotMapping):
+        return value.to_dict()
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def _room_state(room):
+    return {key: _plain(room[key]) for key in ROOM_KEYS if key in room}
+
+
+def _instance_state(instance):
+    if instance is None:
+        return None
+    return {key: instance[key] for key in MonsterInstance.FIELDS if key in instance}
+
+
+class WorldJournal:
+    """Dirty tracking plus an append-only journal of world deltas."""
+
+    def __init__(self, save_dir=SAVE_DIR, store=STORE):
+        self.journal_path    = os.path.join(save_dir, "world.journal")
+        self.compacting_path = os.path.join(save_dir, "world.journal.compacting")
+        self.save_dir = save_dir
+        self.store = store
+
+        self.dirty_rooms = set()
+        self.dirty_instances = set()
+        self.seq = 0
+        self.tracking = True        # False: front-end never saves, don't collect
+
+        self._lock = threading.Lock()           # journal file + dirty sets
+        self._compact_lock = threading.Lock()   # one compaction at a time
+        self._stop = None
+        self._thread = None
+
+    # -----------------------
+    # Dirty tracking
+    # -----------------------
+    def mark_room(self, room_id):
+        if self.tracking:
+            self.dirty_rooms.add(room_id)
+
+    def mark_instance(self, instance_id):
+        if self.tracking:
+            self.dirty_instances.add(instance_id)
+
+    def pending(self):
+        return len(self.dirty_rooms) + len(self.dirty_instances)
+
+    # -----------------------
+    # Saving
+    # -----------------------
+    def save(self, rooms):
+        """Append the dirty rooms and instances to the journal.
+        Returns how many entries were written (0 if nothing changed)."""
+        from game import spawn
+
+        with self._lock:
+            dirty_rooms, self.dirty_rooms = self.dirty_rooms, set()
+            dirty_instances, self.dirty_instances = self.dirty_instances, set()
+        if not dirty_rooms and not dirty_instances:
+            return 0
+
+        record = {
+            "seq": self.seq + 1,
+            "rooms": {room_id: _room_state(rooms[room_id]) for room_id in dirty_rooms if room_id in rooms},
+            "instances": {i: _instance_state(spawn.INSTANCES.get(i)) for i in dirty_instances},
+        }
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+
+        with self._lock:
+            try:
+                os.makedirs(self.save_dir, exist_ok=True)
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                # Keep the changes dirty so the next save retries them
+                self.dirty_rooms |= dirty_rooms
+                self.dirty_instances |= dirty_instances
+                logging.error(f"[ERROR] Could not write world journal: {e}")
+                return 0
+            self.seq += 1
+        return len(dirty_rooms) + len(dirty_instances)
+
+    # -----------------------
+    # Loading
+    # -----------------------
+    @staticmethod
+    def _empty_state():
+        return {"seq": 0, "rooms": {}, "instances": {}, "instances_saved": False}
+
+    def _read_base(self):
+        try:
+            return self.store.load_world()
+        except sqlite3.Error as e:
+            logging.error(f"[ERROR] Saved world is unreadable: {e}")
+            return self._empty_state()
+
+    @staticmethod
+    def _fold(state, path):
+        """Apply every record in a journal file to state, in order."""
+        try:
+            f = open(path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return state
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue        # torn write from a crash
+                for room_id, changes in record.get("rooms", {}).items():
+                    state["rooms"].setdefault(room_id, {}).update(changes)
+                if record.get("instances"):
+                    state["instances"].update(record["instances"])
+                    state["instances_saved"] = True
+                state["seq"] = max(state["seq"], record.get("seq", 0))
+        return state
+
+    def load_state(self):
+        """Return the folded world state:
+        {"seq", "rooms", "instances", "instances_saved"}."""
+        state = self._read_base()
+        self._fold(state, self.compacting_path)
+        self._fold(state, self.journal_path)
+        return state
+
+    def restore(self, rooms):
+        """Apply the saved world state to freshly loaded rooms and instances."""
+        from game import spawn
+
+        state = self.load_state()
+        exits_changed = []
+        for room_id, changes in state["rooms"].items():
+            room = rooms.get(room_id)
+            if room is not None:
+                room.update(changes)
+                if "exits" in changes:
+                    exits_changed.append(room_id)
+
+        # Saved exits replace built ones: same follow-up as world_index.set_exit
+        if exits_changed:
+            from world.world_index import WORLD_INDEX
+            from world.link_validator import LINK_VALIDATOR
+            WORLD_INDEX.invalidate()
+            if rooms is LINK_VALIDATOR.source:
+                LINK_VALIDATOR.check_rooms(exits_changed)
+
+        saved = state["instances"]
+        if state["instances_saved"]:
+            spawn.clear_instances()
+            for data in saved.values():
+                if data:
+                    spawn.restore_instance(data)
+
+        # Everything just restored is already on disk
+        self.dirty_rooms.clear()
+        self.dirty_instances.clear()
+        self.seq = state["seq"]
+        return len(state["rooms"]), sum(1 for data in saved.values() if data)
+
+    def reset(self):
+        """Forget the saved world (new game)."""
+        with self._lock:
+            for path in (self.journal_path, self.compacting_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logging.error(f"[ERROR] Could not remove {path}: {e}")
+            try:
+                self.store.clear_world()
+            except sqlite3.Error as e:
+                logging.error(f"[ERROR] Could not clear the saved world: {e}")
+            self.seq = 0
+
+    # -----------------------
+    # Compaction
+    # -----------------------
+    def compact(self, min_bytes=0):
+        """Fold the journal into the save store. Returns True if it ran."""
+        with self._compact_lock:
+            with self._lock:
+                try:
+                    size = os.path.getsize(self.journal_path)
+                except OSError:
+                    size = 0
+                if not os.path.exists(self.compacting_path):
+                    if size == 0 or size < min_bytes:
+                        return False
+                    os.replace(self.journal_path, self.compacting_path)
+
+            delta = self._fold(self._empty_state(), self.compacting_path)
+            try:
+                self.store.apply_world_delta(delta["rooms"], delta["instances"], delta["seq"])
+                os.remove(self.compacting_path)
+            except (OSError, sqlite3.Error) as e:
+                logging.error(f"[ERROR] World journal compaction failed: {e}")
+                return False
+            return True
+
+    def start_compactor(self, interval=COMPACT_SECONDS, min_bytes=COMPACT_MIN_BYTES):
+        """Compact in a daemon thread every `interval` seconds once the
+        journal passes min_bytes."""
+        if self._thread is not None:
+            return
+        self._stop = threading.Event()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.compact(min_bytes)
+
+        self._thread = threading.Thread(target=run, name="world-journal-compactor", daemon=True)
+        self._thread.start()
+
+    def stop_compactor(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+# Runtime registry: one journal for the live world
+WORLD_JOURNAL = WorldJournal()
+
+
+def schedule_autosave(scheduler, rooms, journal=WORLD_JOURNAL, seconds=AUTOSAVE_SECONDS):
+    """Save the journal's dirty entries every `seconds` on the world scheduler."""
+    ticks = max(1, int(seconds / scheduler.tick_seconds))
+    return scheduler.schedule(ticks, journal.save, rooms, every=ticks)
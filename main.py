@@ -1,16 +1,23 @@
 import curses
-import random
 
 from game.rooms   import rooms
 from game.npcs import NPC_DEFS
 from game.items   import items
 from game.player  import player as initial_player
-from game.parser  import handle_command, verify_room_links
+from game.parser  import handle_command
+from game.result  import QUIT, CONFIRM_TITLE
 from config  import get_motd, VERSION, DEV_NOTE
 from ui.ui      import show_title_screen, show_game_over_menu, draw_ui, wrap_text, show_settings_menu 
+from ui.renderer import get_renderer
+from ui.message_log import MessageLog
+from ui.history import CommandHistory
+from ui.output import TextOutput, format_result
 from world.overworld import load_overworld
 from utils.log_manager import cleanup_old_logs, log_room_error
 from game.settings import load_settings
+from game.scheduler import Scheduler, TICK_SECONDS, init_world_events
+from game.world_journal import WORLD_JOURNAL
+from game.combat import schedule_combat
 
 
 from game.character import (
@@ -32,12 +39,15 @@ def launch(stdscr, player):
     # Outer loop lets us restart without exiting the program
     while True:
         
-        # Load game data
+        # Load game data. Single-player always starts a new character in a
+        # fresh world, so it neither restores nor writes the world journal
+        # (that is the server's persisted world).
+        WORLD_JOURNAL.tracking = False
         rooms = load_overworld()
         items = {}  # Load or define items here
         NPC_DEFS = {}  # Load or define NPCs here
         current_motd = get_motd()
-        message_log = []
+        message_log = MessageLog()
         settings = load_settings()
         player.update(settings)
 
@@ -68,10 +78,10 @@ def launch(stdscr, player):
             "restart": False,
             "game_over": False
         }
+        game_state["scheduler"] = start_world_clock(game_state, rooms, NPC_DEFS, message_log)
     
 
         current_motd = get_motd()
-        message_log  = []
 
         # Load settings
         settings = load_settings()
@@ -135,7 +145,6 @@ def launch(stdscr, player):
             ]
 
             height, width = stdscr.getmaxyx()
-            verify_room_links(rooms)
 
             for paragraph in intro_text:
                 wrapped = wrap_text(paragraph, width - 4)
@@ -168,25 +177,47 @@ def run_non_curses_mode(player, rooms, items, motd, NPC_DEFS):
         print(paragraph)
         input("Press Enter to continue...\n")
 
+    # All output from here on goes out in one write per command
+    out = TextOutput(
+        coalesce=player.get("coalesce_output", True),
+        max_lines_per_second=player.get("output_lines_per_second"),
+    )
+
     # Initial room description
     current_room = player["location"]
-    print(f"You are in {rooms[current_room]['name']}")
-    print(rooms[current_room]["look_description"])
-    print()
+    out.write([
+        f"You are in {rooms[current_room]['name']}",
+        rooms[current_room]["look_description"],
+        "",
+    ])
 
-    message_log = []
+    message_log = MessageLog()
+    game_state = {"current_room": current_room}
+    scheduler = start_world_clock(game_state, rooms, NPC_DEFS, message_log)
 
     # Main input loop
-    print("DEBUG: Entering input loop")
+    out.write("DEBUG: Entering input loop")
     while True:
+        out.flush()
         command = input("> ").strip().lower()
+
+        # Catch up on world events that happened while we waited for input
+        game_state["current_room"] = current_room
+        scheduler.advance()
+        out.write(message_log.unread())
+        if game_state.get("game_over"):     # slain in auto-combat
+            out.write("GAME OVER")
+            out.flush()
+            break
+
         if command in ("quit", "exit"):
-            print("Thanks for playing!")
+            out.write("Thanks for playing!")
+            out.flush()
             break
 
         result = handle_command(
             command,
-            {"current_room": current_room},
+            game_state,
             player,
             rooms,
             items,
@@ -195,110 +226,139 @@ def run_non_curses_mode(player, rooms, items, motd, NPC_DEFS):
             NPC_DEFS
         )
 
-        if isinstance(result, list):
-            for line in result:
-                print(line)
-        elif isinstance(result, str):
-            if result == "quit":
-                print("Thanks for playing LocalMUD!")
-                break
-            else:
-                print(result)
+        lines, signal = format_result(result)
+        out.write(lines)
+        if signal == QUIT:
+            out.flush()
+            break
+        if game_state.get("game_over"):
+            out.write("GAME OVER")
+            out.flush()
+            break
 
         current_room = player["location"]
-        print()
 
 
-def handle_idle_npc_actions(current_room, NPC_DEFS, message_log):
-    present = NPC_DEFS.get(current_room, [])
-    for npc in present:
-        idle_lines = npc.get("idle_actions", [])
-        if idle_lines and random.random() < 0.25:
-            message_log.append(random.choice(idle_lines))
+def start_world_clock(game_state, rooms, NPC_DEFS, message_log):
+    """Create the world scheduler; events in the player's room go to the log."""
+    def emit(room_key, line):
+        if room_key == game_state["current_room"]:
+            message_log.append(line)
+
+    game_state["notify"] = message_log.extend     # auto-combat rounds
+    scheduler = Scheduler()
+    init_world_events(scheduler, rooms, NPC_DEFS, emit)
+    schedule_combat(scheduler)
+    return scheduler
 
 
 def main_loop(stdscr, game_state, player, rooms, items, current_motd, message_log, NPC_DEFS):
     curses.curs_set(1)
     stdscr.nodelay(False)
+    renderer = get_renderer(stdscr, game_state)
+    renderer.invalidate()     # the title/creation screens drew over everything
 
-    while True:
-        draw_ui(stdscr, game_state, player, rooms, message_log)
+    # ─── Enhanced Input with Command History ───
+    history = game_state.get("command_history")
+    if history is None:
+        history = game_state["command_history"] = CommandHistory.load()
 
-        height, width = stdscr.getmaxyx()
-        input_y = height - 2
-        stdscr.addstr(input_y, 2, "> ")
-        stdscr.refresh()
+    def advance_world(scheduler):
+        """Run due world events; redraw if any of them said something."""
+        if scheduler is None:
+            return
+        before = message_log.version
+        scheduler.advance()
+        if message_log.version != before:
+            draw_ui(stdscr, game_state, player, rooms, message_log)
+
+    def game_over_menu():
+        """Show the game over menu. True if main_loop should return."""
+        choice = show_game_over_menu(stdscr, player)
+        renderer.invalidate()
+        if choice == "restart":
+            game_state["restart"] = True
+        return choice in ("restart", "quit")
 
-        # ─── Enhanced Input with Command History ───
-        history = game_state.setdefault("command_history", [])
-        history_index = -1
+    while True:
+        cursor = None       # Up/Down walk, filtered by what was typed first
         input_buffer = ""
 
-        stdscr.move(input_y, 4)
-        stdscr.clrtoeol()
-        curses.curs_set(1)
-        stdscr.refresh()
+        renderer.draw_input(input_buffer, update=False)
+        draw_ui(stdscr, game_state, player, rooms, message_log)
 
         cont = False #for restarting this while loop so we can redraw the ui
 
+        # Wake up once per tick so the world keeps moving while we wait
+        scheduler = game_state.get("scheduler")
+        renderer.timeout(int(TICK_SECONDS * 1000))
+
         while True:
-            key = stdscr.getch()
+            key = renderer.getch()
 
-            if key in (curses.KEY_ENTER, 10, 13):  # Enter
+            if key == -1:
+                advance_world(scheduler)
+                if game_state.get("game_over"):     # slain in auto-combat
+                    raw = None
+                    break
+                continue
+
+            elif key in (curses.KEY_ENTER, 10, 13):  # Enter
                 raw = input_buffer.strip()
                 break
 
             elif key == curses.KEY_UP:
-                if history:
-                    history_index = max(0, history_index - 1)
-                    input_buffer = history[history_index]
-                    stdscr.move(input_y, 4)
-                    stdscr.clrtoeol()
-                    stdscr.addstr(input_y, 4, input_buffer)
-                    stdscr.refresh()
+                if cursor is None:
+                    cursor = history.cursor(input_buffer)
+                input_buffer = cursor.older()
+                renderer.draw_input(input_buffer)
 
             elif key == curses.KEY_DOWN:
-                if history:
-                    history_index += 1
-                    if history_index >= len(history):
-                        history_index = -1
-                        input_buffer = ""
-                    else:
-                        input_buffer = history[history_index]
-                    stdscr.move(input_y, 4)
-                    stdscr.clrtoeol()
-                    stdscr.addstr(input_y, 4, input_buffer)
-                    stdscr.refresh()
+                if cursor is not None:
+                    input_buffer = cursor.newer()
+                    renderer.draw_input(input_buffer)
+
+            elif key == curses.KEY_PPAGE:
+                renderer.page_up()
+
+            elif key == curses.KEY_NPAGE:
+                renderer.page_down()
+
+            elif key == curses.KEY_END:
+                renderer.scroll_end()
+
+            elif key == ord("/") and not input_buffer:
+                renderer.search(on_idle=lambda: advance_world(scheduler))
+                renderer.draw_input(input_buffer)
 
             elif key in (curses.KEY_BACKSPACE, 127, 8):
                 input_buffer = input_buffer[:-1]
-                stdscr.move(input_y, 4)
-                stdscr.clrtoeol()
-                stdscr.addstr(input_y, 4, input_buffer)
-                stdscr.refresh()
+                cursor = None
+                renderer.draw_input(input_buffer)
 
             elif 32 <= key <= 126:  # Printable characters
                 input_buffer += chr(key)
-                stdscr.addstr(input_y, 4 + len(input_buffer) - 1, chr(key))
-                stdscr.refresh()
+                cursor = None
+                renderer.draw_input(input_buffer)
 
             else:
                 cont = True
                 break  # you can't Ignore other keys
+        renderer.timeout(-1)
         if cont:
             continue
+        if raw is None:
+            if game_over_menu():
+                return
+            continue
 
-        curses.curs_set(0)
-        stdscr.move(input_y, 4)
-        stdscr.clrtoeol()
+        renderer.draw_input("")
         curses.noecho()
 
+        renderer.reset_scroll()
         if raw:
             message_log.append(f"> {raw}")
-            if raw not in history:
-                history.append(raw)
-                if len(history) > 10:
-                    history.pop(0)
+            history.add(raw)
 
 
         # ─── Run parser ───
@@ -314,22 +374,13 @@ def main_loop(stdscr, game_state, player, rooms, items, current_motd, message_lo
         )
 
         # ─── Handle parser output ───
-        if isinstance(result, list):
-            message_log.extend(result)
-        elif isinstance(result, str):
-            if result == "quit":
-                message_log.append("Thanks for playing LocalMUD!")
-                break
-            else:
-                message_log.append(result)
-
-        message_log.append("")
-
-        # ─── NPC idle actions ───
-        handle_idle_npc_actions(game_state["current_room"], NPC_DEFS, message_log)
+        lines, signal = format_result(result)
+        message_log.extend(lines)
+        if signal == QUIT:
+            break
 
         # ─── “Return to title” confirmation ───
-        if result == "confirm_title":
+        if signal == CONFIRM_TITLE:
             stdscr.clear()
             stdscr.addstr(5, 4, "Return to title screen? [Y]es / [N]o")
             stdscr.refresh()
@@ -341,12 +392,11 @@ def main_loop(stdscr, game_state, player, rooms, items, current_motd, message_lo
                 return
             else:
                 message_log.append("Return canceled.")
+            renderer.invalidate()
 
         # ─── Check for Game Over ───
-        if game_state.get("game_over"):
-            choice = show_game_over_menu(stdscr, player)
-            if choice == "restart":
-                game_state["restart"] = True
+        if game_state.get("game_over") and game_over_menu():
+            return
 
 
 if __name__ == "__main__":
@@ -0,0 +1,353 @@
+# server.py
+"""
+LocalMUD — Multi-User Telnet Server
+
+Runs LocalMUD as a shared world over TCP/telnet on a single asyncio event loop.
+Every connection gets its own player dict, game state and message log; all
+sessions share one load_overworld() world and the spawn registries in
+game/spawn.py.
+
+Typical usage:
+    python server.py --host 0.0.0.0 --port 4000
+
+Author: Alex
+
+Dev Notes:
+- handle_command is synchronous and mutates shared world state, so every call
+  runs under WORLD_LOCK. Commands are cheap; nothing awaits while holding it.
+- Output never blocks the game: each session owns a bounded queue drained by
+  its own writer task. A client that stops reading fills its queue and is
+  disconnected instead of stalling everyone else.
+- A background task advances the world scheduler once per tick under the same
+  lock, so NPC idle lines and respawns happen even when nobody types.
+- World changes are journaled every few seconds (game/world_journal.py) and
+  restored on the next start, so the shared world survives a restart.
+  Players are saved to the SQLite store (game/save.py) in the same autosave
+  batch and on disconnect (written off the event loop by SAVE_WRITER);
+  logging in with a known name resumes that player.
+- Commands return a CommandResult (game/result.py); its events ("moved",
+  "took", "dropped", "killed", "died") are fanned out to the other sessions in the room by
+  publish(), without re-reading the acting player's text.
+- Curses-only features (minigames, title screen) are not available here.
+"""
+
+import argparse
+import asyncio
+import copy
+import re
+
+from config import get_motd, VERSION
+from game.items import items
+from game.npcs import NPC_DEFS
+from game.parser import handle_command
+from game.player import player as player_template
+from game.scheduler import Scheduler, TICK_SECONDS, init_world_events
+from game.world_journal import WORLD_JOURNAL, AUTOSAVE_SECONDS
+from game.save import SAVE_WRITER, FLUSH_TIMEOUT, load_player as load_saved_player
+from world.overworld import load_overworld
+from ui.message_log import MessageLog
+from ui.output import format_result
+from game.result import QUIT, CONFIRM_TITLE
+from game.combat import COMBAT, schedule_combat
+
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 4000
+MAX_SESSIONS = 500
+OUTPUT_QUEUE_SIZE = 256     # pending writes per session before we give up on it
+MAX_LINE_LENGTH = 512
+SESSION_LOG_LINES = 200     # parser side output kept per session (cleared every command)
+
+START_ROOM = "chapel_0_0_0"
+
+# Telnet negotiation: IAC WILL/WONT/DO/DONT <opt>, and bare IAC <cmd>
+TELNET_IAC = re.compile(rb"\xff[\xfb-\xfe].|\xff[\xf0-\xfa]", re.DOTALL)
+
+WORLD_LOCK = asyncio.Lock()
+
+
+class Session:
+    """State for one connected player."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.peer = writer.get_extra_info("peername")
+        self.player = None
+        self.game_state = None
+        self.message_log = MessageLog(maxlen=SESSION_LOG_LINES)
+        self.outbox = asyncio.Queue(maxsize=OUTPUT_QUEUE_SIZE)
+        self.closed = False
+
+    def send(self, lines):
+        """Queue lines for this client without waiting on its socket."""
+        if self.closed:
+            return
+        if isinstance(lines, str):
+            lines = [lines]
+        data = "".join(f"{line}\r\n" for line in lines).encode("utf-8", "replace")
+        try:
+            self.outbox.put_nowait(data)
+        except asyncio.QueueFull:
+            # Client is not reading; drop it rather than buffer without limit
+            self.close()
+
+    def prompt(self):
+        if not self.closed:
+            try:
+                self.outbox.put_nowait(b"> ")
+            except asyncio.QueueFull:
+                self.close()
+
+    def close(self):
+        """Flush whatever is queued, then hang up."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.outbox.put_nowait(None)
+        except asyncio.QueueFull:
+            # Client stopped reading; there is nothing worth flushing
+            self.writer.transport.abort()
+
+    async def writer_loop(self):
+        try:
+            while True:
+                data = await self.outbox.get()
+                if data is None:
+                    break
+                self.writer.write(data)
+                await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+            self.writer.close()
+
+    async def readline(self):
+        """Read one line of input with telnet negotiation stripped. None on EOF."""
+        try:
+            raw = await self.reader.readline()
+        except (ConnectionError, OSError, asyncio.LimitOverrunError, ValueError):
+            return None
+        if not raw:
+            return None
+        raw = TELNET_IAC.sub(b"", raw)[:MAX_LINE_LENGTH]
+        return raw.decode("utf-8", "ignore").strip()
+
+
+class MudServer:
+    """Owns the shared world and the set of live sessions."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, lazy_regions=False, max_rooms=None):
+        self.rooms = load_overworld(lazy=lazy_regions, max_rooms=max_rooms)
+        # The shared world persists across restarts
+        WORLD_JOURNAL.restore(self.rooms)
+        self.items = items
+        self.npcs = NPC_DEFS
+        self.motd = get_motd()
+        self.max_sessions = max_sessions
+        self.sessions = set()
+        self.scheduler = Scheduler()
+        init_world_events(self.scheduler, self.rooms, self.npcs, self.emit)
+        ticks = max(1, int(AUTOSAVE_SECONDS / TICK_SECONDS))
+        self.scheduler.schedule(ticks, self.autosave, every=ticks)
+        schedule_combat(self.scheduler)
+
+    def emit(self, room_key, line, exclude=None):
+        """Deliver a world event line to everyone standing in room_key."""
+        for session in self.sessions:
+            if session is exclude:
+                continue
+            if session.game_state and session.game_state["current_room"] == room_key:
+                session.send(line)
+
+    def publish(self, session, events):
+        """Tell the other players in the room what a command just did."""
+        name = session.player["name"]
+        for event in events:
+            kind = event["event"]
+            if kind == "moved":
+                self.emit(event["previous"], f"{name} leaves.", exclude=session)
+                self.emit(event["room"], f"{name} arrives.", exclude=session)
+            elif kind == "took":
+                self.emit(event["room"], f"{name} picks up the {event['item']}.", exclude=session)
+            elif kind == "dropped":
+                self.emit(event["room"], f"{name} drops the {event['item']}.", exclude=session)
+            elif kind == "killed":
+                self.emit(event["room"], f"{name} slays the {event['name']}.", exclude=session)
+            elif kind == "died":
+                self.emit(event["room"], f"{name} falls in battle.", exclude=session)
+
+    def revive(self, session):
+        """Death over telnet isn't the end: wake up back in the chapel."""
+        player = session.player
+        player["hp"] = player.get("max_hp", 1)
+        player["location"] = START_ROOM
+        session.game_state["current_room"] = START_ROOM
+        session.game_state["game_over"] = False
+        session.send(["", "Darkness... then candlelight. You wake in the chapel, whole again.", ""])
+
+    def autosave(self):
+        """Journal world changes and save every online player in one batch."""
+        WORLD_JOURNAL.save(self.rooms)
+        SAVE_WRITER.save_players([s.player for s in self.sessions if s.player])
+
+    def online(self, name):
+        return any(s.player and s.player["name"].lower() == name.lower() for s in self.sessions)
+
+    async def tick_loop(self):
+        while True:
+            await asyncio.sleep(TICK_SECONDS)
+            async with WORLD_LOCK:
+                self.scheduler.advance()
+
+    async def load_player(self, name):
+        """
+        Returning players pick up where they left off. The save flush and
+        SQLite read run on a worker thread so one slow login can't stall
+        every other session; placing the player touches the shared world, so
+        that part stays on the event loop.
+        """
+        player = await asyncio.get_running_loop().run_in_executor(None, load_saved_player, name)
+        if player is None:
+            return self.new_player(name)
+        if player.get("location") not in self.rooms:
+            player["location"] = START_ROOM
+        player.setdefault("visited", set()).add(player["location"])
+        return player
+
+    def new_player(self, name):
+        player = copy.deepcopy(player_template)
+        player["name"] = name
+        player["location"] = START_ROOM
+        player["visited"] = {START_ROOM}
+        player["screen_reader_mode"] = False
+        player["debug_mode"] = False
+        return player
+
+    async def handle_client(self, reader, writer):
+        session = Session(reader, writer)
+        writer_task = asyncio.create_task(session.writer_loop())
+
+        if len(self.sessions) >= self.max_sessions:
+            session.send("The chapel is full. Try again later.")
+            session.close()
+            await writer_task
+            return
+
+        self.sessions.add(session)
+        try:
+            await self.run_session(session)
+        finally:
+            self.sessions.discard(session)
+            # Stop fighting for a player who isn't there any more
+            fight = session.game_state.get("combat") if session.game_state else None
+            if fight is not None:
+                COMBAT.end(fight)
+            if session.player:
+                SAVE_WRITER.save_player(session.player)
+            session.close()
+            await writer_task
+
+    async def run_session(self, session):
+        session.send([f"LocalMUD {VERSION}", f"MOTD: {self.motd}", ""])
+        session.send("Enter your name: ")
+        name = await session.readline()
+        if name is None:
+            return
+        name = name[:20] or "Unnamed Wanderer"
+        if self.online(name):
+            session.send(f"{name} is already here. Try another name.")
+            return
+
+        player = await self.load_player(name)
+        if self.online(name):       # same name logged in while we were loading
+            session.send(f"{name} is already here. Try another name.")
+            return
+        session.player = player
+        location = session.player["location"]
+        session.game_state = {
+            "current_room": location,
+            "restart": False,
+            "game_over": False,
+            "notify": session.send,                         # auto-combat rounds
+            "on_death": lambda: self.revive(session),
+        }
+
+        room = self.rooms[location]
+        session.send([
+            f"Welcome, {name}.",
+            f"You are in {room['name']}",
+            room["look_description"],
+            "",
+        ])
+        session.prompt()
+
+        while not session.closed:
+            raw = await session.readline()
+            if raw is None:
+                break
+            if not raw:
+                session.prompt()
+                continue
+
+            async with WORLD_LOCK:
+                result = handle_command(
+                    raw,
+                    session.game_state,
+                    session.player,
+                    self.rooms,
+                    self.items,
+                    self.motd,
+                    session.message_log,
+                    self.npcs
+                )
+            # The parser's debug chatter goes to the log, not the socket
+            session.message_log.clear()
+
+            lines, signal = format_result(result)
+            if signal == CONFIRM_TITLE:
+                lines = ["There is no title screen over telnet. Type QUIT to leave.", ""]
+            session.send(lines)
+            self.publish(session, result.events)
+            if session.game_state.get("game_over"):
+                self.revive(session)
+            if signal == QUIT:
+                break
+            session.prompt()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, max_sessions=MAX_SESSIONS,
+                lazy_regions=False, max_rooms=None):
+    mud = MudServer(max_sessions=max_sessions, lazy_regions=lazy_regions, max_rooms=max_rooms)
+    server = await asyncio.start_server(mud.handle_client, host, port)
+    ticker = asyncio.create_task(mud.tick_loop())
+    addrs = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"LocalMUD {VERSION} listening on {addrs}")
+    WORLD_JOURNAL.start_compactor()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        ticker.cancel()
+        mud.autosave()
+        SAVE_WRITER.flush(FLUSH_TIMEOUT)
+        WORLD_JOURNAL.stop_compactor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run LocalMUD as a telnet server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    parser.add_argument("--lazy-regions", action="store_true",
+                        help="load regions on demand and evict idle ones")
+    parser.add_argument("--max-rooms", type=int, default=None,
+                        help="room budget for --lazy-regions before eviction")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_sessions,
+                          args.lazy_regions, args.max_rooms))
+    except KeyboardInterrupt:
+        pass
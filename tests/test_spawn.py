@@ -0,0 +1,44 @@
+# tests/test_spawn.py
+"""Respawn engine: restored monsters count toward their spawn entry."""
+
+from game import spawn
+from world.overworld import load_overworld
+
+
+ROOM = "devspace_0_1"       # spawns: kobold_bx, initial_count 1, respawns
+
+
+def _saved_kobolds(count):
+    return [
+        {"id": f"kobold_bx:saved{i}", "template": "kobold_bx", "name": "Kobold",
+         "hp": 4, "max_hp": 4, "ac": 7, "room": ROOM, "hostile": True, "created_at": 0}
+        for i in range(count)
+    ]
+
+
+def test_restore_then_register_does_not_duplicate():
+    spawn.clear_instances(tables=True)
+    for data in _saved_kobolds(3):
+        spawn.restore_instance(data)
+
+    spawn.init_region_spawns({ROOM: {"spawns": [
+        {"type": "monster", "key": "kobold_bx", "initial_count": 2, "respawn_seconds": 60}
+    ]}})
+
+    assert spawn.room_roster(ROOM).count("kobold_bx") == 3
+    assert spawn.RESPAWNS.entries[(ROOM, 0)].live == 3
+
+
+def test_restore_before_lazy_region_load_keeps_saved_population():
+    rooms = load_overworld(lazy=True)       # no region loaded yet, no spawn tables
+    for data in _saved_kobolds(2):
+        spawn.restore_instance(data)        # what WORLD_JOURNAL.restore() does
+
+    assert ROOM in rooms                    # loads devspace, registering its spawns
+    assert spawn.room_roster(ROOM).count("kobold_bx") == 2
+
+    # Still above the cap (initial_count 1) after one dies: no respawn yet
+    spawn.remove_instance("kobold_bx:saved0")
+    assert len(spawn.RESPAWNS) == 0
+    spawn.remove_instance("kobold_bx:saved1")
+    assert len(spawn.RESPAWNS) == 1
@@ -0,0 +1,130 @@
+# ui/history.py
+"""
+LocalMUD — Command History
+
+The commands the player has typed, newest last, for the Up/Down keys in the
+curses input line. Bounded (MAX_COMMANDS), de-duplicated (typing a command
+again moves it to the newest slot), and kept across sessions in
+save/history.txt.
+
+Typical usage:
+    history = CommandHistory.load()
+    history.add("look")
+    cursor = history.cursor("lo")     # Up/Down through commands starting "lo"
+    cursor.older()  -> "look"
+    cursor.newer()  -> "lo"           # back to what was typed
+
+Author: Alex
+
+Dev Notes:
+- add() appends one line to the file; load() rewrites the file once it holds
+  more than twice MAX_COMMANDS lines, so it never grows without bound.
+- Commands are stored one per line; a command can't contain a newline
+  because the input line never produces one.
+"""
+
+import logging
+import os
+from collections import OrderedDict
+
+from utils.helpers import write_atomic
+
+
+HISTORY_PATH = os.path.join("save", "history.txt")
+MAX_COMMANDS = 500
+
+
+class CommandHistory:
+    """Bounded, de-duplicated, persisted command history."""
+
+    def __init__(self, commands=(), maxlen=MAX_COMMANDS, path=None):
+        self.maxlen = maxlen
+        self.path = path
+        self._commands = OrderedDict()      # command -> None, oldest first
+        for command in commands:
+            self._remember(command)
+
+    @classmethod
+    def load(cls, path=HISTORY_PATH, maxlen=MAX_COMMANDS):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+        except OSError as e:
+            logging.error(f"[ERROR] Could not read command history: {e}")
+            lines = []
+
+        history = cls(lines, maxlen=maxlen, path=path)
+        if len(lines) > 2 * maxlen:
+            history.rewrite()
+        return history
+
+    def _remember(self, command):
+        self._commands.pop(command, None)
+        self._commands[command] = None
+        if len(self._commands) > self.maxlen:
+            self._commands.popitem(last=False)
+
+    def add(self, command):
+        """Record a command as the newest entry."""
+        command = command.strip()
+        if not command:
+            return
+        self._remember(command)
+        if self.path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(command + "\n")
+        except OSError as e:
+            logging.error(f"[ERROR] Could not save command history: {e}")
+
+    def rewrite(self):
+        """Replace the file with just the commands held in memory."""
+        if self.path is None:
+            return
+        data = "".join(f"{command}\n" for command in self._commands).encode("utf-8")
+        try:
+            write_atomic(self.path, data)
+        except OSError as e:
+            logging.error(f"[ERROR] Could not save command history: {e}")
+
+    def __len__(self):
+        return len(self._commands)
+
+    def __iter__(self):
+        return iter(self._commands)
+
+    def __contains__(self, command):
+        return command in self._commands
+
+    def search(self, prefix):
+        """Commands starting with prefix, newest first."""
+        return [c for c in reversed(self._commands) if c.startswith(prefix)]
+
+    def cursor(self, typed=""):
+        return HistoryCursor(self, typed)
+
+
+class HistoryCursor:
+    """One Up/Down walk through the history, filtered by what was typed."""
+
+    def __init__(self, history, typed):
+        self.typed = typed
+        self.matches = [c for c in history.search(typed) if c != typed]
+        self.pos = -1           # -1: showing what was typed
+
+    def older(self):
+        if self.pos + 1 < len(self.matches):
+            self.pos += 1
+        return self.current()
+
+    def newer(self):
+        if self.pos >= 0:
+            self.pos -= 1
+        return self.current()
+
+    def current(self):
+        return self.typed if self.pos < 0 else self.matches[self.pos]
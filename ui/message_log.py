@@ -0,0 +1,220 @@
+# ui/message_log.py
+"""
+LocalMUD — Message Log
+
+The scrolling output shown under the room description. A bounded ring buffer:
+once MAX_LINES is reached, each new line pushes out the oldest, so a long
+session holds a fixed amount of text no matter how long it runs.
+
+It still behaves like the list it replaces (append, extend, clear, len,
+iteration, indexing), so the parser and world events don't change. On top of
+that:
+
+    log.page(width, rows, offset)   # the screen's worth of wrapped lines,
+                                    # `offset` rows up from the newest
+    log.unread()                    # lines added since the last unread() call
+    log.version                     # changes whenever the content does
+    log.search("rusty ke")          # serials of lines with words "rusty" and "ke*"
+
+Lines are wrapped lazily: page() wraps only the entries it shows, once per
+width, and keeps the result next to the entry until the width changes or the
+entry falls off the end.
+
+Author: Alex
+
+Dev Notes:
+- Curses mode draws with page(); screen reader mode prints unread(). Both
+  read the same log, so CLEAR, world events and debug output behave the same.
+- Every line ever added has a serial number (first_serial .. total-1); lines
+  below first_serial have been dropped. Use these when holding a position
+  across appends.
+- search() uses a word index built as lines are appended (word -> serials),
+  so an incremental "/" search doesn't rescan the log on every keypress.
+  Appending stays O(words in the line): the sorted vocabulary used for
+  prefix matches is only rebuilt by the first search after a new word
+  arrives or an old one drops out. A line's postings are removed when it
+  falls off the end, so the index stays as bounded as the log.
+"""
+
+import re
+import textwrap
+from bisect import bisect_left
+from collections import deque
+
+
+MAX_LINES = 2000
+WORD = re.compile(r"\w+")
+
+
+class MessageLog:
+    """Bounded list of output lines with a per-width wrap cache."""
+
+    def __init__(self, lines=(), maxlen=MAX_LINES):
+        self.maxlen = maxlen
+        self._lines = deque(maxlen=maxlen)
+        self._wrapped = deque(maxlen=maxlen)    # wrapped lines or None, parallel to _lines
+        self.wrap_width = None
+        self.total = 0          # lines ever added
+        self.cleared = 0        # times clear() was called
+        self._read = 0          # serial of the next unread line
+        self._postings = {}     # word -> deque of serials, ascending
+        self._vocab = None      # sorted words for prefix lookups; None = stale
+        self.extend(lines)
+
+    # -----------------------
+    # List behaviour
+    # -----------------------
+    def append(self, line):
+        if len(self._lines) == self.maxlen:
+            self._unindex(self._lines[0])
+        self._lines.append(line)
+        self._wrapped.append(None)
+        for word in set(WORD.findall(line.lower())):
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = deque()
+                self._vocab = None
+            postings.append(self.total)
+        self.total += 1
+
+    def _unindex(self, line):
+        """Drop the oldest line's serial from its words' postings."""
+        for word in set(WORD.findall(line.lower())):
+            postings = self._postings[word]
+            postings.popleft()
+            if not postings:
+                del self._postings[word]
+                self._vocab = None
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def clear(self):
+        self._lines.clear()
+        self._wrapped.clear()
+        self._postings = {}
+        self._vocab = None
+        self.cleared += 1
+        self._read = self.total
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def __reversed__(self):
+        return reversed(self._lines)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._lines)[index]
+        return self._lines[index]
+
+    def __repr__(self):
+        return f"MessageLog({len(self)}/{self.maxlen} lines)"
+
+    # -----------------------
+    # Positions
+    # -----------------------
+    @property
+    def first_serial(self):
+        """Serial number of the oldest line still held."""
+        return self.total - len(self._lines)
+
+    @property
+    def version(self):
+        """Changes whenever a line is added or the log is cleared."""
+        return (self.total, self.cleared)
+
+    def line(self, serial):
+        """The line with this serial number, or None if it was dropped."""
+        i = serial - self.first_serial
+        return self._lines[i] if 0 <= i < len(self._lines) else None
+
+    def unread(self):
+        """Lines added since the last call (dropped lines are skipped)."""
+        start = max(self._read, self.first_serial) - self.first_serial
+        self._read = self.total
+        if start == 0:
+            return list(self._lines)
+        return [self._lines[i] for i in range(start, len(self._lines))]
+
+    # -----------------------
+    # Wrapping
+    # -----------------------
+    def wrapped(self, i, width):
+        """Entry i (deque index, negative allowed) wrapped to width."""
+        if width != self.wrap_width:
+            self.wrap_width = width
+            self._wrapped = deque([None] * len(self._lines), maxlen=self.maxlen)
+        lines = self._wrapped[i]
+        if lines is None:
+            text = self._lines[i]
+            lines = self._wrapped[i] = textwrap.wrap(text, width) if text else [""]
+        return lines
+
+    def page(self, width, rows, offset=0, serials=False):
+        """
+        The `rows` wrapped lines ending `offset` wrapped lines above the
+        newest, oldest first. Only the entries on screen (plus the ones
+        scrolled past) are wrapped. Fewer than `rows` lines means the top of
+        the log was reached. With serials=True, returns (serial, line) pairs.
+        """
+        want = rows + offset
+        chunks = []
+        count = 0
+        for i in range(len(self._lines) - 1, -1, -1):
+            chunk = self.wrapped(i, width)
+            chunks.append((i, chunk))
+            count += len(chunk)
+            if count >= want:
+                break
+        first = self.first_serial
+        if serials:
+            lines = [(first + i, line) for i, chunk in reversed(chunks) for line in chunk]
+        else:
+            lines = [line for _, chunk in reversed(chunks) for line in chunk]
+        end = len(lines) - offset
+        return lines[max(0, end - rows):max(0, end)]
+
+    def offset_of(self, serial, width):
+        """Scroll offset that puts the line with this serial at the bottom."""
+        start = max(serial - self.first_serial + 1, 0)
+        return sum(len(self.wrapped(i, width)) for i in range(start, len(self._lines)))
+
+    # -----------------------
+    # Search
+    # -----------------------
+    def _prefixed(self, prefix):
+        """Serials of lines holding a word that starts with prefix."""
+        vocab = self._vocab
+        if vocab is None:
+            vocab = self._vocab = sorted(self._postings)
+        i = bisect_left(vocab, prefix)
+        words = []
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            words.append(vocab[i])
+            i += 1
+        found = set()
+        for word in words:
+            found.update(self._postings[word])
+        return found
+
+    def search(self, query):
+        """
+        Serials of lines containing every word of query, ascending. Each
+        query word matches as a prefix ("ke" finds "key"), case-insensitive.
+        """
+        words = WORD.findall(query.lower())
+        if not words:
+            return []
+        # Rarest-looking (longest) word first keeps the intersection small
+        words.sort(key=len, reverse=True)
+        found = self._prefixed(words[0])
+        for word in words[1:]:
+            if not found:
+                break
+            found &= self._prefixed(word)
+        return sorted(found)
@@ -0,0 +1,119 @@
+# ui/output.py
+"""
+LocalMUD — Output Pipeline
+
+Turns the CommandResult handle_command() returned (game/result.py) into lines
+for a front-end, and writes them out for the plain-text (screen reader)
+front-end.
+
+    lines, signal = format_result(result)
+
+format_result() is shared by every front-end: curses appends the lines to
+the MessageLog, plain-text mode hands them to a TextOutput, the server sends
+them to the socket. signal is QUIT, CONFIRM_TITLE or None.
+
+TextOutput buffers everything said during one command and writes it with a
+single write() + flush(), instead of a print() per line:
+
+    out = TextOutput(max_lines_per_second=20)
+    out.write(lines)
+    out.flush()
+
+Author: Alex
+
+Dev Notes:
+- Coalescing folds runs of blank lines into one and repeats of the same line
+  into "line (x3)". It only changes what is written, never the message log.
+- The rate cap is a token bucket over lines: a burst of up to one second's
+  worth goes straight out, the rest is paced. 0/None means no cap. A screen
+  reader on a slow remote terminal keeps up better with steady output than
+  with one huge dump.
+"""
+
+import sys
+import time
+
+from game.result import CommandResult, QUIT, CONFIRM_TITLE
+
+
+FAREWELL = "Thanks for playing LocalMUD!"
+
+
+def format_result(result):
+    """
+    A handle_command() result as (lines, signal). Lines end with the blank
+    spacer line every command's output gets.
+    """
+    result = CommandResult.of(result)
+    if result.signal == QUIT:
+        return result.lines + [FAREWELL], QUIT
+    if result.signal == CONFIRM_TITLE:
+        return list(result.lines), CONFIRM_TITLE
+    return result.lines + [""], result.signal
+
+
+def coalesce_lines(lines):
+    """Fold blank-line runs into one and repeated lines into "line (xN)"."""
+    out = []
+    last, count = None, 0
+    for line in lines:
+        if line == last:
+            count += 1
+            continue
+        if count > 1 and last:
+            out[-1] = f"{last} (x{count})"
+        last, count = line, 1
+        out.append(line)
+    if count > 1 and last:
+        out[-1] = f"{last} (x{count})"
+    return out
+
+
+class TextOutput:
+    """Batched, optionally coalesced and rate-capped line output."""
+
+    def __init__(self, stream=None, coalesce=True, max_lines_per_second=None):
+        self.stream = stream or sys.stdout
+        self.coalesce = coalesce
+        self.rate = max_lines_per_second if max_lines_per_second and max_lines_per_second > 0 else None
+        self.pending = []
+        self._tokens = float(self.rate or 0)
+        self._stamp = time.monotonic()
+
+    def write(self, lines):
+        if isinstance(lines, str):
+            lines = [lines]
+        self.pending.extend(lines)
+
+    def _wait_for(self, wanted):
+        """Take up to `wanted` tokens. Paced output goes in quarter-second
+        chunks, so a cap doesn't turn back into one write per line."""
+        capacity = max(1.0, self.rate)     # below 1 line/s, still one line at a time
+        need = min(wanted, max(1, int(self.rate // 4)))
+        while True:
+            now = time.monotonic()
+            self._tokens = min(capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= need:
+                break
+            time.sleep((need - self._tokens) / self.rate)
+        taken = min(wanted, int(self._tokens))
+        self._tokens -= taken
+        return taken
+
+    def flush(self):
+        """Write everything pending. Returns the number of write() calls."""
+        lines, self.pending = self.pending, []
+        if not lines:
+            return 0
+        if self.coalesce:
+            lines = coalesce_lines(lines)
+
+        writes = 0
+        while lines:
+            n = self._wait_for(len(lines)) if self.rate else len(lines)
+            chunk, lines = lines[:n], lines[n:]
+            self.stream.write("".join(f"{line}\n" for line in chunk))
+            self.stream.flush()
+            writes += 1
+        return writes
@@ -0,0 +1,333 @@
+# ui/renderer.py
+"""
+LocalMUD — Incremental Curses Renderer
+
+Draws the game screen as four subwindows and only touches the ones whose
+content changed:
+
+    row 0            top bar      (HP, orb status)
+    rows 2-5         room pane    (location name + description)
+    rows 7..h-3      log pane     (message log, newest at the bottom)
+    row h-2          input line   ("> " + what the player is typing)
+
+Each pane keeps a key describing what it last drew; draw() skips panes whose
+key is unchanged. Changed panes are staged with noutrefresh() and sent in one
+doupdate(), so curses only transmits the cells that actually differ: no
+full-screen clear, no flicker, and a keystroke costs one line.
+
+The log pane asks the MessageLog (ui/message_log.py) for a page of lines;
+the log wraps each entry once per terminal width and keeps the result, so a
+redraw doesn't re-run textwrap over every visible line.
+
+Typical usage (see main.main_loop):
+    renderer = Renderer(stdscr)
+    renderer.draw(game_state, player, rooms, message_log)
+    renderer.draw_input(buffer)
+    key = renderer.getch()
+
+    renderer.page_up() / page_down() / scroll_end()   # scrollback
+    renderer.search(on_idle)                          # "/" search of the log
+
+Author: Alex
+
+Dev Notes:
+- Keys are read from the input window, not stdscr: stdscr.getch() would
+  refresh stdscr over the subwindows.
+- A resize (or KEY_RESIZE) rebuilds the windows and forces one full redraw.
+- Descriptions longer than the room pane are cut with "…"; LOOK still
+  prints the full text into the log.
+- Scrollback is an offset in wrapped lines up from the newest. While scrolled
+  back, lines that arrive grow the offset so the view doesn't move under the
+  reader; a resize or CLEAR drops back to the bottom.
+"""
+
+import curses
+import textwrap
+
+from utils.helpers import normalize_room_id
+
+
+MIN_HEIGHT = 15
+MIN_WIDTH = 40
+ROOM_ROWS = 4           # location line + 3 description lines
+
+
+class Renderer:
+    """Owns the game-screen subwindows and what each one last showed."""
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self.size = None
+        self.too_small = False
+        self._keys = {}            # pane -> key of what it shows
+        self._input_text = None
+        self._input_key = None
+        self._timeout = -1
+        self.message_log = None     # the log last drawn
+        self._log_seen = (0, 0)     # its version then
+        self.scroll = 0             # wrapped lines scrolled back from the newest
+        self.highlight = None       # serial of the search match shown
+        self._build()
+
+    # -----------------------
+    # Layout
+    # -----------------------
+    def _build(self):
+        height, width = self.stdscr.getmaxyx()
+        self.size = (height, width)
+        self._keys.clear()
+        self._input_text = None
+        self._input_key = None
+        self.reset_scroll()         # offsets are in lines of the old width
+
+        self.stdscr.erase()
+        self.stdscr.noutrefresh()
+
+        self.too_small = height < MIN_HEIGHT or width < MIN_WIDTH
+        if self.too_small:
+            self.top = self.room = self.log = None
+            self.input = self.stdscr
+        else:
+            log_top = 2 + ROOM_ROWS + 1
+            self.top   = self.stdscr.derwin(1, width, 0, 0)
+            self.room  = self.stdscr.derwin(ROOM_ROWS, width, 2, 0)
+            self.log   = self.stdscr.derwin(height - 2 - log_top, width, log_top, 0)
+            self.input = self.stdscr.derwin(1, width, height - 2, 0)
+            self.stdscr.timeout(-1)     # menus drawn on stdscr block as before
+
+        # Same keys and the same tick timeout either way, so the world keeps
+        # ticking while the terminal is too small
+        self.input.keypad(True)
+        self.input.timeout(self._timeout)
+
+    def _check_size(self):
+        if self.stdscr.getmaxyx() != self.size:
+            curses.update_lines_cols()
+            self._build()
+
+    def invalidate(self):
+        """Force a full redraw next time (e.g. after another screen was shown)."""
+        self._build()
+
+    # -----------------------
+    # Panes
+    # -----------------------
+    def _changed(self, pane, key):
+        if self._keys.get(pane) == key:
+            return False
+        self._keys[pane] = key
+        return True
+
+    def _draw_top(self, player):
+        hp = player.get("hp", 0)
+        max_hp = player.get("max_hp", hp)
+        orb_status = "Carried" if "Glowing Orb" in player.get("inventory", []) else "Missing"
+        text = f"LocalMUD — HP: {hp}/{max_hp} | Orb: {orb_status}"
+        if not self._changed("top", text):
+            return
+        width = self.size[1]
+        self.top.erase()
+        self.top.addstr(0, 2, text[: width - 4])
+        self.top.noutrefresh()
+
+    def _draw_room(self, game_state, rooms):
+        room_id = normalize_room_id(game_state["current_room"])
+        room = rooms.get(room_id) or {
+            "name": "Unknown",
+            "description": "You seem to be nowhere. This is likely a bug.",
+        }
+        name, desc = room["name"], room.get("description", "")
+        if not self._changed("room", (room_id, name, desc)):
+            return
+
+        width = self.size[1]
+        lines = textwrap.wrap(desc, width - 4)
+        if len(lines) > ROOM_ROWS - 1:
+            lines = lines[: ROOM_ROWS - 1]
+            lines[-1] = lines[-1][: width - 5] + "…"
+
+        self.room.erase()
+        self.room.addstr(0, 2, f"Location: {name}"[: width - 4])
+        for i, line in enumerate(lines):
+            self.room.addstr(1 + i, 2, line)
+        self.room.noutrefresh()
+
+    def _draw_log(self, message_log):
+        rows, width = self.log.getmaxyx()
+        total, cleared = message_log.version
+        seen_total, seen_cleared = self._log_seen
+        self._log_seen = (total, cleared)
+        self.message_log = message_log
+        if cleared != seen_cleared:
+            self.reset_scroll()
+        elif self.scroll and total > seen_total:
+            # Keep a scrolled-back view still while new lines arrive below it
+            new = min(total - seen_total, len(message_log))
+            self.scroll += sum(len(message_log.wrapped(-k, width - 4)) for k in range(1, new + 1))
+
+        if not self._changed("log", (total, cleared, self.scroll, self.highlight, rows)):
+            return
+
+        if self.scroll:
+            rows -= 1
+        visible = message_log.page(width - 4, rows, self.scroll, serials=True)
+        self.log.erase()
+        for i, (serial, line) in enumerate(visible):
+            attr = curses.A_REVERSE if serial == self.highlight else curses.A_NORMAL
+            self.log.addstr(i, 2, line, attr)
+        if self.scroll:
+            self.log.addstr(rows, 2, "-- scrolled back: PgDn for newer, End to return --"[: width - 4], curses.A_DIM)
+        self.log.noutrefresh()
+
+    # -----------------------
+    # Scrollback
+    # -----------------------
+    def _log_rows(self):
+        return self.log.getmaxyx()[0] - 1       # less the "scrolled back" line
+
+    def scroll_to(self, offset):
+        """Scroll the log pane to `offset` wrapped lines above the newest."""
+        if self.too_small or self.message_log is None:
+            return
+        rows, width = self._log_rows(), self.log.getmaxyx()[1] - 4
+        offset = max(0, offset)
+        if offset:
+            # Don't scroll past the oldest line
+            shown = len(self.message_log.page(width, rows, offset))
+            offset = max(0, offset - (rows - shown))
+        self.scroll = offset
+        self._draw_log(self.message_log)
+        self.draw_input(self._input_text or "", update=False)
+        curses.doupdate()
+
+    def page_up(self):
+        self.scroll_to(self.scroll + max(1, self._log_rows() - 1))
+
+    def page_down(self):
+        self.scroll_to(self.scroll - max(1, self._log_rows() - 1))
+
+    def reset_scroll(self):
+        """Back to the newest line on the next draw."""
+        self.scroll, self.highlight = 0, None
+
+    def scroll_end(self):
+        self.reset_scroll()
+        self.scroll_to(0)
+
+    def show_line(self, serial):
+        """Scroll so the log line with this serial is on screen, highlighted."""
+        if self.too_small or self.message_log is None:
+            return
+        width = self.log.getmaxyx()[1] - 4
+        self.highlight = serial
+        offset = self.message_log.offset_of(serial, width)
+        # Scrolled views lose a row to the status line; keep the match above it
+        self.scroll_to(offset - 1 if offset else 0)
+
+    def search(self, on_idle=None):
+        """
+        Incremental "/" search over the message log. Typing narrows the
+        search and jumps to the newest match; Up/Down step to older/newer
+        matches; Enter stays there; Esc returns to the bottom. on_idle is
+        called whenever getch() times out, so the world keeps ticking.
+        """
+        log = self.message_log
+        if log is None or self.too_small:
+            return
+        query, matches, pos = "", [], -1
+
+        def status():
+            if not query:
+                return ""
+            return f"  ({pos + 1}/{len(matches)})" if matches else "  (no match)"
+
+        while True:
+            self.draw_input(query, prompt="/", status=status())
+            key = self.getch()
+            if key == -1:
+                if on_idle is not None:
+                    on_idle()
+                continue
+            if key in (curses.KEY_ENTER, 10, 13):
+                break
+            if key == 27:                                   # Esc
+                self.scroll_end()
+                break
+            if key == curses.KEY_UP and matches:
+                pos = max(0, pos - 1)
+            elif key == curses.KEY_DOWN and matches:
+                pos = min(len(matches) - 1, pos + 1)
+            elif key in (curses.KEY_BACKSPACE, 127, 8):
+                if not query:
+                    self.scroll_end()
+                    break
+                query = query[:-1]
+                matches = log.search(query)
+                pos = len(matches) - 1
+            elif 32 <= key <= 126:
+                query += chr(key)
+                matches = log.search(query)
+                pos = len(matches) - 1
+            else:
+                continue
+            if matches:
+                self.show_line(matches[pos])
+            else:
+                self.scroll_end()
+        self.draw_input("")
+
+    def draw(self, game_state, player, rooms, message_log):
+        """Redraw whichever panes changed, then the input line, in one update."""
+        self._check_size()
+        curses.curs_set(1)
+        if self.too_small:
+            if self._changed("small", True):
+                self.stdscr.erase()
+                self.stdscr.addstr(0, 0, "Window too small. Please resize.")
+                self.stdscr.noutrefresh()
+            curses.doupdate()
+            return
+
+        self._draw_top(player)
+        self._draw_room(game_state, rooms)
+        self._draw_log(message_log)
+        self.draw_input(self._input_text or "", update=False)
+        curses.doupdate()
+
+    def draw_input(self, text, update=True, prompt="> ", status=""):
+        """Show the input line. Only this one window is touched."""
+        if self.too_small:
+            return
+        width = self.size[1]
+        room = width - 5 - len(prompt) - len(status)
+        shown = text[-room:] if room > 0 else ""
+        if (shown, prompt, status) != self._input_key:
+            self._input_key = (shown, prompt, status)
+            self._input_text = shown
+            self.input.erase()
+            self.input.addstr(0, 2, prompt + shown + status)
+        self.input.move(0, 2 + len(prompt) + len(shown))
+        self.input.noutrefresh()
+        if update:
+            curses.doupdate()
+
+    # -----------------------
+    # Input
+    # -----------------------
+    def timeout(self, ms):
+        self._timeout = ms
+        self.input.timeout(ms)
+
+    def getch(self):
+        key = self.input.getch()
+        if key == curses.KEY_RESIZE:
+            self._check_size()
+        return key
+
+
+def get_renderer(stdscr, game_state):
+    """The renderer for this game, created on first use."""
+    renderer = game_state.get("renderer")
+    if renderer is None or renderer.stdscr is not stdscr:
+        renderer = game_state["renderer"] = Renderer(stdscr)
+    return renderer
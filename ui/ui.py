@@ -3,6 +3,7 @@ import textwrap
 import os
 from game.save import save_player  # Already present
 from game.settings import save_settings
+from ui.renderer import get_renderer
 
 
 def wrap_text(text, width):
@@ -71,6 +72,10 @@ def show_title_screen(stdscr, motd, player):
 
 from game.settings import save_settings  # Add this at the top of your file
 
+# Choices for the screen reader output cap, in lines per second (0 = no cap)
+OUTPUT_RATE_CHOICES = (0, 5, 10, 20, 40)
+
+
 def show_settings_menu(stdscr, player):
     selected = 0
     options = [
@@ -78,6 +83,8 @@ def show_settings_menu(stdscr, player):
         "Verbose Travel Output",
         "Screen Reader Mode",
         "Debug Mode",
+        "Coalesce Repeated Lines",
+        "Output Speed Cap",
         "Return to game"
     ]
 
@@ -104,6 +111,15 @@ def show_settings_menu(stdscr, player):
                 status = "[ON]" if player.get("debug_mode") else "[OFF]"
                 stdscr.addstr(4 + i, 6, f"{prefix}{option} {status}")
 
+            elif option == "Coalesce Repeated Lines":
+                status = "[ON]" if player.get("coalesce_output", True) else "[OFF]"
+                stdscr.addstr(4 + i, 6, f"{prefix}{option} {status}")
+
+            elif option == "Output Speed Cap":
+                rate = player.get("output_lines_per_second", 0)
+                status = f"[{rate} lines/s]" if rate else "[OFF]"
+                stdscr.addstr(4 + i, 6, f"{prefix}{option} {status}")
+
             else:
                 stdscr.addstr(4 + i, 6, prefix + option)
 
@@ -130,6 +146,15 @@ def show_settings_menu(stdscr, player):
                 player["debug_mode"] = not player.get("debug_mode", False)
                 save_settings(player)
             elif selected == 4:
+                player["coalesce_output"] = not player.get("coalesce_output", True)
+                save_settings(player)
+            elif selected == 5:
+                # Cycle OFF -> 5 -> 10 -> 20 -> 40 -> OFF (screen reader mode only)
+                rate = player.get("output_lines_per_second", 0)
+                later = [r for r in OUTPUT_RATE_CHOICES if r > rate]
+                player["output_lines_per_second"] = later[0] if later else 0
+                save_settings(player)
+            elif selected == 6:
                 return
 
 
@@ -155,59 +180,6 @@ def show_game_over_menu(stdscr, player):
             return "quit"
 
 def draw_ui(stdscr, game_state, player, rooms, message_log):
-    stdscr.clear()
-    curses.curs_set(1)
-
-    height, width = stdscr.getmaxyx()
-
-    # Minimum size check
-    if height < 15 or width < 40:
-        stdscr.addstr(0, 0, "Window too small. Please resize.")
-        stdscr.refresh()
-        return
-
-    # ─── Top Bar ───
-    title = "LocalMUD"
-
-    # Ensure keys exist and fallback to zero if needed
-    hp = player.get("hp", 0)
-    max_hp = player.get("max_hp", hp)
-
-    orb_status = "Carried" if "Glowing Orb" in player.get("inventory", []) else "Missing"
-    top_bar = f"{title} — HP: {hp}/{max_hp} | Orb: {orb_status}"
-    stdscr.addstr(0, 2, top_bar[: width - 4])
-
-    # ─── Room Info ───
-    from utils.helpers import normalize_room_id  # if placed in helpers.py
-
-    room_id = normalize_room_id(game_state["current_room"])
-    room = rooms.get(room_id, {
-        "name": "Unknown",
-        "description": "You seem to be nowhere. This is likely a bug.",
-        "exits": {}
-    })
-
-    stdscr.addstr(2, 2, f"Location: {room['name']}"[: width - 4])
-
-    # room description (wrapped)
-    desc_y = 3
-    desc_x = 2
-    desc_width = width - 4
-    desc = room["description"]
-    lines_used = draw_wrapped(stdscr, desc_y, desc_x, desc, desc_width)
-
-    # ─── Message Log ───
-    max_lines = height - 7
-    visible = message_log[-max_lines:]
-
-    realvisible = []
-    for line in visible:
-        if(line == ''):
-            realvisible.append(line)
-        else:
-            for multiline in wrap_text(line,width):
-                realvisible.append(multiline)
-    for idx, line in enumerate(realvisible):
-        stdscr.addstr(5 + idx, 2, line[: width - 4])
-
-    stdscr.refresh()
+    """Draw the game screen. Only the panes that changed since the last
+    call are redrawn (see ui/renderer.py)."""
+    get_renderer(stdscr, game_state).draw(game_state, player, rooms, message_log)
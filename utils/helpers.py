@@ -1,10 +1,16 @@
 # utils/helpers.py
 
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
 def normalize_room_id(room_id):
     """
     Converts room identifiers into a consistent format.
     Accepts aliases like 'altar_room' or coordinate tuples like (1, 0, 0, 'chapel').
     Returns a string like 'chapel_1_0_0'.
+    Cached: the parser calls this on every command with the same few ids.
     """
     if isinstance(room_id, tuple) and len(room_id) == 4:
         x, y, z, region = room_id
@@ -16,5 +22,49 @@ def normalize_room_id(room_id):
     return str(room_id)
 
 
+@lru_cache(maxsize=65536)
+def parse_room_coords(room_id):
+    """
+    Split a 'region_x_y[_z]' room id into (region, (x, y[, z])).
+    'chapel_0_-1_0' -> ('chapel', (0, -1, 0)); ids without coordinates
+    return (room_id, ()).
+    """
+    parts = room_id.split("_")
+    coords = []
+    while len(parts) > 1:
+        try:
+            coords.append(int(parts[-1]))
+        except ValueError:
+            break
+        parts.pop()
+    return "_".join(parts), tuple(reversed(coords))
+
+
+def write_atomic(path, data):
+    """
+    Write bytes to path so readers only ever see the old or the new file:
+    write a temp file beside it, fsync, rename over the target, then fsync
+    the directory so the rename itself survives a crash.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return          # e.g. Windows can't open directories
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
 # Future utility functions can go here
 # e.g. format_item_name(), wrap_text(), etc.
@@ -87,15 +87,25 @@ def log_room_error(current_room, attempted_coords, attempted_direction, rooms):
     if not found:
         print(f"Room not found: {attempted_coords} from {current_room} going {attempted_direction}")
 
-def verify_room_links(rooms):
+def verify_room_links(rooms, index=None):
+    """Log every exit that points at a missing room.
+    Reads the incremental link validator. The first call for a rooms mapping
+    attaches the validator to it, seeded from the world index's dangling-exit
+    table when one is given, otherwise with a one-off full check."""
+    from world.link_validator import LINK_VALIDATOR
+
+    if LINK_VALIDATOR.source is not rooms:
+        if index is not None:
+            LINK_VALIDATOR.reset_from(rooms, index.broken_links())
+        else:
+            LINK_VALIDATOR.reset(rooms)
+
     broken = []
-    for room_key, room_data in rooms.items():
-        for direction, target in room_data.get("exits", {}).items():
-            if target not in rooms:
-                broken.append(
-                    f"Broken exit from {room_data['name']} ({room_key}) going "
-                    f"{direction} to {target}"
-                )
+    for room_key, direction, target in LINK_VALIDATOR.broken_links():
+        broken.append(
+            f"Broken exit from {rooms[room_key]['name']} ({room_key}) going "
+            f"{direction} to {target}"
+        )
     if broken:
         logging.error("=== Room Link Diagnostics ===")
         for line in broken:
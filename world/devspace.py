@@ -48,7 +48,8 @@ def build_region(region_id="devspace"):
         {
             "type": "monster",
             "key": "kobold_bx",
-            "initial_count": 1
+            "initial_count": 1,
+            "respawn_seconds": 60
         }
         ]
 
@@ -0,0 +1,153 @@
+# world/link_validator.py
+"""
+LocalMUD — Incremental Link Validator
+
+Keeps the set of dangling exits (exits whose target room doesn't exist) up to
+date without rescanning the world. The table is a reverse index:
+
+    dangling["chapel_9_9_9"] == {("chapel_0_0_0", "north")}
+
+so asking "is anything broken?", "what points at X?" or "is X now fixed?" is a
+dict lookup. Only rooms that were touched get re-checked:
+- set_exit() re-checks the one room it changed,
+- RegionManager re-checks a region's rooms when it loads and drops them when
+  it evicts,
+- a full check only happens once, when a new rooms mapping is attached.
+
+Typical usage:
+    LINK_VALIDATOR.reset(rooms)                  # full check, once per world
+    LINK_VALIDATOR.check_rooms(["chapel_0_0_0"]) # after editing that room
+    list(LINK_VALIDATOR.broken_links())
+
+Author: Alex
+
+Dev Notes:
+- exists(target) may return None for "can't tell yet" (a room in a region
+  that isn't loaded). Those links wait in `pending` and are settled when the
+  region loads, via resolve_pending().
+- Deleting a room from a plain dict isn't noticed; rooms pointing at it stay
+  "valid" until they are re-checked.
+"""
+
+
+class LinkValidator:
+    """Reverse index of dangling exits, maintained per touched room."""
+
+    def __init__(self):
+        self.source = None
+        self.exists = None
+        self.dangling = {}      # missing target -> {(room_id, direction)}
+        self.pending = {}       # target in an unloaded region -> {(room_id, direction)}
+        self._tracked = {}      # room_id -> {direction: target}, only rooms with entries above
+
+    def __len__(self):
+        return sum(len(links) for links in self.dangling.values())
+
+    # -----------------------
+    # Setup
+    # -----------------------
+    def clear(self, rooms=None, exists=None):
+        """Forget everything and attach to `rooms` without scanning it."""
+        self.source = rooms
+        self.exists = exists or (rooms.__contains__ if rooms is not None else None)
+        self.dangling = {}
+        self.pending = {}
+        self._tracked = {}
+
+    def reset(self, rooms, exists=None):
+        """Attach to `rooms` and check every room once."""
+        self.clear(rooms, exists)
+        self.check_rooms(list(rooms))
+        return self
+
+    def reset_from(self, rooms, broken, exists=None):
+        """Attach to `rooms`, seeding from known (room_id, direction, target)
+        broken links (e.g. WorldIndex.broken_links()) instead of scanning."""
+        self.clear(rooms, exists)
+        for room_id, direction, target in broken:
+            self._tracked.setdefault(room_id, {})[direction] = target
+            self.dangling.setdefault(target, set()).add((room_id, direction))
+        return self
+
+    # -----------------------
+    # Incremental updates
+    # -----------------------
+    def _drop(self, room_id):
+        for direction, target in self._tracked.pop(room_id, {}).items():
+            for table in (self.dangling, self.pending):
+                links = table.get(target)
+                if links is not None:
+                    links.discard((room_id, direction))
+                    if not links:
+                        del table[target]
+
+    def check_rooms(self, room_ids, rooms=None):
+        """
+        Re-check the exits of room_ids. `rooms` is where to read them from
+        (defaults to the attached source; RegionManager passes the region dict
+        so the check never triggers a load).
+        """
+        rooms = self.source if rooms is None else rooms
+        exists = self.exists
+        for room_id in room_ids:
+            self._drop(room_id)
+
+            # Links that were waiting on this room are now good
+            self.dangling.pop(room_id, None)
+            self.pending.pop(room_id, None)
+
+            room = rooms.get(room_id)
+            if room is None:
+                continue
+            tracked = {}
+            for direction, target in (room.get("exits") or {}).items():
+                state = exists(target)
+                if state:
+                    continue
+                table = self.pending if state is None else self.dangling
+                table.setdefault(target, set()).add((room_id, direction))
+                tracked[direction] = target
+            if tracked:
+                self._tracked[room_id] = tracked
+
+    def forget_rooms(self, room_ids):
+        """Drop the entries for rooms leaving memory (region eviction)."""
+        for room_id in room_ids:
+            self._drop(room_id)
+
+    def resolve_pending(self, targets):
+        """Settle pending links to `targets` now that exists() can answer."""
+        for target in targets:
+            links = self.pending.pop(target, None)
+            if not links:
+                continue
+            state = self.exists(target)
+            if state is None:
+                self.pending[target] = links
+            elif not state:
+                self.dangling.setdefault(target, set()).update(links)
+
+    def touch(self, rooms, room_id):
+        """Hook for exit edits: re-check room_id if `rooms` is the attached world."""
+        if rooms is self.source:
+            self.check_rooms([room_id])
+
+    # -----------------------
+    # Queries
+    # -----------------------
+    def broken_links(self):
+        """Yield (room_id, direction, target) for every dangling exit, sorted."""
+        for target in sorted(self.dangling):
+            for room_id, direction in sorted(self.dangling[target]):
+                yield room_id, direction, target
+
+    def links_to(self, target):
+        """(room_id, direction) pairs whose exit points at the missing `target`."""
+        return set(self.dangling.get(target, ()))
+
+    def is_dangling(self, target):
+        return target in self.dangling
+
+
+# Runtime registry: one validator for the live world
+LINK_VALIDATOR = LinkValidator()
@@ -4,35 +4,89 @@ from world.chapel import build_region as build_chapel
 from world.devspace import build_region as build_devspace
 from utils.log_manager import verify_room_links
 from game import spawn
+from game.entities import compact_rooms
+from world import world_index
+from world.spatial_index import SPATIAL_INDEX
 
 
-def load_overworld():
-    overworld_rooms = {}
+# region_id -> build_region function, in load order
+REGION_BUILDERS = {
+    "fellmore_cliffs":  build_fellmore,
+    "east_mill_plains": build_east_mill,
+    "chapel":           build_chapel,
+    "devspace":         build_devspace,
+}
+
+# Links between regions: (room_id, direction, target_room_id)
+TRANSITIONS = [
+    ("chapel_0_-2_0",       "south", "fellmore_cliffs_1_1"),
+    ("fellmore_cliffs_1_1", "north", "chapel_0_-2_0"),
+]
+
 
-    # Load regions
-    fellmore_rooms = build_fellmore(region_id="fellmore_cliffs")
-    east_mill_rooms = build_east_mill(region_id="east_mill_plains")
-    chapel_rooms = build_chapel(region_id="chapel")
-    devspace_rooms = build_devspace(region_id="devspace")
+def build_overworld():
+    """Build every region and wire up the transitions.
+    Rooms come back as compact Room objects (see game/entities.py).
+    Links are validated by load_overworld once the world index exists."""
+    overworld_rooms = {}
 
-    # Aggregate
-    overworld_rooms.update(fellmore_rooms)
-    overworld_rooms.update(east_mill_rooms)
-    overworld_rooms.update(chapel_rooms)
-    overworld_rooms.update(devspace_rooms)
+    # Load and aggregate regions
+    for region_id, build_region in REGION_BUILDERS.items():
+        overworld_rooms.update(build_region(region_id=region_id))
 
-    # Add transitions
+    # Add transitions. These are part of the built world, not runtime edits,
+    # so they go straight into the exits (set_exit would journal them and the
+    # saved copy would then mask later changes to TRANSITIONS).
     try:
-        overworld_rooms["chapel_0_-2_0"]["exits"]["south"] = "fellmore_cliffs_1_1"
-        overworld_rooms["fellmore_cliffs_1_1"]["exits"]["north"] = "chapel_0_-2_0"
+        for room_id, direction, target in TRANSITIONS:
+            overworld_rooms[room_id].setdefault("exits", {})[direction] = target
     except KeyError as e:
         import logging
         logging.error(f"[ERROR] Failed to link overworld rooms: {e}")
+    world_index.WORLD_INDEX.invalidate()
+
+    return compact_rooms(overworld_rooms)
+
+
+def load_overworld(use_snapshot=True, lazy=False, max_rooms=None):
+    """
+    Return the overworld rooms with monsters spawned.
+    Uses the compiled snapshot when the region modules haven't changed,
+    otherwise rebuilds and refreshes the snapshot.
+
+    With lazy=True, returns a RegionManager that builds each region the first
+    time one of its rooms is needed and evicts idle regions past max_rooms.
+    """
+    if lazy:
+        from world.region_manager import RegionManager, DEFAULT_MAX_ROOMS
+        spawn.clear_instances(tables=True)
+        return RegionManager(
+            REGION_BUILDERS, TRANSITIONS,
+            max_rooms=max_rooms or DEFAULT_MAX_ROOMS
+        )
+
+    overworld_rooms = None
+    if use_snapshot:
+        from world import snapshot
+        overworld_rooms = snapshot.load_snapshot()
+        if overworld_rooms is None:
+            overworld_rooms = build_overworld()
+            snapshot.write_snapshot(overworld_rooms)
+    else:
+        overworld_rooms = build_overworld()
+
+    # Intern room ids and build the exit table for the parser
+    index = world_index.build_index(overworld_rooms)
+
+    # Seed the link validator from the index's dangling exits and log them
+    verify_room_links(overworld_rooms, index)
 
-    # Validate and log broken links
-    verify_room_links(overworld_rooms)
+    # Grid hash for radius / box / nearest-terrain queries
+    SPATIAL_INDEX.clear()
+    SPATIAL_INDEX.add_rooms(overworld_rooms)
 
-    # Add Monster Spawn info
+    # Add Monster Spawn info (runtime state, never part of the snapshot)
+    spawn.clear_instances(tables=True)
     spawn.init_region_spawns(overworld_rooms)
 
     return overworld_rooms
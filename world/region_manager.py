@@ -0,0 +1,261 @@
+# world/region_manager.py
+"""
+LocalMUD — Lazy Region Manager
+
+A room mapping that only materializes a region the first time something asks
+for one of its rooms (a player entering, a GO exit being checked, a teleport).
+Regions that go unused are evicted least-recently-used first once the loaded
+room count passes the budget. Their changed state is written to disk and
+re-applied the next time the region loads.
+
+RegionManager behaves like the plain rooms dict, so handle_command and draw_ui
+don't need to know which one they were given:
+
+    rooms = load_overworld(lazy=True)
+    room  = rooms["chapel_0_0_0"]      # loads the chapel region on demand
+
+Author: Alex
+
+Dev Notes:
+- Region membership comes from the room id prefix ("chapel_0_0_0" -> "chapel").
+  Longest prefix wins, so "east_mill_plains" never matches as "east".
+- Iterating or len() only covers loaded regions. Use region_ids() to see
+  everything that could be loaded.
+- Saved region state is wiped when a manager is created with fresh=True, so a
+  new game never inherits the previous session's dropped items.
+- on_first_load callbacks run once per region, the same time its initial
+  spawns do, so world events can be attached lazily. (Respawn timers need
+  no callback: init_region_spawns registers the region's spawn tables.)
+- Dirty state is found by diffing MUTABLE_KEYS against a pristine build at
+  eviction time, so it catches every change no matter who made it.
+- Link validation follows the loaded set: a region's rooms are checked when
+  it loads, exits into unloaded regions wait as "pending" until that region
+  loads, and an evicted region's entries are dropped. The spatial index
+  (world/spatial_index.py) follows the loaded set the same way.
+"""
+
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from game import spawn
+from game.entities import compact_rooms
+from world.world_index import WORLD_INDEX
+from world.link_validator import LINK_VALIDATOR
+from world.spatial_index import SPATIAL_INDEX
+from utils.helpers import write_atomic
+
+
+DEFAULT_MAX_ROOMS = 50_000
+REGION_STATE_DIR = os.path.join("save", "regions")
+
+# Room keys that change during play and must survive eviction
+MUTABLE_KEYS = ("items", "visited", "flags", "exits")
+
+
+class RegionManager(MutableMapping):
+    """Room-id mapping that loads regions on demand and evicts them LRU."""
+
+    def __init__(self, builders, transitions=(), max_rooms=DEFAULT_MAX_ROOMS,
+                 state_dir=REGION_STATE_DIR, fresh=True):
+        self.builders = dict(builders)
+        self.max_rooms = max_rooms
+        self.state_dir = state_dir
+
+        # Longest prefix first so nested names resolve correctly
+        self._prefixes = sorted(self.builders, key=len, reverse=True)
+
+        # source room's region -> [(room_id, direction, target)]
+        self._transitions = {}
+        for room_id, direction, target in transitions:
+            region_id = self.region_of(room_id)
+            self._transitions.setdefault(region_id, []).append((room_id, direction, target))
+
+        self._loaded = OrderedDict()    # region_id -> rooms dict, LRU order
+        self._room_count = 0
+        self._spawned = set()           # regions whose initial spawns already ran
+        self.on_first_load = []         # callbacks: fn(region_id, rooms)
+
+        if fresh:
+            self.clear_saved_state()
+
+        LINK_VALIDATOR.clear(self, exists=self._link_state)
+        SPATIAL_INDEX.clear()
+
+    # -----------------------
+    # Region bookkeeping
+    # -----------------------
+    def region_of(self, room_id):
+        """Return the region id a room id belongs to, or None."""
+        if not isinstance(room_id, str):
+            return None
+        for prefix in self._prefixes:
+            if room_id.startswith(prefix) and room_id[len(prefix):len(prefix) + 1] == "_":
+                return prefix
+        return None
+
+    def clear_saved_state(self):
+        for region_id in self.builders:
+            try:
+                os.remove(self._state_path(region_id))
+            except FileNotFoundError:
+                pass
+
+    def region_ids(self):
+        return list(self.builders)
+
+    def loaded_regions(self):
+        return list(self._loaded)
+
+    def _region_rooms(self, room_id):
+        """Return the (loaded) rooms dict for room_id's region, or None."""
+        region_id = self.region_of(room_id)
+        if region_id is None:
+            return None
+        rooms = self._loaded.get(region_id)
+        if rooms is None:
+            rooms = self.load_region(region_id)
+        else:
+            self._loaded.move_to_end(region_id)
+        return rooms
+
+    def _link_state(self, room_id):
+        """True/False if room_id exists, None if its region isn't loaded yet.
+        Never triggers a load."""
+        region_id = self.region_of(room_id)
+        if region_id is None:
+            return False
+        rooms = self._loaded.get(region_id)
+        if rooms is None:
+            return None
+        return room_id in rooms
+
+    def _build(self, region_id):
+        rooms = self.builders[region_id](region_id=region_id)
+        for room_id, direction, target in self._transitions.get(region_id, []):
+            if room_id in rooms:
+                rooms[room_id].setdefault("exits", {})[direction] = target
+        return compact_rooms(rooms)
+
+    def _state_path(self, region_id):
+        return os.path.join(self.state_dir, f"{region_id}.pkl")
+
+    def load_region(self, region_id):
+        """Build a region, re-apply its saved state and make it most recent."""
+        if region_id in self._loaded:
+            self._loaded.move_to_end(region_id)
+            return self._loaded[region_id]
+
+        rooms = self._build(region_id)
+
+        try:
+            with open(self._state_path(region_id), "rb") as f:
+                delta = pickle.load(f)
+            for room_id, changes in delta.items():
+                if room_id in rooms:
+                    rooms[room_id].update(changes)
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logging.error(f"[ERROR] Could not restore region state for {region_id}: {e}")
+
+        self._loaded[region_id] = rooms
+        self._room_count += len(rooms)
+        WORLD_INDEX.invalidate()
+
+        if LINK_VALIDATOR.source is self:
+            LINK_VALIDATOR.check_rooms(list(rooms), rooms)
+            LINK_VALIDATOR.resolve_pending(
+                [t for t in LINK_VALIDATOR.pending if self.region_of(t) == region_id]
+            )
+        SPATIAL_INDEX.add_rooms(rooms)
+
+        if region_id not in self._spawned:
+            self._spawned.add(region_id)
+            spawn.init_region_spawns(rooms)
+            for callback in self.on_first_load:
+                callback(region_id, rooms)
+
+        self._enforce_budget(keep=region_id)
+        return rooms
+
+    def evict_region(self, region_id):
+        """Write a region's changed rooms to disk and drop it from memory."""
+        rooms = self._loaded.pop(region_id, None)
+        if rooms is None:
+            return
+        self._room_count -= len(rooms)
+        WORLD_INDEX.invalidate()
+        if LINK_VALIDATOR.source is self:
+            LINK_VALIDATOR.forget_rooms(list(rooms))
+        SPATIAL_INDEX.remove_rooms(list(rooms))
+
+        pristine = self._build(region_id)
+        delta = {}
+        for room_id, room in rooms.items():
+            base = pristine.get(room_id, {})
+            changes = {k: room[k] for k in MUTABLE_KEYS if k in room and room[k] != base.get(k)}
+            if changes:
+                delta[room_id] = changes
+
+        path = self._state_path(region_id)
+        try:
+            if delta:
+                write_atomic(path, pickle.dumps(delta, protocol=pickle.HIGHEST_PROTOCOL))
+            elif os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logging.error(f"[ERROR] Could not save region state for {region_id}: {e}")
+
+    def _enforce_budget(self, keep=None):
+        while self._room_count > self.max_rooms and len(self._loaded) > 1:
+            oldest = next(iter(self._loaded))
+            if oldest == keep:
+                self._loaded.move_to_end(oldest)
+                oldest = next(iter(self._loaded))
+            self.evict_region(oldest)
+
+    def flush(self):
+        """Evict every loaded region, saving its state (e.g. on shutdown)."""
+        for region_id in list(self._loaded):
+            self.evict_region(region_id)
+
+    # -----------------------
+    # Mapping interface
+    # -----------------------
+    def __getitem__(self, room_id):
+        rooms = self._region_rooms(room_id)
+        if rooms is None:
+            raise KeyError(room_id)
+        return rooms[room_id]
+
+    def __contains__(self, room_id):
+        rooms = self._region_rooms(room_id)
+        return rooms is not None and room_id in rooms
+
+    def __setitem__(self, room_id, room):
+        rooms = self._region_rooms(room_id)
+        if rooms is None:
+            raise KeyError(f"No region for room id '{room_id}'")
+        if room_id not in rooms:
+            self._room_count += 1
+        rooms[room_id] = room
+        LINK_VALIDATOR.touch(self, room_id)
+
+    def __delitem__(self, room_id):
+        rooms = self._region_rooms(room_id)
+        if rooms is None or room_id not in rooms:
+            raise KeyError(room_id)
+        del rooms[room_id]
+        self._room_count -= 1
+        if LINK_VALIDATOR.source is self:
+            LINK_VALIDATOR.forget_rooms([room_id])
+
+    def __iter__(self):
+        for rooms in list(self._loaded.values()):
+            yield from rooms
+
+    def __len__(self):
+        return self._room_count
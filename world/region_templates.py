@@ -1,7 +1,38 @@
 #region_templates.py
-import random
+"""
+LocalMUD — Procedural Region Templates
 
-REGIONS = {
+Region definitions (bounds, terrain, flavor) and the procedural generator that
+turns them into room templates.
+
+The grid is built in bulk with NumPy: one index array for the whole region,
+shifted copies of it for each direction's neighbour, and one batched seeded
+draw each for terrain and flavor. Only the final step, turning arrays into
+room dicts, is a Python loop. Output is deterministic for a given seed.
+
+Typical usage:
+    rooms = generate_room_templates("fellmore_cliffs", seed=7)
+    grid  = generate_grid("big_plains", width=1000, height=1000, seed=1)
+
+Region keys:
+- bounds  : x_min/x_max/y_min/y_max, inclusive
+- terrain : list of terrain names
+- flavor  : list of description lines
+- mask    : optional list of strings, one per row from y_max down to y_min;
+            "." is a room, anything else is solid
+- seed    : optional default seed
+"""
+
+import gc
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Only procedural generation needs NumPy
+    np = None
+
+
+REGION_TEMPLATES = {
     "fellmore_cliffs": {
         "bounds": {"x_min": 0, "x_max": 4, "y_min": 0, "y_max": 4},
         "terrain": ["rocky ledge", "crumbling path", "windy bluff"],
@@ -22,40 +53,146 @@ REGIONS = {
     }
 }
 
-def generate_room_templates(region_name: str) -> Dict[str, dict]:
-    region = REGIONS.get(region_name)
-    if not region:
+# Older name, kept for callers that still use it
+REGIONS = REGION_TEMPLATES
+
+
+class RegionGrid:
+    """
+    Array form of a generated region. Index i describes one room:
+    xs[i], ys[i], terrain[terrain_idx[i]], flavor[flavor_idx[i]], and
+    exits[direction][i], the index of the neighbour or -1.
+    """
+
+    def __init__(self, region_name, xs, ys, terrain_idx, flavor_idx, exits, terrain, flavor):
+        self.region_name = region_name
+        self.xs          = xs
+        self.ys          = ys
+        self.terrain_idx = terrain_idx
+        self.flavor_idx  = flavor_idx
+        self.exits       = exits
+        self.terrain     = terrain
+        self.flavor      = flavor
+
+    def __len__(self):
+        return len(self.xs)
+
+    def room_ids(self):
+        name = self.region_name
+        return [f"{name}_{x}_{y}" for x, y in zip(self.xs.tolist(), self.ys.tolist())]
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Procedural regions need NumPy. Install it with: pip install numpy")
+
+
+def _mask_array(mask, width, height):
+    """Turn a list of row strings (top row = y_max) into a (width, height) bool array."""
+    if mask is None:
+        return np.ones((width, height), dtype=bool)
+    if not isinstance(mask, (list, tuple)):
+        grid = np.asarray(mask, dtype=bool)
+    else:
+        if len(mask) != height or any(len(row) != width for row in mask):
+            raise ValueError(f"Mask must be {height} rows of {width} characters.")
+        rows = np.array([list(row) for row in mask]) == "."
+        grid = rows[::-1].T     # rows run top-down; we index [x, y] bottom-up
+    if grid.shape != (width, height):
+        raise ValueError(f"Mask shape {grid.shape} does not match region {(width, height)}.")
+    return grid
+
+
+def generate_grid(region_name: str, width: Optional[int] = None, height: Optional[int] = None,
+                  seed: Optional[int] = None, mask=None) -> RegionGrid:
+    """
+    Generate the array form of a rectangular (optionally masked) region.
+    width/height override the region's bounds; unknown regions need both.
+    """
+    _require_numpy()
+    region = REGION_TEMPLATES.get(region_name, {})
+    if not region and (width is None or height is None):
         raise ValueError(f"Unknown region: {region_name}")
 
-    x_min, x_max = region["bounds"]["x_min"], region["bounds"]["x_max"]
-    y_min, y_max = region["bounds"]["y_min"], region["bounds"]["y_max"]
-    terrain = region["terrain"]
-    flavor = region["flavor"]
+    bounds = region.get("bounds", {})
+    x_min = bounds.get("x_min", 0)
+    y_min = bounds.get("y_min", 0)
+    if width is None:
+        width = bounds["x_max"] - x_min + 1
+    if height is None:
+        height = bounds["y_max"] - y_min + 1
+    terrain = region.get("terrain", ["plains"])
+    flavor  = region.get("flavor", ["An unremarkable stretch of land."])
+    if seed is None:
+        seed = region.get("seed")
+    if mask is None:
+        mask = region.get("mask")
+
+    present = _mask_array(mask, width, height)
+
+    # Dense index per cell, -1 where there is no room. Row-major over [x, y]
+    # keeps the old x-outer, y-inner room order.
+    index = np.full((width, height), -1, dtype=np.int64)
+    count = int(present.sum())
+    index[present] = np.arange(count, dtype=np.int64)
+
+    def shifted(dx, dy):
+        out = np.full((width, height), -1, dtype=np.int64)
+        src_x = slice(max(dx, 0), width + min(dx, 0))
+        src_y = slice(max(dy, 0), height + min(dy, 0))
+        dst_x = slice(max(-dx, 0), width + min(-dx, 0))
+        dst_y = slice(max(-dy, 0), height + min(-dy, 0))
+        out[dst_x, dst_y] = index[src_x, src_y]
+        return out[present]
+
+    exits = {
+        "north": shifted(0, 1),
+        "south": shifted(0, -1),
+        "east":  shifted(1, 0),
+        "west":  shifted(-1, 0),
+    }
+
+    gx, gy = np.nonzero(present)
+    rng = np.random.default_rng(seed)
+    terrain_idx = rng.integers(0, len(terrain), size=count)
+    flavor_idx  = rng.integers(0, len(flavor), size=count)
 
-    rooms = {}
+    return RegionGrid(region_name, gx + x_min, gy + y_min, terrain_idx, flavor_idx,
+                      exits, terrain, flavor)
 
-    for x in range(x_min, x_max + 1):
-        for y in range(y_min, y_max + 1):
-            room_id = f"{region_name}_{x}_{y}"
-            room = {
+
+def generate_room_templates(region_name: str, seed: Optional[int] = None, mask=None,
+                            width: Optional[int] = None, height: Optional[int] = None) -> Dict[str, dict]:
+    """Generate room template dicts (room_id -> room) for a procedural region."""
+    grid = generate_grid(region_name, width=width, height=height, seed=seed, mask=mask)
+
+    # Millions of small containers would trigger the cyclic GC over and over;
+    # none of them can form cycles, so pause it while we build.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        ids = grid.room_ids()
+        terrain = [grid.terrain[i] for i in grid.terrain_idx.tolist()]
+        flavor  = [grid.flavor[i] for i in grid.flavor_idx.tolist()]
+
+        # One column of (direction, target_id) pairs per direction, None where blocked
+        columns = [
+            [(direction, ids[t]) if t >= 0 else None for t in targets.tolist()]
+            for direction, targets in grid.exits.items()
+        ]
+        exits = [dict(filter(None, row)) for row in zip(*columns)]
+
+        return {
+            room_id: {
                 "name": room_id,
-                "description": random.choice(flavor),
-                "terrain": random.choice(terrain),
-                "exits": {},
+                "description": desc,
+                "terrain": terr,
+                "exits": room_exits,
                 "items": [],
                 "npcs": []
             }
-
-            # Add exits based on adjacency
-            if y < y_max:
-                room["exits"]["north"] = f"{region_name}_{x}_{y + 1}"
-            if y > y_min:
-                room["exits"]["south"] = f"{region_name}_{x}_{y - 1}"
-            if x < x_max:
-                room["exits"]["east"] = f"{region_name}_{x + 1}_{y}"
-            if x > x_min:
-                room["exits"]["west"] = f"{region_name}_{x - 1}_{y}"
-
-            rooms[room_id] = room
-
-    return rooms
+            for room_id, desc, terr, room_exits in zip(ids, flavor, terrain, exits)
+        }
+    finally:
+        if gc_was_enabled:
+            gc.enable()
@@ -19,11 +19,17 @@ OPPOSITE_DIRECTIONS = {
     "southwest": "northeast",
 }
 
-def build_region(region_name: str, bidirectional: bool = True) -> Dict[str, dict]:
+def build_region(
+    region_name: str,
+    bidirectional: bool = True,
+    seed: Optional[int] = None,
+    resolve_exits: bool = False,
+) -> Dict[str, dict]:
     """
     Create all rooms for `region_name` and wire up exits.
     Returns a dict of room_id -> room_dict.
     Uses static templates if available, otherwise falls back to procedural generation.
+    Exits stay as room ids (what the parser expects) unless resolve_exits is set.
     """
     tmpl = region_templates.REGION_TEMPLATES.get(region_name)
     if not tmpl:
@@ -33,15 +39,16 @@ def build_region(region_name: str, bidirectional: bool = True) -> Dict[str, dict
     if "rooms" in tmpl:
         room_templates = tmpl["rooms"]
     else:
-        room_templates = region_templates.generate_room_templates(region_name)
+        room_templates = region_templates.generate_room_templates(region_name, seed=seed)
 
     # Step 2: Instantiate room dicts
     rooms: Dict[str, dict] = {}
     for room_id, room_t in room_templates.items():
         rooms[room_id] = build_room(room_id, room_t)
 
-    # Step 3: Resolve exits to actual room dicts (or None)
-    connect_rooms(rooms, bidirectional=bidirectional)
+    # Step 3: Optionally resolve exits to actual room dicts (or None)
+    if resolve_exits:
+        connect_rooms(rooms, bidirectional=bidirectional)
 
     return rooms
 
@@ -54,6 +61,7 @@ def build_room(room_id: str, tmpl: dict) -> dict:
         "id": room_id,
         "name": tmpl.get("name", room_id),
         "description": tmpl.get("description", ""),
+        "terrain": tmpl.get("terrain"),
         "exits": dict(tmpl.get("exits", {})),  # direction -> target room_id
         "items": list(tmpl.get("items", [])),
         "npcs": list(tmpl.get("npcs", [])),
@@ -99,7 +107,7 @@ if __name__ == "__main__":
     # Simple test/demo loader
     import pprint
 
-    region = build_region("forest")
+    region = build_region("fellmore_cliffs", seed=1)
     pprint.pprint(region)
 
 """
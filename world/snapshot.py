@@ -0,0 +1,125 @@
+# world/snapshot.py
+"""
+LocalMUD — Compiled World Snapshot
+
+Compiles every region into one versioned binary file so startup doesn't have to
+call each build_region, rebuild room ids and re-verify links on every launch.
+
+File layout (all integers big-endian):
+    MAGIC            8 bytes   b"LMUDSNAP"
+    FORMAT_VERSION   2 bytes
+    source hash     32 bytes   sha256 of the region and entity module sources
+    payload hash    32 bytes   sha256 of the pickled payload
+    payload length   8 bytes
+    payload          pickled rooms dict
+
+The loader memory-maps the file, checks the header against the current region
+sources and the payload against its hash, and returns None when anything is
+stale or damaged so the caller rebuilds.
+
+Typical usage:
+    python -m world.snapshot            # (re)build data/world.snapshot
+
+Author: Alex
+"""
+
+import hashlib
+import importlib
+import inspect
+import logging
+import mmap
+import os
+import pickle
+import struct
+
+from utils.helpers import write_atomic
+
+MAGIC = b"LMUDSNAP"
+FORMAT_VERSION = 2
+SNAPSHOT_PATH = os.path.join("data", "world.snapshot")
+
+HEADER = struct.Struct(">8sH32s32sQ")
+
+
+# Modules that shape the pickled rooms besides the region builders: the
+# entity classes the payload is made of, and the room/grid builders
+LAYOUT_MODULES = ("game.entities", "world.room_builder", "world.region_templates")
+
+
+def source_hash():
+    """Hash the sources that determine the world: every region module, the
+    overworld module that holds the transitions, and LAYOUT_MODULES."""
+    from world import overworld
+
+    paths = {inspect.getsourcefile(overworld)}
+    paths.update(inspect.getsourcefile(build) for build in overworld.REGION_BUILDERS.values())
+    paths.update(inspect.getsourcefile(importlib.import_module(name)) for name in LAYOUT_MODULES)
+
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode())
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def write_snapshot(rooms, path=SNAPSHOT_PATH):
+    """Pickle the rooms and write them atomically with a versioned header."""
+    payload = pickle.dumps(rooms, protocol=pickle.HIGHEST_PROTOCOL)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, source_hash(),
+        hashlib.sha256(payload).digest(), len(payload)
+    )
+
+    try:
+        write_atomic(path, header + payload)
+    except OSError as e:
+        logging.error(f"[ERROR] Failed to write world snapshot: {e}")
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """
+    Return the rooms dict from the snapshot, or None if it is missing, built
+    from different region sources, or fails its payload hash.
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < HEADER.size:
+                return None
+            magic, version, src_hash, payload_hash, length = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            if src_hash != source_hash():
+                return None
+
+            payload = memoryview(mm)[HEADER.size:HEADER.size + length]
+            try:
+                if len(payload) != length or hashlib.sha256(payload).digest() != payload_hash:
+                    logging.error("[ERROR] World snapshot failed its hash check; rebuilding.")
+                    return None
+                return pickle.loads(payload)
+            except Exception as e:
+                # Classes moved or changed shape since it was written: stale
+                logging.error(f"[ERROR] World snapshot could not be loaded ({e!r}); rebuilding.")
+                return None
+            finally:
+                payload.release()
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+if __name__ == "__main__":
+    import time
+    from world.overworld import build_overworld
+
+    start = time.perf_counter()
+    rooms = build_overworld()
+    write_snapshot(rooms)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = load_snapshot()
+    elapsed = time.perf_counter() - start
+
+    print(f"Compiled {len(rooms)} rooms into {SNAPSHOT_PATH} in {built * 1000:.1f} ms.")
+    print(f"Snapshot loads in {elapsed * 1000:.2f} ms ({'ok' if loaded == rooms else 'MISMATCH'}).")
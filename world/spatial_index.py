@@ -0,0 +1,228 @@
+# world/spatial_index.py
+"""
+LocalMUD — Spatial Room Index
+
+Room ids carry their coordinates ("chapel_0_-1_0", "fellmore_cliffs_1_1").
+This module files every room into a per-region grid hash, buckets of
+CELL_SIZE x CELL_SIZE x CELL_SIZE, so spatial questions only look at the few
+buckets that can answer them instead of every room in the world:
+
+    SPATIAL_INDEX.in_box("fellmore_cliffs", (0, 0), (2, 2))
+    SPATIAL_INDEX.within_radius("chapel", (0, 0, 0), 1.5)
+    SPATIAL_INDEX.nearest("fellmore_cliffs", (1, 1), terrain="windy bluff")
+    SPATIAL_INDEX.rooms_near("chapel_0_0_0", 2)
+
+Each query returns room ids sorted nearest first (in_box sorts by id).
+
+Author: Alex
+
+Dev Notes:
+- 2D ids are treated as z = 0, so 2D and 3D regions share one code path.
+- Distances are Euclidean, in rooms. Exits are ignored: this is "how far on
+  the map", not "how far to walk" (use game/travel.py for that).
+- nearest(terrain=...) searches a grid holding only that terrain, so a rare
+  terrain doesn't mean walking every bucket of the common ones.
+- Rooms whose id has no coordinates are skipped.
+"""
+
+from utils.helpers import parse_room_coords
+
+
+CELL_SIZE = 8
+
+
+def _pad(coords):
+    return (tuple(coords) + (0, 0, 0))[:3]
+
+
+class _Grid:
+    """Buckets of (room_id, x, y, z) keyed by cell, with the occupied cell extent."""
+
+    __slots__ = ("cells", "lo", "hi")
+
+    def __init__(self):
+        self.cells = {}
+        self.lo = None
+        self.hi = None
+
+    def add(self, cell, entry):
+        self.cells.setdefault(cell, []).append(entry)
+        if self.lo is None:
+            self.lo, self.hi = list(cell), list(cell)
+        else:
+            for axis in range(3):
+                self.lo[axis] = min(self.lo[axis], cell[axis])
+                self.hi[axis] = max(self.hi[axis], cell[axis])
+
+    def remove(self, cell, room_id):
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            return
+        bucket[:] = [entry for entry in bucket if entry[0] != room_id]
+        if not bucket:
+            del self.cells[cell]
+
+
+class SpatialIndex:
+    """Per-region grid hash over room coordinates."""
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.grids = {}         # region -> _Grid
+        self.terrain = {}       # (region, terrain) -> _Grid
+        self.positions = {}     # room_id -> (region, (x, y, z), terrain)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, room_id):
+        return room_id in self.positions
+
+    def _cell(self, point):
+        c = self.cell_size
+        return (point[0] // c, point[1] // c, point[2] // c)
+
+    # -----------------------
+    # Building
+    # -----------------------
+    def clear(self):
+        self.grids = {}
+        self.terrain = {}
+        self.positions = {}
+
+    def add_rooms(self, rooms, room_ids=None):
+        """File rooms (all of `rooms`, or just room_ids) into the grids."""
+        for room_id in (rooms if room_ids is None else room_ids):
+            region, coords = parse_room_coords(room_id)
+            if not coords:
+                continue
+            if room_id in self.positions:
+                self.remove_rooms([room_id])
+            point = _pad(coords)
+            terrain = rooms[room_id].get("terrain")
+            cell = self._cell(point)
+            entry = (room_id, *point)
+
+            self.positions[room_id] = (region, point, terrain)
+            self.grids.setdefault(region, _Grid()).add(cell, entry)
+            if terrain is not None:
+                self.terrain.setdefault((region, terrain), _Grid()).add(cell, entry)
+
+    def remove_rooms(self, room_ids):
+        for room_id in room_ids:
+            found = self.positions.pop(room_id, None)
+            if found is None:
+                continue
+            region, point, terrain = found
+            cell = self._cell(point)
+            self.grids[region].remove(cell, room_id)
+            if terrain is not None:
+                self.terrain[(region, terrain)].remove(cell, room_id)
+
+    def position(self, room_id):
+        """(region, (x, y, z)) for a room, or None if it isn't indexed."""
+        found = self.positions.get(room_id)
+        return found[:2] if found else None
+
+    # -----------------------
+    # Queries
+    # -----------------------
+    def _entries_in_box(self, grid, lo, hi):
+        lo_cell, hi_cell = self._cell(lo), self._cell(hi)
+        # Clip to the occupied extent so huge boxes don't walk empty cells
+        ranges = [
+            range(max(lo_cell[a], grid.lo[a]), min(hi_cell[a], grid.hi[a]) + 1)
+            for a in range(3)
+        ]
+        cells = grid.cells
+        for cx in ranges[0]:
+            for cy in ranges[1]:
+                for cz in ranges[2]:
+                    bucket = cells.get((cx, cy, cz))
+                    if bucket:
+                        yield from bucket
+
+    def in_box(self, region, lo, hi):
+        """Room ids with lo <= coords <= hi on every axis (inclusive)."""
+        grid = self.grids.get(region)
+        if grid is None or grid.lo is None:
+            return []
+        lo, hi = _pad(lo), _pad(hi)
+        return sorted(
+            room_id for room_id, x, y, z in self._entries_in_box(grid, lo, hi)
+            if lo[0] <= x <= hi[0] and lo[1] <= y <= hi[1] and lo[2] <= z <= hi[2]
+        )
+
+    def within_radius(self, region, center, radius):
+        """Room ids within `radius` of center (inclusive), nearest first."""
+        grid = self.grids.get(region)
+        if grid is None or grid.lo is None:
+            return []
+        cx, cy, cz = _pad(center)
+        r = int(radius)
+        limit = radius * radius
+        found = []
+        for room_id, x, y, z in self._entries_in_box(grid, (cx - r, cy - r, cz - r), (cx + r, cy + r, cz + r)):
+            d = (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2
+            if d <= limit:
+                found.append((d, room_id))
+        found.sort()
+        return [room_id for _, room_id in found]
+
+    def nearest(self, region, center, terrain=None, max_radius=None, exclude=()):
+        """
+        Nearest room id to center, optionally of a given terrain, or None.
+        Searches outward ring by ring of cells and stops as soon as no
+        unsearched cell could hold anything closer.
+        """
+        grid = self.grids.get(region) if terrain is None else self.terrain.get((region, terrain))
+        if grid is None or grid.lo is None:
+            return None
+        point = _pad(center)
+        home = self._cell(point)
+        limit = None if max_radius is None else max_radius * max_radius
+
+        # Furthest ring that still touches occupied cells
+        last_ring = max(max(home[a] - grid.lo[a], grid.hi[a] - home[a]) for a in range(3))
+
+        best = None
+        for k in range(last_ring + 1):
+            for cell in self._ring(home, k, grid):
+                for room_id, x, y, z in grid.cells.get(cell, ()):
+                    if room_id in exclude:
+                        continue
+                    d = (x - point[0]) ** 2 + (y - point[1]) ** 2 + (z - point[2]) ** 2
+                    if (limit is None or d <= limit) and (best is None or (d, room_id) < best):
+                        best = (d, room_id)
+            # Anything in ring k+1 is at least k full cells away
+            reach = k * self.cell_size
+            if best is not None and best[0] <= reach * reach:
+                break
+            if limit is not None and reach * reach > limit:
+                break
+        return best[1] if best else None
+
+    def _ring(self, home, k, grid):
+        """Occupied-extent cells at Chebyshev distance exactly k from home."""
+        ranges = [
+            range(max(home[a] - k, grid.lo[a]), min(home[a] + k, grid.hi[a]) + 1)
+            for a in range(3)
+        ]
+        hx, hy, hz = home
+        for cx in ranges[0]:
+            for cy in ranges[1]:
+                for cz in ranges[2]:
+                    if max(abs(cx - hx), abs(cy - hy), abs(cz - hz)) == k:
+                        yield (cx, cy, cz)
+
+    def rooms_near(self, room_id, radius):
+        """Rooms in the same region within radius of room_id, excluding it."""
+        found = self.position(room_id)
+        if found is None:
+            return []
+        region, point = found
+        return [r for r in self.within_radius(region, point, radius) if r != room_id]
+
+
+# Runtime registry: one spatial index for the live world
+SPATIAL_INDEX = SpatialIndex()
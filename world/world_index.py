@@ -0,0 +1,160 @@
+# world/world_index.py
+"""
+LocalMUD — World Index
+
+Interns every room id to a dense integer and stores all exits in one
+CSR-style adjacency table: room i's exits are the entries
+offsets[i]:offsets[i + 1] of exit_dirs / exit_targets. Movement, link checks
+and graph searches work on these integers; string room ids only appear at the
+edges (parser input, room dicts, messages).
+
+Typical usage:
+    index = get_index(rooms)              # rebuilt only when stale
+    src   = index.id_of("chapel_0_0_0")
+    dst   = index.step(src, DIR_CODES["north"])
+    index.room_id(dst)                    # back to "chapel_0_1_0"
+
+Exits that change after load should go through set_exit() so the index (and
+anything caching on index.version) knows to rebuild, and the link validator
+(world/link_validator.py) re-checks the room.
+
+Author: Alex
+"""
+
+from array import array
+
+from world.link_validator import LINK_VALIDATOR
+from game.world_journal import WORLD_JOURNAL
+
+
+# Direction codes. Unusual directions get codes appended on first sight.
+DIRECTIONS = ["north", "south", "east", "west", "up", "down"]
+DIR_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+
+NO_ROOM = -1
+
+
+def dir_code(direction):
+    code = DIR_CODES.get(direction)
+    if code is None:
+        code = DIR_CODES[direction] = len(DIRECTIONS)
+        DIRECTIONS.append(direction)
+    return code
+
+
+class WorldIndex:
+    """Dense integer ids plus a CSR exit table for a rooms mapping."""
+
+    def __init__(self):
+        self.ids = []               # int -> room id
+        self.index = {}             # room id -> int
+        self.offsets = array("l", [0])
+        self.exit_dirs = array("b")
+        self.exit_targets = array("l")
+        self.missing = {}           # (room int, dir code) -> target id that doesn't exist
+        self.version = 0
+        self.stale = True
+        self.source = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def build(self, rooms):
+        """(Re)build from a rooms mapping. O(rooms + exits)."""
+        ids = list(rooms.keys())
+        index = {room_id: i for i, room_id in enumerate(ids)}
+
+        offsets = array("l", [0])
+        exit_dirs = array("b")
+        exit_targets = array("l")
+        missing = {}
+
+        for i, room_id in enumerate(ids):
+            exits = rooms[room_id].get("exits") or {}
+            for direction, target in exits.items():
+                code = dir_code(direction)
+                t = index.get(target, NO_ROOM)
+                if t == NO_ROOM:
+                    missing[(i, code)] = target
+                exit_dirs.append(code)
+                exit_targets.append(t)
+            offsets.append(len(exit_targets))
+
+        self.ids = ids
+        self.index = index
+        self.offsets = offsets
+        self.exit_dirs = exit_dirs
+        self.exit_targets = exit_targets
+        self.missing = missing
+        self.source = rooms
+        self.stale = False
+        self.version += 1
+        return self
+
+    def invalidate(self):
+        """Mark the index stale; the next get_index() rebuilds it."""
+        self.stale = True
+
+    # -----------------------
+    # Lookups
+    # -----------------------
+    def id_of(self, room_id):
+        """Room id string -> int, or None if unknown."""
+        return self.index.get(room_id)
+
+    def room_id(self, i):
+        return self.ids[i]
+
+    def exits(self, i):
+        """Yield (dir code, target int) for room i. Target is NO_ROOM if missing."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        for k in range(start, end):
+            yield self.exit_dirs[k], self.exit_targets[k]
+
+    def neighbors(self, i):
+        """Target ints of every valid exit from room i."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return [t for t in self.exit_targets[start:end] if t != NO_ROOM]
+
+    def step(self, i, code):
+        """Target int for leaving room i by direction code, NO_ROOM if blocked."""
+        dirs = self.exit_dirs
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            if dirs[k] == code:
+                return self.exit_targets[k]
+        return NO_ROOM
+
+    def broken_links(self):
+        """Yield (room_id, direction, target_id) for exits into missing rooms."""
+        for (i, code), target in self.missing.items():
+            yield self.ids[i], DIRECTIONS[code], target
+
+
+# Runtime registry: one index for the live world
+WORLD_INDEX = WorldIndex()
+
+
+def build_index(rooms):
+    """Rebuild the shared index for `rooms` and return it."""
+    return WORLD_INDEX.build(rooms)
+
+
+def get_index(rooms):
+    """Return the shared index for `rooms`, rebuilding it if stale or if it
+    was built for a different rooms mapping."""
+    if WORLD_INDEX.stale or WORLD_INDEX.source is not rooms:
+        WORLD_INDEX.build(rooms)
+    return WORLD_INDEX
+
+
+def set_exit(rooms, room_id, direction, target):
+    """Change (or with target=None, remove) an exit, invalidate the index,
+    re-check that room's links and journal the room."""
+    exits = rooms[room_id].setdefault("exits", {})
+    if target is None:
+        exits.pop(direction, None)
+    else:
+        exits[direction] = target
+    WORLD_INDEX.invalidate()
+    LINK_VALIDATOR.touch(rooms, room_id)
+    WORLD_JOURNAL.mark_room(room_id)